@@ -0,0 +1,154 @@
+import enum
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+import traceback
+import types
+import typing
+
+# This times the debug module outside of the game. The game modules and the few mod modules the debug module imports are replaced with small stand-ins,
+# everything else is the mod's own code.
+
+_pythonPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Python", "NeonOcean.S4.Order")  # type: str
+
+_stackDepths = (10, 50)  # type: typing.Tuple[int, ...]
+_logCount = 2000  # type: int
+_stackCaptureCount = 2000  # type: int
+
+def _ImportDebug (debugPath: str) -> typing.Tuple[types.ModuleType, types.ModuleType]:
+	sys.path.insert(0, _pythonPath)
+
+	sys.modules["enum_lib"] = enum
+
+	singletonsModule = types.ModuleType("singletons")
+	singletonsModule.DefaultType = type("DefaultType", (), { })
+
+	sims4Module = types.ModuleType("sims4")
+	logModule = types.ModuleType("sims4.log")
+	commonModule = types.ModuleType("sims4.common")
+
+	for logFunctionName in ("debug", "info", "warn", "error", "exception"):  # type: str
+		setattr(logModule, logFunctionName, lambda *args, **kwargs: None)
+
+	logModule.DEFAULT = object()
+	sims4Module.log = logModule
+	sims4Module.common = commonModule
+
+	uiModule = types.ModuleType("ui")
+	dialogNotificationModule = types.ModuleType("ui.ui_dialog_notification")
+	uiModule.ui_dialog_notification = dialogNotificationModule
+
+	languageModule = types.ModuleType("NeonOcean.S4.Order.Language")
+	languageModule.String = lambda identifier: identifier
+
+	thisModule = types.ModuleType("NeonOcean.S4.Order.This")
+	thisModule.Mod = types.SimpleNamespace(Namespace = "NeonOcean.S4.Order")
+
+	pathsModule = types.ModuleType("NeonOcean.S4.Order.Paths")
+	pathsModule.DebugPath = debugPath
+
+	globalModule = types.ModuleType("NeonOcean.S4.Order.Data.Global")
+	globalModules = dict()  # type: typing.Dict[str, types.SimpleNamespace]
+	globalModule.GetModule = lambda name: globalModules.setdefault(name, types.SimpleNamespace())
+
+	sys.modules["singletons"] = singletonsModule
+	sys.modules["sims4"] = sims4Module
+	sys.modules["sims4.log"] = logModule
+	sys.modules["sims4.common"] = commonModule
+	sys.modules["ui"] = uiModule
+	sys.modules["ui.ui_dialog_notification"] = dialogNotificationModule
+	sys.modules["NeonOcean.S4.Order.Language"] = languageModule
+	sys.modules["NeonOcean.S4.Order.ModsDirectory"] = types.ModuleType("NeonOcean.S4.Order.ModsDirectory")
+	sys.modules["NeonOcean.S4.Order.This"] = thisModule
+	sys.modules["NeonOcean.S4.Order.Paths"] = pathsModule
+	sys.modules["NeonOcean.S4.Order.Data.Global"] = globalModule
+	sys.modules["NeonOcean.S4.Order.UI.Notifications"] = types.ModuleType("NeonOcean.S4.Order.UI.Notifications")
+
+	from NeonOcean.S4.Order import Debug, DebugShared
+	return Debug, DebugShared
+
+_debugPath = tempfile.mkdtemp()  # type: str
+
+Debug, DebugShared = _ImportDebug(_debugPath)
+
+def BenchmarkLog (stackDepth: int, stackPolicy) -> typing.Tuple[float, float]:
+	"""
+	Time logging a report from a stack of the specified depth, then time writing those reports out as the writer thread would.
+	:return: The average number of seconds one log call took and the average number of seconds one report took to be written out.
+	:rtype: typing.Tuple[float, float]
+	"""
+
+	logger = Debug.Logger(os.path.join(_debugPath, "Mods"), hostNamespace = "Benchmark")
+	logger.SetStackPolicy(DebugShared.LogLevels.Info, stackPolicy)
+
+	# Reports are kept instead of being handed to the writer thread, the log call's own cost is all that is timed here.
+	reports = list()  # type: typing.List[DebugShared.Report]
+	logger._QueueReport = reports.append
+
+	def LogReports () -> float:
+		logStartTime = timeit.default_timer()  # type: float
+
+		for logIndex in range(_logCount):  # type: int
+			logger.Log("Benchmark report %s.", "Benchmark", DebugShared.LogLevels.Info, group = "Benchmark", owner = __name__, messageArguments = (logIndex,))
+
+		return timeit.default_timer() - logStartTime
+
+	logTime = _CallAtDepth(stackDepth, LogReports)  # type: float
+
+	writeStartTime = timeit.default_timer()  # type: float
+
+	for report in reports:  # type: DebugShared.Report
+		logger.GetReportBytes(report)
+
+	writeTime = timeit.default_timer() - writeStartTime  # type: float
+
+	return logTime / _logCount, writeTime / len(reports)
+
+def BenchmarkStackCapture (stackDepth: int) -> typing.Tuple[float, float, float]:
+	"""
+	Time capturing a stack of the specified depth with 'CaptureStack', capturing and then formatting it, and formatting it with 'traceback.format_stack'.
+	:return: The average number of seconds one of each took.
+	:rtype: typing.Tuple[float, float, float]
+	"""
+
+	def TimeStackCaptures () -> typing.Tuple[float, float, float]:
+		captureTime = timeit.timeit(DebugShared.CaptureStack, number = _stackCaptureCount)  # type: float
+		captureFormatTime = timeit.timeit(lambda: DebugShared.FormatStack(DebugShared.CaptureStack()), number = _stackCaptureCount)  # type: float
+		formatTime = timeit.timeit(traceback.format_stack, number = _stackCaptureCount)  # type: float
+		return captureTime / _stackCaptureCount, captureFormatTime / _stackCaptureCount, formatTime / _stackCaptureCount
+
+	return _CallAtDepth(stackDepth, TimeStackCaptures)
+
+def Main () -> int:
+	try:
+		print("Log calls, microseconds per report")
+		print("%8s %8s %10s %10s" % ("Depth", "Stack", "Log", "Write"))
+
+		for stackDepth in _stackDepths:  # type: int
+			for stackPolicy in (DebugShared.StackPolicies.Never, DebugShared.StackPolicies.Always):
+				logTime, writeTime = BenchmarkLog(stackDepth, stackPolicy)  # type: float, float
+				print("%8d %8s %10.2f %10.2f" % (stackDepth, stackPolicy.name, logTime * 1000000, writeTime * 1000000))
+
+		print()
+		print("Stack capture, microseconds per stack")
+		print("%8s %14s %18s %14s" % ("Depth", "CaptureStack", "Capture + Format", "format_stack"))
+
+		for stackDepth in _stackDepths:  # type: int
+			captureTime, captureFormatTime, formatTime = BenchmarkStackCapture(stackDepth)  # type: float, float, float
+			print("%8d %14.2f %18.2f %14.2f" % (stackDepth, captureTime * 1000000, captureFormatTime * 1000000, formatTime * 1000000))
+	finally:
+		shutil.rmtree(_debugPath, ignore_errors = True)
+
+	return 0
+
+def _CallAtDepth (stackDepth: int, function: typing.Callable[[], typing.Any]) -> typing.Any:
+	# Game code logs from deep within its own call stack, the stack each report captures is made about as deep here.
+	if stackDepth <= 1:
+		return function()
+
+	return _CallAtDepth(stackDepth - 1, function)
+
+if __name__ == "__main__":
+	sys.exit(Main())
@@ -0,0 +1,108 @@
+import enum
+import os
+import sys
+import timeit
+import types
+import typing
+
+# This times the persistence module outside of the game. The few game and mod modules the persistence module imports are replaced with small stand-ins,
+# everything else is the mod's own code.
+
+_pythonPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Python", "NeonOcean.S4.Order")  # type: str
+
+_keyCounts = (100, 1000, 10000)  # type: typing.Tuple[int, ...]
+_changedShares = (0.0, 0.01, 0.1, 1.0)  # type: typing.Tuple[float, ...]
+_repeatCount = 5  # type: int
+
+def _ImportPersistence () -> types.ModuleType:
+	sys.path.insert(0, _pythonPath)
+
+	sys.modules["enum_lib"] = enum
+
+	class LogLevels(enum.IntEnum):
+		Exception = 0
+		Error = 1
+		Warning = 2
+		Info = 3
+		Debug = 4
+
+	def Log (*args, **kwargs) -> None:
+		pass
+
+	debugModule = types.ModuleType("NeonOcean.S4.Order.Debug")
+	debugModule.LogLevels = LogLevels
+	debugModule.Log = Log
+
+	pathsModule = types.ModuleType("NeonOcean.S4.Order.Paths")
+	pathsModule.StripUserDataPath = lambda path: path
+
+	thisModule = types.ModuleType("NeonOcean.S4.Order.This")
+	thisModule.Mod = types.SimpleNamespace(Namespace = "NeonOcean.S4.Order")
+
+	sys.modules["NeonOcean.S4.Order.Debug"] = debugModule
+	sys.modules["NeonOcean.S4.Order.Paths"] = pathsModule
+	sys.modules["NeonOcean.S4.Order.This"] = thisModule
+
+	from NeonOcean.S4.Order.Data import Persistence
+	return Persistence
+
+Persistence = _ImportPersistence()
+
+from NeonOcean.S4.Order.Tools import Version
+
+def BenchmarkSave (keyCount: int, changedShare: float, cached: bool) -> float:
+	"""
+	Time a json save after changing a share of the keys.
+	:return: The average number of seconds one save took.
+	:rtype: float
+	"""
+
+	persistentJson = Persistence.PersistentJson(Version.Version("1.0.0"), hostNamespace = "Benchmark")
+	keys = ["Key%d" % keyIndex for keyIndex in range(keyCount)]  # type: typing.List[str]
+
+	for key in keys:  # type: str
+		persistentJson.Setup(key, list, [], _VerifyList)
+		persistentJson.Set(key, _CreateValue(0), autoSave = False, autoUpdate = False)
+
+	changedKeys = keys[:int(round(keyCount * changedShare))]  # type: typing.List[str]
+	saveTimes = list()  # type: typing.List[float]
+
+	# The first save fills the cache, every save timed after it only needs to encode the keys changed since the one before.
+	persistentJson.Save()
+
+	for repeatIndex in range(1, _repeatCount + 1):  # type: int
+		for changedKey in changedKeys:  # type: str
+			persistentJson.Set(changedKey, _CreateValue(repeatIndex), autoSave = False, autoUpdate = False)
+
+		if not cached:
+			persistentJson._entryStrings = dict()
+
+		saveStartTime = timeit.default_timer()  # type: float
+		persistentJson.Save()
+		saveTimes.append(timeit.default_timer() - saveStartTime)
+
+	return sum(saveTimes) / len(saveTimes)
+
+def Main () -> int:
+	print("%8s %9s %14s %14s %8s" % ("Keys", "Changed", "Uncached (ms)", "Cached (ms)", "Speedup"))
+
+	for keyCount in _keyCounts:  # type: int
+		for changedShare in _changedShares:  # type: float
+			uncachedTime = BenchmarkSave(keyCount, changedShare, False)  # type: float
+			cachedTime = BenchmarkSave(keyCount, changedShare, True)  # type: float
+
+			print("%8d %8.0f%% %14.3f %14.3f %7.1fx" % (keyCount, changedShare * 100, uncachedTime * 1000, cachedTime * 1000, uncachedTime / cachedTime))
+
+	return 0
+
+def _CreateValue (seed: int) -> list:
+	return [seed, "Value %d" % seed, { "Seed": seed, "Enabled": seed % 2 == 0 }]
+
+def _VerifyList (value, lastChangeVersion = None) -> list:
+	if not isinstance(value, list):
+		raise TypeError("Expected a list.")
+
+	return value
+
+if __name__ == "__main__":
+	sys.exit(Main())
@@ -0,0 +1,90 @@
+import json
+import os
+import sys
+import typing
+from xml.sax import saxutils
+
+def ConvertLog (sourceFilePath: str, destinationFilePath: str) -> None:
+	"""
+	Convert a json lines log file to the xml log format read by the log viewers. This script does not depend on the mod and can be run with any Python 3 install.
+	"""
+
+	with open(sourceFilePath, encoding = "utf-8") as sourceFile:
+		sourceLines = [(lineNumber, line) for lineNumber, line in enumerate(sourceFile.read().splitlines(), 1) if line.strip() != ""]  # type: typing.List[typing.Tuple[int, str]]
+
+	if len(sourceLines) == 0:
+		raise Exception("'" + sourceFilePath + "' is empty.")
+
+	header = json.loads(sourceLines[0][1])  # type: dict
+
+	logText = "<?xml version=\"1.0\" encoding=\"utf-8\"?>\n" \
+			  "<LogFile SessionID=\"%s\" SessionStartTime=\"%s\">\n" % (header["SessionID"], header["SessionStartTime"])  # type: str
+
+	entryTexts = list()  # type: typing.List[str]
+
+	for sourceLineNumber, sourceLine in sourceLines[1:]:  # type: int, str
+		try:
+			entry = json.loads(sourceLine)  # type: dict
+
+			if not isinstance(entry, dict):
+				raise Exception("Log entry is not a dictionary.")
+		except Exception:
+			# The last line will be cut off if the game stopped while it was being written, earlier lines are still good.
+			print("Skipping line %d of '%s', it could not be decoded." % (sourceLineNumber, sourceFilePath), file = sys.stderr)
+			continue
+
+		if entry.get("SizeLimitReached", False):
+			if len(entryTexts) != 0:
+				entryTexts[-1] += "<!--Log file size limit reached-->"
+
+			continue
+
+		entryTexts.append(_GetEntryText(entry))
+
+	logText += str.join("\n\n", entryTexts) + "\n</LogFile>"
+
+	with open(destinationFilePath, "w", encoding = "utf-8", newline = os.linesep) as destinationFile:
+		destinationFile.write(logText)
+
+def _GetEntryText (entry: dict) -> str:
+	# This needs to produce the same text as 'Report.GetText' in the mod's 'DebugShared' module.
+
+	entryText = "\t<Log Number=\"%s\" Level=\"%s\" Group=\"%s\"" % (entry["Number"], entry["Level"], entry["Group"])  # type: str
+
+	if "Owner" in entry:
+		entryText += " Owner=\"%s\"" % entry["Owner"]
+
+	entryText += " LogTime=\"%s\"" % entry["LogTime"]
+
+	if "WriteTime" in entry:
+		entryText += " WriteTime=\"%s\"" % entry["WriteTime"]
+
+	if entry.get("Lockable", False):
+		entryText += " Lockable=\"True\""
+
+	entryText += ">\n"
+
+	for elementName in ("Message", "Exception", "Stacktrace"):  # type: str
+		if elementName not in entry:
+			continue
+
+		elementText = entry[elementName].replace("\r\n", "\n")  # type: str
+		elementText = saxutils.escape(elementText).replace("\n", "\n<!--\t\t-->")
+
+		entryText += "\t\t<%s><!--\n" \
+					 "\t\t\t-->%s<!--\n" \
+					 "\t\t--></%s>\n" % (elementName, elementText, elementName)
+
+	entryText += "\t</Log>"
+
+	return entryText
+
+if __name__ == "__main__":
+	if len(sys.argv) < 2 or len(sys.argv) > 3:
+		print("Usage: Convert-Log.py <Log.jsonl> [<Log.xml>]")
+		sys.exit(1)
+
+	sourceArgument = sys.argv[1]  # type: str
+	destinationArgument = sys.argv[2] if len(sys.argv) == 3 else os.path.splitext(sourceArgument)[0] + ".xml"  # type: str
+
+	ConvertLog(sourceArgument, destinationArgument)
@@ -0,0 +1,466 @@
+import enum
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import traceback
+import types
+import typing
+
+# These checks run outside of the game. The few game and mod modules the persistence module imports are replaced with small stand-ins, everything else is
+# the mod's own code.
+
+_pythonPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Python", "NeonOcean.S4.Order")  # type: str
+
+_loggedMessages = list()  # type: typing.List[str]
+
+def _ImportPersistence () -> types.ModuleType:
+	sys.path.insert(0, _pythonPath)
+
+	sys.modules["enum_lib"] = enum
+
+	class LogLevels(enum.IntEnum):
+		Exception = 0
+		Error = 1
+		Warning = 2
+		Info = 3
+		Debug = 4
+
+	def Log (message, *args, **kwargs) -> None:
+		_loggedMessages.append(str(message))
+
+	debugModule = types.ModuleType("NeonOcean.S4.Order.Debug")
+	debugModule.LogLevels = LogLevels
+	debugModule.Log = Log
+
+	pathsModule = types.ModuleType("NeonOcean.S4.Order.Paths")
+	pathsModule.StripUserDataPath = lambda path: path
+
+	thisModule = types.ModuleType("NeonOcean.S4.Order.This")
+	thisModule.Mod = types.SimpleNamespace(Namespace = "NeonOcean.S4.Order")
+
+	sys.modules["NeonOcean.S4.Order.Debug"] = debugModule
+	sys.modules["NeonOcean.S4.Order.Paths"] = pathsModule
+	sys.modules["NeonOcean.S4.Order.This"] = thisModule
+
+	from NeonOcean.S4.Order.Data import Persistence
+	return Persistence
+
+Persistence = _ImportPersistence()
+
+from NeonOcean.S4.Order.Tools import Version
+
+class _InjectedFailure(OSError):
+	pass
+
+class _FailingFile:
+	def __init__ (self, file, failAfter: int):
+		self._file = file
+		self._failAfter = failAfter
+
+	def __enter__ (self):
+		return self
+
+	def __exit__ (self, exceptionType, exceptionValue, exceptionTraceback):
+		self._file.close()
+		return False
+
+	def write (self, text: str) -> int:
+		# Only part of the text reaches the disk before the simulated crash.
+		self._file.write(text[:self._failAfter])
+		self._file.flush()
+		raise _InjectedFailure("Injected failure while writing.")
+
+	def __getattr__ (self, name: str):
+		return getattr(self._file, name)
+
+def TestAtomicWriteReplaceFailure (directoryPath: str) -> None:
+	filePath = os.path.join(directoryPath, "Settings.json")  # type: str
+	_WriteText(filePath, "original")
+
+	originalReplace = os.replace
+
+	def FailingReplace (*args, **kwargs):
+		raise _InjectedFailure("Injected failure while replacing.")
+
+	os.replace = FailingReplace
+
+	try:
+		_ExpectFailure(lambda: Persistence._WriteFileAtomically(filePath, "replacement", Persistence.FileSyncPolicies.File))
+	finally:
+		os.replace = originalReplace
+
+	_Check(_ReadText(filePath) == "original", "The original file was changed by a failed replace.")
+	_Check(not os.path.exists(filePath + ".tmp"), "The temporary file was left behind by a failed replace.")
+
+def TestAtomicWritePartialWrite (directoryPath: str) -> None:
+	filePath = os.path.join(directoryPath, "Settings.json")  # type: str
+	_WriteText(filePath, "original")
+
+	Persistence.open = lambda path, *args, **kwargs: _FailingFile(open(path, *args, **kwargs), 3)
+
+	try:
+		_ExpectFailure(lambda: Persistence._WriteFileAtomically(filePath, "replacement", Persistence.FileSyncPolicies.File))
+	finally:
+		del Persistence.open
+
+	_Check(_ReadText(filePath) == "original", "The original file was changed by a failed write.")
+	_Check(not os.path.exists(filePath + ".tmp"), "The temporary file was left behind by a failed write.")
+
+def TestPersistentFileSaveFailure (directoryPath: str) -> None:
+	filePath = os.path.join(directoryPath, "Settings.json")  # type: str
+
+	persistentFile = _CreatePersistentFile(filePath)
+	persistentFile.Set("A", 1)
+	originalText = _ReadText(filePath)  # type: str
+
+	originalReplace = os.replace
+
+	def FailingReplace (*args, **kwargs):
+		raise _InjectedFailure("Injected failure while replacing.")
+
+	os.replace = FailingReplace
+
+	try:
+		persistentFile.Set("A", 2)
+	finally:
+		os.replace = originalReplace
+
+	_Check(_ReadText(filePath) == originalText, "A failed save changed the persistent file.")
+	_Check(not os.path.exists(filePath + ".tmp"), "A failed save left the temporary file behind.")
+
+	reloadedFile = _CreatePersistentFile(filePath)
+	reloadedFile.Load()
+	_Check(reloadedFile.Get("A") == 1, "The last successful save could not be loaded after a failed save.")
+
+def TestJournalSnapshotValueVersion (directoryPath: str) -> None:
+	filePath = os.path.join(directoryPath, "Settings.json")  # type: str
+
+	oldJournal = _CreatePersistentJournal(filePath, "1.0.0")
+	oldJournal.Set("A", 1)
+	_Check(oldJournal.Compact(), "The journal could not be compacted.")
+
+	newJournal = _CreatePersistentJournal(filePath, "2.0.0")
+	newJournal.Load()
+	newJournal.Set("B", 2)
+
+	verifiedVersions = dict()  # type: typing.Dict[str, str]
+	reloadedJournal = _CreatePersistentJournal(filePath, "2.0.0", verifiedVersions)
+	reloadedJournal.Load()
+
+	_Check(verifiedVersions.get("A") == "1.0.0", "A snapshot value was verified with the version of a later journal, not the version it was saved in.")
+	_Check(verifiedVersions.get("B") == "2.0.0", "A journal value was not verified with the version it was saved in.")
+
+def TestJournalTornRecord (directoryPath: str) -> None:
+	filePath = os.path.join(directoryPath, "Settings.json")  # type: str
+
+	oldJournal = _CreatePersistentJournal(filePath, "1.0.0")
+	oldJournal.Set("A", 1)
+
+	# The game stopped part way through writing a record.
+	with open(oldJournal.JournalFilePath, "a") as journalFile:
+		journalFile.write("{\"Key\":\"B\",\"Val")
+
+	newJournal = _CreatePersistentJournal(filePath, "2.0.0")
+	newJournal.Load()
+	newJournal.Set("B", 2)
+
+	del _loggedMessages[:]
+
+	verifiedVersions = dict()  # type: typing.Dict[str, str]
+	reloadedJournal = _CreatePersistentJournal(filePath, "2.0.0", verifiedVersions)
+	reloadedJournal.Load()
+
+	_Check(reloadedJournal.Get("A") == 1 and reloadedJournal.Get("B") == 2, "A journal lost values after a record was cut off.")
+	_Check(verifiedVersions.get("A") == "1.0.0", "A value saved before a cut off record was not verified with the version it was saved in.")
+	_Check(verifiedVersions.get("B") == "2.0.0", "A value saved after a cut off record was not verified with the version it was saved in.")
+	_Check(len(_loggedMessages) == 0, "Loading a journal still found problems after its cut off record was dropped: " + " | ".join(_loggedMessages))
+
+def TestJournalSaveDuringCompaction (directoryPath: str) -> None:
+	filePath = os.path.join(directoryPath, "Settings.json")  # type: str
+
+	persistentJournal = _CreatePersistentJournal(filePath)
+	persistentJournal.Set("A", 1)
+
+	compactionEncoding = threading.Event()  # type: threading.Event
+	compactionReleased = threading.Event()  # type: threading.Event
+	originalEncodeContainer = persistentJournal._EncodeContainer
+
+	def BlockingEncodeContainer (*args, **kwargs):
+		compactionEncoding.set()
+		compactionReleased.wait(5)
+		return originalEncodeContainer(*args, **kwargs)
+
+	persistentJournal._EncodeContainer = BlockingEncodeContainer
+
+	compactionThread = threading.Thread(target = persistentJournal.Compact)  # type: threading.Thread
+	compactionThread.start()
+
+	try:
+		_Check(compactionEncoding.wait(5), "The compaction never started encoding the snapshot.")
+
+		saveThread = threading.Thread(target = lambda: persistentJournal.Set("B", 2))  # type: threading.Thread
+		saveThread.start()
+		saveThread.join(1)
+		_Check(not saveThread.is_alive(), "A save waited for a compaction to finish encoding its snapshot.")
+	finally:
+		compactionReleased.set()
+		compactionThread.join()
+
+	del persistentJournal._EncodeContainer
+
+	reloadedJournal = _CreatePersistentJournal(filePath)
+	reloadedJournal.Load()
+	_Check(reloadedJournal.Get("A") == 1 and reloadedJournal.Get("B") == 2, "A value saved during a compaction was lost.")
+
+def TestJsonSaveConcurrentSet (directoryPath: str) -> None:
+	persistentJson = Persistence.PersistentJson(Version.Version("1.0.0"), hostNamespace = "Test")
+	persistentJson.Setup("A", int, 0, _VerifyInteger)
+	persistentJson.Set("A", 1)
+
+	valueStorage = persistentJson._storage["A"]
+	originalSave = valueStorage.Save
+
+	def InterleavedSave ():
+		# Another thread sets the value right after the save copied it, but before the copy was encoded.
+		savedValue = originalSave()
+		valueStorage.Set(2, persistentJson.CurrentVersion)
+		return savedValue
+
+	valueStorage.Save = InterleavedSave
+
+	try:
+		persistentJson.Save()
+	finally:
+		del valueStorage.Save
+
+	saveSuccessful, persistentDataString = persistentJson.Save()  # type: bool, str
+	_Check(saveSuccessful, "The persistent data could not be saved.")
+	_Check(json.loads(persistentDataString)["Values"]["A"] == 2, "A value set while it was being saved was never saved.")
+
+def TestSQLiteUnchangedRowVersion (directoryPath: str) -> None:
+	filePath = os.path.join(directoryPath, "Settings.sqlite")  # type: str
+
+	oldDatabase = _CreatePersistentSQLite(filePath, "1.0.0")
+	oldDatabase.Load()
+	oldDatabase.Set("A", 1)
+	oldDatabase.Close()
+
+	newDatabase = _CreatePersistentSQLite(filePath, "2.0.0")
+	newDatabase.Load()
+	newDatabase.Set("B", 2)
+	newDatabase.Close()
+
+	verifiedVersions = dict()  # type: typing.Dict[str, str]
+	reloadedDatabase = _CreatePersistentSQLite(filePath, "2.0.0", verifiedVersions)
+	reloadedDatabase.Load()
+	reloadedDatabase.Close()
+
+	_Check(verifiedVersions.get("A") == "1.0.0", "A row that was not written by a save was verified with the version of that save.")
+	_Check(verifiedVersions.get("B") == "2.0.0", "A row was not verified with the version it was saved in.")
+
+def TestSQLiteRowVersionUpgrade (directoryPath: str) -> None:
+	filePath = os.path.join(directoryPath, "Settings.sqlite")  # type: str
+
+	# A database written before rows had their own version.
+	connection = sqlite3.connect(filePath)
+
+	with connection:
+		connection.execute("CREATE TABLE PersistentValues (Key TEXT PRIMARY KEY NOT NULL, Value TEXT NOT NULL)")
+		connection.execute("CREATE TABLE PersistentMetadata (Key TEXT PRIMARY KEY NOT NULL, Value TEXT NOT NULL)")
+		connection.execute("INSERT INTO PersistentValues (Key, Value) VALUES ('A', '1')")
+		connection.execute("INSERT INTO PersistentMetadata (Key, Value) VALUES ('LastVersion', '1.0.0')")
+
+	connection.close()
+
+	newDatabase = _CreatePersistentSQLite(filePath, "2.0.0")
+	newDatabase.Load()
+	newDatabase.Set("B", 2)
+	newDatabase.Close()
+
+	verifiedVersions = dict()  # type: typing.Dict[str, str]
+	reloadedDatabase = _CreatePersistentSQLite(filePath, "2.0.0", verifiedVersions)
+	reloadedDatabase.Load()
+	reloadedDatabase.Close()
+
+	_Check(reloadedDatabase.Get("A") == 1, "A value written before rows had their own version could not be loaded.")
+	_Check(verifiedVersions.get("A") == "1.0.0", "A row written before rows had their own version was not verified with the version it was saved in.")
+
+def TestSQLiteFrozenSetupAfterLoad (directoryPath: str) -> None:
+	filePath = os.path.join(directoryPath, "Settings.sqlite")  # type: str
+
+	oldDatabase = _CreatePersistentSQLite(filePath)
+	oldDatabase.Load()
+	oldDatabase.Set("B", 2)
+	oldDatabase.Close()
+
+	frozenDatabase = Persistence.PersistentSQLite(filePath, Version.Version("1.0.0"), hostNamespace = "Test", frozenValues = True)
+	frozenDatabase.Setup("A", int, 0, _VerifyInteger)
+	frozenDatabase.Load()
+	frozenDatabase.Setup("B", int, 0, _VerifyInteger)
+	frozenDatabase.Close()
+
+	_Check(frozenDatabase.Get("B") == 2, "A key setup after loading frozen values did not get its stored value.")
+
+def TestTransactionFromTwoThreads (directoryPath: str) -> None:
+	persistentJson = Persistence.PersistentJson(Version.Version("1.0.0"), hostNamespace = "Test")
+	persistentJson.Setup("A", int, 0, _VerifyInteger)
+	persistentJson.Setup("B", int, 0, _VerifyInteger)
+
+	otherThreadErrors = list()  # type: typing.List[BaseException]
+	otherThreadEntering = threading.Event()  # type: threading.Event
+
+	def OtherThreadTarget () -> None:
+		try:
+			otherThreadEntering.set()
+
+			with persistentJson.Transaction():
+				persistentJson.Set("B", persistentJson.Get("A") + 1)
+		except BaseException as e:
+			otherThreadErrors.append(e)
+
+	with persistentJson.Transaction():
+		persistentJson.Set("A", 1)
+
+		otherThread = threading.Thread(target = OtherThreadTarget)  # type: threading.Thread
+		otherThread.start()
+		otherThreadEntering.wait()
+		otherThread.join(0.2)
+		_Check(otherThread.is_alive(), "A second thread's transaction did not wait for the open transaction to be committed.")
+
+	otherThread.join(5)
+
+	_Check(not otherThread.is_alive(), "A second thread's transaction was never entered after the open transaction was committed.")
+	_Check(len(otherThreadErrors) == 0, "A second thread failed to open a transaction: " + ", ".join(repr(error) for error in otherThreadErrors))
+	_Check(persistentJson.Get("B") == 2, "A second thread's transaction did not see the changes committed by the first.")
+
+def TestJournalPreload (directoryPath: str) -> None:
+	filePath = os.path.join(directoryPath, "Settings.json")  # type: str
+
+	oldJournal = _CreatePersistentJournal(filePath)
+	oldJournal.Set("A", 1)
+	_Check(oldJournal.Compact(), "The journal could not be compacted.")
+	oldJournal.Set("B", 2)
+
+	preloadedJournal = _CreatePersistentJournal(filePath)
+	_Check(preloadedJournal.SupportsPreload, "Journals do not report that they support preloading.")
+	preloadedJournal.Preload()
+	_Check(preloadedJournal.Get("A") == 1, "A preloaded journal lost a value from its snapshot.")
+	_Check(preloadedJournal.Get("B") == 2, "A preloaded journal lost a value from its journal.")
+
+	# Compacting before anything is retrieved must still finish the preload, not write a snapshot of default values.
+	compactedJournal = _CreatePersistentJournal(filePath)
+	compactedJournal.Preload()
+	_Check(compactedJournal.Compact(), "A preloaded journal could not be compacted.")
+
+	reloadedJournal = _CreatePersistentJournal(filePath)
+	reloadedJournal.Load()
+	_Check(reloadedJournal.Get("A") == 1 and reloadedJournal.Get("B") == 2, "Compacting a preloaded journal lost its values.")
+
+def TestUnsupportedPreload (directoryPath: str) -> None:
+	persistentSQLite = _CreatePersistentSQLite(os.path.join(directoryPath, "Settings.sqlite"))
+	_Check(not persistentSQLite.SupportsPreload, "SQLite persistence objects report that they support preloading.")
+
+	try:
+		persistentSQLite.Preload()
+	except Exception:
+		return
+
+	raise AssertionError("Preloading a persistence object that does not support it did not raise an exception.")
+
+def Main () -> int:
+	tests = [
+		TestAtomicWriteReplaceFailure,
+		TestAtomicWritePartialWrite,
+		TestPersistentFileSaveFailure,
+		TestJournalSnapshotValueVersion,
+		TestJournalTornRecord,
+		TestJournalSaveDuringCompaction,
+		TestJsonSaveConcurrentSet,
+		TestSQLiteUnchangedRowVersion,
+		TestSQLiteRowVersionUpgrade,
+		TestSQLiteFrozenSetupAfterLoad,
+		TestTransactionFromTwoThreads,
+		TestJournalPreload,
+		TestUnsupportedPreload
+	]  # type: typing.List[typing.Callable[[str], None]]
+
+	failureCount = 0  # type: int
+
+	for test in tests:  # type: typing.Callable[[str], None]
+		directoryPath = tempfile.mkdtemp()  # type: str
+
+		try:
+			test(directoryPath)
+			print("PASS " + test.__name__)
+		except Exception:
+			failureCount += 1
+			print("FAIL " + test.__name__)
+			traceback.print_exc()
+		finally:
+			shutil.rmtree(directoryPath, ignore_errors = True)
+
+	return 1 if failureCount != 0 else 0
+
+def _CreatePersistentFile (filePath: str, currentVersion: str = "1.0.0"):
+	persistentFile = Persistence.PersistentFile(filePath, Version.Version(currentVersion), hostNamespace = "Test")
+	persistentFile.Setup("A", int, 0, _VerifyInteger)
+	persistentFile.Setup("B", int, 0, _VerifyInteger)
+	return persistentFile
+
+def _CreatePersistentJournal (filePath: str, currentVersion: str = "1.0.0", verifiedVersions: typing.Optional[typing.Dict[str, str]] = None):
+	persistentJournal = Persistence.PersistentJournal(filePath, Version.Version(currentVersion), hostNamespace = "Test")
+
+	for key in ("A", "B"):  # type: str
+		persistentJournal.Setup(key, int, 0, _VerifyInteger if verifiedVersions is None else _CreateRecordingVerify(key, verifiedVersions))
+
+	return persistentJournal
+
+def _CreatePersistentSQLite (filePath: str, currentVersion: str = "1.0.0", verifiedVersions: typing.Optional[typing.Dict[str, str]] = None):
+	persistentSQLite = Persistence.PersistentSQLite(filePath, Version.Version(currentVersion), hostNamespace = "Test")
+
+	for key in ("A", "B"):  # type: str
+		persistentSQLite.Setup(key, int, 0, _VerifyInteger if verifiedVersions is None else _CreateRecordingVerify(key, verifiedVersions))
+
+	return persistentSQLite
+
+def _CreateRecordingVerify (key: str, verifiedVersions: typing.Dict[str, str]) -> typing.Callable:
+	def RecordingVerify (value, lastChangeVersion = None) -> int:
+		if lastChangeVersion is not None:
+			verifiedVersions[key] = str(lastChangeVersion)
+
+		return _VerifyInteger(value, lastChangeVersion)
+
+	return RecordingVerify
+
+def _VerifyInteger (value, lastChangeVersion = None) -> int:
+	if not isinstance(value, int):
+		raise TypeError("Expected an integer.")
+
+	return value
+
+def _ExpectFailure (function: typing.Callable[[], None]) -> None:
+	try:
+		function()
+	except _InjectedFailure:
+		return
+
+	raise AssertionError("The injected failure was not raised.")
+
+def _Check (condition: bool, message: str) -> None:
+	if not condition:
+		raise AssertionError(message)
+
+def _ReadText (filePath: str) -> str:
+	with open(filePath) as file:
+		return file.read()
+
+def _WriteText (filePath: str, text: str) -> None:
+	with open(filePath, "w") as file:
+		file.write(text)
+
+if __name__ == "__main__":
+	sys.exit(Main())
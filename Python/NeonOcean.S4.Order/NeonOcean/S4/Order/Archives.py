@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import typing
+import zipfile
+import zlib
+
+from NeonOcean.S4.Order import Debug, Paths, This
+
+ChecksumArchives = False  # type: bool
+
+_cacheFilePath = os.path.join(This.Mod.PersistentPath, "ArchiveModules.json")  # type: str
+_cacheFormatVersion = 1  # type: int
+
+_cacheVersionKey = "Version"  # type: str
+_cacheEntriesKey = "Entries"  # type: str
+
+_entrySizeKey = "Size"  # type: str
+_entryModifiedKey = "Modified"  # type: str
+_entryChecksumKey = "Checksum"  # type: str
+_entryModulesKey = "Modules"  # type: str
+
+_checksumLength = 65536  # type: int
+
+_cacheEntries = dict()  # type: typing.Dict[str, dict]
+_cacheLock = threading.Lock()  # type: threading.Lock
+_cacheChanged = False  # type: bool
+
+_cacheHits = 0  # type: int
+_cacheMisses = 0  # type: int
+
+def GetArchiveModules (archivePath: str) -> typing.List[str]:
+	"""
+	Get the names of every compiled module within a script archive. Listings are remembered between game launches, an archive will only be opened if its size or
+	modification time has changed since it was last listed. This function does not log anything and is safe to call from any thread.
+	:param archivePath: The path to the script archive.
+	:type archivePath: str
+	:return: A new list of the module names in the archive, in the order they appear in the archive.
+	:rtype: typing.List[str]
+	"""
+
+	global _cacheChanged, _cacheHits, _cacheMisses
+
+	if not isinstance(archivePath, str):
+		raise Exception("'archivePath' is not a string.")
+
+	archiveKey = _GetArchiveKey(archivePath)  # type: str
+	archiveStatus = os.stat(archivePath)  # type: os.stat_result
+	archiveChecksum = _GetArchiveChecksum(archivePath, archiveStatus.st_size) if ChecksumArchives else None  # type: typing.Optional[int]
+
+	with _cacheLock:
+		cacheEntry = _cacheEntries.get(archiveKey, None)  # type: typing.Optional[dict]
+
+		if cacheEntry is not None and _EntryMatches(cacheEntry, archiveStatus, archiveChecksum):
+			_cacheHits += 1
+			return list(cacheEntry[_entryModulesKey])
+
+	modules = _ReadArchiveModules(archivePath)  # type: typing.List[str]
+
+	cacheEntry = {
+		_entrySizeKey: archiveStatus.st_size,
+		_entryModifiedKey: archiveStatus.st_mtime_ns,
+		_entryModulesKey: list(modules)
+	}
+
+	if archiveChecksum is not None:
+		cacheEntry[_entryChecksumKey] = archiveChecksum
+
+	with _cacheLock:
+		_cacheEntries[archiveKey] = cacheEntry
+		_cacheChanged = True
+		_cacheMisses += 1
+
+	return modules
+
+def SaveCache () -> None:
+	"""
+	Write any new archive listings to the cache file and log how many listings were taken from the cache since the last save. Listings for archives that no
+	longer exist are dropped.
+	"""
+
+	global _cacheChanged, _cacheHits, _cacheMisses
+
+	with _cacheLock:
+		cacheHits = _cacheHits  # type: int
+		cacheMisses = _cacheMisses  # type: int
+		_cacheHits = 0
+		_cacheMisses = 0
+
+		for archiveKey in list(_cacheEntries.keys()):  # type: str
+			if not os.path.isfile(archiveKey):
+				_cacheEntries.pop(archiveKey)
+				_cacheChanged = True
+
+		if not _cacheChanged:
+			cacheDictionary = None  # type: typing.Optional[dict]
+		else:
+			cacheDictionary = {
+				_cacheVersionKey: _cacheFormatVersion,
+				_cacheEntriesKey: dict(_cacheEntries)
+			}
+
+			_cacheChanged = False
+
+	if cacheHits != 0 or cacheMisses != 0:
+		Debug.Log("Listed the modules of %d script archive(s), %d from the archive cache and %d by opening the archive." % (cacheHits + cacheMisses, cacheHits, cacheMisses),
+				  This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+	if cacheDictionary is None:
+		return
+
+	try:
+		cacheDirectory = os.path.dirname(_cacheFilePath)  # type: str
+
+		if not os.path.exists(cacheDirectory):
+			os.makedirs(cacheDirectory)
+
+		with open(_cacheFilePath, "w+") as cacheFile:
+			cacheFile.write(json.JSONEncoder(indent = "\t").encode(cacheDictionary))
+	except Exception:
+		Debug.Log("Failed to write the archive cache file to '" + Paths.StripUserDataPath(_cacheFilePath) + "'.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+def _Setup () -> None:
+	_LoadCache()
+
+def _LoadCache () -> None:
+	global _cacheEntries
+
+	if not os.path.exists(_cacheFilePath):
+		return
+
+	try:
+		with open(_cacheFilePath) as cacheFile:
+			cacheDictionary = json.JSONDecoder().decode(cacheFile.read())  # type: dict
+
+		if not isinstance(cacheDictionary, dict):
+			raise Exception("The archive cache file's root is not a dictionary.")
+
+		if cacheDictionary.get(_cacheVersionKey, None) != _cacheFormatVersion:
+			Debug.Log("Discarding the archive cache file, it was written in a different format.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+			return
+
+		cacheEntries = cacheDictionary.get(_cacheEntriesKey, None)  # type: typing.Optional[dict]
+
+		if not isinstance(cacheEntries, dict):
+			raise Exception("The archive cache file's entries are not a dictionary.")
+
+		validEntries = dict()  # type: typing.Dict[str, dict]
+
+		for archiveKey, cacheEntry in cacheEntries.items():  # type: str, dict
+			if _EntryIsValid(cacheEntry):
+				validEntries[archiveKey] = cacheEntry
+
+		with _cacheLock:
+			_cacheEntries = validEntries
+	except Exception:
+		Debug.Log("Failed to read the archive cache file at '" + Paths.StripUserDataPath(_cacheFilePath) + "', archives will be listed from scratch.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+def _EntryIsValid (cacheEntry: typing.Any) -> bool:
+	if not isinstance(cacheEntry, dict):
+		return False
+
+	if not isinstance(cacheEntry.get(_entrySizeKey, None), int) or not isinstance(cacheEntry.get(_entryModifiedKey, None), int):
+		return False
+
+	if _entryChecksumKey in cacheEntry and not isinstance(cacheEntry[_entryChecksumKey], int):
+		return False
+
+	modules = cacheEntry.get(_entryModulesKey, None)  # type: typing.Optional[list]
+
+	if not isinstance(modules, list):
+		return False
+
+	for module in modules:  # type: str
+		if not isinstance(module, str):
+			return False
+
+	return True
+
+def _EntryMatches (cacheEntry: dict, archiveStatus: os.stat_result, archiveChecksum: typing.Optional[int]) -> bool:
+	if cacheEntry[_entrySizeKey] != archiveStatus.st_size or cacheEntry[_entryModifiedKey] != archiveStatus.st_mtime_ns:
+		return False
+
+	if archiveChecksum is not None and cacheEntry.get(_entryChecksumKey, None) != archiveChecksum:
+		return False
+
+	return True
+
+def _GetArchiveKey (archivePath: str) -> str:
+	return os.path.normcase(os.path.abspath(archivePath))
+
+def _GetArchiveChecksum (archivePath: str, archiveSize: int) -> int:
+	# Only the end of the archive is checked, that is where the zip central directory is kept and nearly any change to the archive's contents will show up there.
+
+	with open(archivePath, "rb") as archiveFile:
+		archiveFile.seek(max(0, archiveSize - _checksumLength))
+		return zlib.crc32(archiveFile.read())
+
+def _ReadArchiveModules (archivePath: str) -> typing.List[str]:
+	modules = list()  # type: typing.List[str]
+
+	with zipfile.ZipFile(archivePath, "r") as archive:  # type: zipfile.ZipFile
+		for fileInfo in archive.filelist:  # type: zipfile.ZipInfo
+			if fileInfo.filename[-1] != "/":
+				path, extension = os.path.splitext(fileInfo.filename)  # type: str, str
+
+				if extension.lower() == ".pyc":
+					moduleName = path.replace("/", ".").replace("\\", ".")  # type: str
+
+					if moduleName.endswith(".__init__"):
+						moduleName = moduleName[:-len(".__init__")]
+
+					modules.append(moduleName)
+
+	return modules
+
+_Setup()
@@ -0,0 +1,35 @@
+from NeonOcean.S4.Order import Debug, LoadingShared, LoadingTimings, This
+from NeonOcean.S4.Order.Console import Command
+from sims4 import commands
+
+TimingsCommand: Command.ConsoleCommand
+
+def _Setup () -> None:
+	global TimingsCommand
+
+	commandPrefix = This.Mod.Namespace.lower()
+
+	TimingsCommand = Command.ConsoleCommand(_Timings, commandPrefix + ".timings", showHelp = True, helpInput = "{ module limit }")
+
+def _OnStart (cause: LoadingShared.LoadingCauses) -> None:
+	if cause:
+		pass
+
+	TimingsCommand.RegisterCommand()
+
+def _OnStop (cause: LoadingShared.UnloadingCauses) -> None:
+	if cause:
+		pass
+
+	TimingsCommand.UnregisterCommand()
+
+def _Timings (moduleLimit: int = 5, _connection: int = None) -> None:
+	try:
+		commands.cheat_output(LoadingTimings.GetReportText(moduleLimit = int(moduleLimit)) + "\n", _connection)
+	except Exception as e:
+		output = commands.CheatOutput(_connection)
+		output("Failed to show loading timings.")
+
+		Debug.Log("Failed to show loading timings.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__, exception = e)
+
+_Setup()
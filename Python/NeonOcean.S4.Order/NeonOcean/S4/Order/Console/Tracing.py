@@ -0,0 +1,40 @@
+from NeonOcean.S4.Order import Debug, LoadingShared, Paths, This, Tracing
+from NeonOcean.S4.Order.Console import Command
+from sims4 import commands
+
+DumpTraceCommand: Command.ConsoleCommand
+
+def _Setup () -> None:
+	global DumpTraceCommand
+
+	commandPrefix = This.Mod.Namespace.lower()
+
+	DumpTraceCommand = Command.ConsoleCommand(_DumpTrace, commandPrefix + ".dump_trace")
+
+def _OnStart (cause: LoadingShared.LoadingCauses) -> None:
+	if cause:
+		pass
+
+	DumpTraceCommand.RegisterCommand()
+
+def _OnStop (cause: LoadingShared.UnloadingCauses) -> None:
+	if cause:
+		pass
+
+	DumpTraceCommand.UnregisterCommand()
+
+def _DumpTrace (_connection: int = None) -> None:
+	output = commands.CheatOutput(_connection)
+
+	try:
+		if not Tracing.Enabled:
+			output("Tracing is disabled, create a file named '" + Paths.StripUserDataPath(Tracing.EnableFilePath) + "' and restart the game to enable it.")
+			return
+
+		output("Wrote the trace to '" + Paths.StripUserDataPath(Tracing.Dump()) + "'.")
+	except Exception as e:
+		output("Failed to write the trace.")
+
+		Debug.Log("Failed to write the trace.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__, exception = e)
+
+_Setup()
@@ -1,56 +1,244 @@
 from __future__ import annotations
 
 import abc
+import atexit
 import copy
+import enum_lib
 import json
 import os
+import threading
+import time
 import typing
+import weakref
+
+try:
+	import sqlite3
+except ImportError:
+	sqlite3 = None
 
 from NeonOcean.S4.Order import Debug, Paths, This
 from NeonOcean.S4.Order.Tools import Events, Exceptions, Types, Version
 
+_writeBehindFiles = weakref.WeakSet()  # type: weakref.WeakSet
+
+class FileSyncPolicies(enum_lib.IntEnum):
+	Never = 0  # type: FileSyncPolicies
+	File = 1  # type: FileSyncPolicies
+	FileAndDirectory = 2  # type: FileSyncPolicies
+
+class UpdateEventArguments(Events.EventArguments):
+	def __init__ (self, owner: Persistent, oldValues: typing.Dict[str, typing.Any]):
+		"""
+		The arguments given to the 'OnUpdate' event of persistence objects.
+		:param owner: The persistence object that is being updated.
+		:type owner: Persistent
+		:param oldValues: The keys set or reset since the last update, paired with the value each key had before the first of those changes.
+		:type oldValues: typing.Dict[str, typing.Any]
+		"""
+
+		self.ChangedKeys = frozenset(oldValues.keys())  # type: typing.FrozenSet[str]
+
+		self._owner = owner  # type: Persistent
+		self._oldValues = oldValues  # type: typing.Dict[str, typing.Any]
+
+	def Changed (self, key: str) -> bool:
+		"""
+		Get whether or not a key has been set or reset since the last update. The key's value may still be equal to what it was before.
+		"""
+
+		return key in self.ChangedKeys
+
+	def GetOldValue (self, key: str) -> typing.Any:
+		"""
+		Get the value a changed key had at the last update. The value will be copied unless the owner freezes its values, values are only copied when this
+		is called.
+		"""
+
+		if key not in self._oldValues:
+			raise KeyError("The persistent data '" + key + "' has not changed since the last update.")
+
+		oldValue = self._oldValues[key]  # type: typing.Any
+
+		if isinstance(oldValue, (FrozenList, FrozenDictionary)) or type(oldValue) in _immutableTypes:
+			return oldValue
+
+		return copy.deepcopy(oldValue)
+
+	def GetNewValue (self, key: str) -> typing.Any:
+		"""
+		Get the current value of a changed key, this is the same as calling the owner's get method.
+		"""
+
+		if key not in self._oldValues:
+			raise KeyError("The persistent data '" + key + "' has not changed since the last update.")
+
+		return self._owner.Get(key)
+
+class PersistentTransaction:
+	def __init__ (self, owner: Persistent):
+		"""
+		Stages changes to a persistence object until the outermost transaction exits. These should be created through the persistence object's transaction
+		method.
+		"""
+
+		if not isinstance(owner, Persistent):
+			raise Exceptions.IncorrectTypeException(owner, "owner", (Persistent,))
+
+		self.Owner = owner  # type: Persistent
+		self.ThreadIdentifier = threading.get_ident()  # type: int
+
+		self.StagedChanges = list()  # type: typing.List[typing.Tuple[typing.Optional[str], bool, typing.Any]]
+		self.SaveRequested = False  # type: bool
+		self.UpdateRequested = False  # type: bool
+
+		self._outerTransaction = None  # type: typing.Optional[PersistentTransaction]
+
+	def __enter__ (self) -> PersistentTransaction:
+		# noinspection PyProtectedMember
+		activeTransaction = self.Owner._GetActiveTransaction()  # type: typing.Optional[PersistentTransaction]
+
+		if activeTransaction is not None:
+			self._outerTransaction = activeTransaction
+			return activeTransaction
+
+		# Only one thread can have a transaction open on a persistence object, any other thread waits here until that transaction has been committed.
+		# noinspection PyProtectedMember
+		self.Owner._transactionLock.acquire()
+		self.Owner._transaction = self
+		return self
+
+	def __exit__ (self, exceptionType, exceptionValue, exceptionTraceback) -> bool:
+		if self._outerTransaction is not None:
+			self._outerTransaction = None
+			return False
+
+		# The lock is held until the changes are committed. It is reentrant, so the commit's save and 'OnUpdate' callbacks can still open transactions of their own.
+		try:
+			self.Owner._transaction = None
+
+			if exceptionType is None:
+				# noinspection PyProtectedMember
+				self.Owner._CommitTransaction(self)
+		finally:
+			# noinspection PyProtectedMember
+			self.Owner._transactionLock.release()
+
+		return False
+
+	def StageSet (self, key: str, verifiedValue: typing.Any, autoSave: bool, autoUpdate: bool) -> None:
+		self.StagedChanges.append((key, False, verifiedValue))
+		self.SaveRequested = self.SaveRequested or autoSave
+		self.UpdateRequested = self.UpdateRequested or autoUpdate
+
+	def StageReset (self, key: typing.Optional[str], autoSave: bool, autoUpdate: bool) -> None:
+		self.StagedChanges.append((key, True, None))
+		self.SaveRequested = self.SaveRequested or autoSave
+		self.UpdateRequested = self.UpdateRequested or autoUpdate
+
 class Persistent(abc.ABC):
 	"""
 	A class for handling persistent data. This is an incomplete class, you would need to implement the load and save functions.
 	"""
 
 	class Value:
-		def __init__ (self, value: typing.Any, valueType: type, default: typing.Any, verify: typing.Callable, isSet: bool):
+		def __init__ (self, value: typing.Any, valueType: type, default: typing.Any, verify: typing.Callable, isSet: bool, frozen: bool = False):
 			"""
 			Used for storage of persistent data.
 			"""
 
-			self.Value = value  # type: typing.Any
 			self.ValueType = valueType  # type: type
-			self.Default = default  # type: typing.Any
 			self.Verify = verify  # type: typing.Callable
+			self.Frozen = frozen  # type: bool
+			self.Revision = 0  # type: int  # Increased every time the value is set or reset.
 			self._isSet = isSet  # type: bool
 
+			self._unverified = False  # type: bool
+			self._unverifiedValue = None  # type: typing.Any
+			self._unverifiedVersion = None  # type: typing.Optional[Version.Version]
+
+			self.Value = self._Store(value)  # type: typing.Any
+			self.Default = self._Store(default)  # type: typing.Any
+
 		def IsSet (self) -> bool:
 			return self._isSet
 
+		def IsVerified (self) -> bool:
+			return not self._unverified
+
 		def Save (self) -> typing.Any:
+			if self._unverified:
+				return copy.deepcopy(self._unverifiedValue)
+
+			if self.Frozen:
+				return self.Value
+
 			return copy.deepcopy(self.Value)
 
 		def Get (self) -> typing.Any:
+			if self.Frozen:
+				return self.Value
+
 			return copy.deepcopy(self.Value)
 
+		def GetMutable (self) -> typing.Any:
+			return ThawValue(self.Value)
+
 		def Set (self, value, version: Version.Version, verify: bool = True) -> None:
 			if verify:
-				copiedValue = copy.deepcopy(self.Verify(value, version))  # type: typing.Any
-			else:
-				copiedValue = copy.deepcopy(value)  # type: typing.Any
+				value = self.Verify(value, version)
+
+			self.Value = self._Store(value)
+			self.Revision += 1
+			self._ClearUnverified()
+
+		def SetUnverified (self, value, version: Version.Version) -> None:
+			"""
+			Hold on to a value without verifying it, the current value will be kept until the held value is verified.
+			"""
+
+			self._unverified = True
+			self._unverifiedValue = value
+			self._unverifiedVersion = version
+			self.Revision += 1
+
+		def VerifyUnverified (self) -> None:
+			"""
+			Verify and set the value held by the set unverified method. If verification fails the held value is dropped and the exception is raised.
+			"""
+
+			value = self._unverifiedValue  # type: typing.Any
+			version = self._unverifiedVersion  # type: typing.Optional[Version.Version]
+
+			self._ClearUnverified()
+			self.Revision += 1
 
-			self.Value = copiedValue
+			self.Set(value, version)
 
 		def Reset (self) -> None:
 			self.Value = self.Default
+			self.Revision += 1
 			self._isSet = False
+			self._ClearUnverified()
 
 		def Commit (self) -> None:
 			self._isSet = True
 
-	def __init__ (self, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace, alwaysSaveValues: bool = False):
+		def _ClearUnverified (self) -> None:
+			self._unverified = False
+			self._unverifiedValue = None
+			self._unverifiedVersion = None
+
+		def _Store (self, value: typing.Any) -> typing.Any:
+			if self.Frozen:
+				try:
+					return FreezeValue(value)
+				except TypeError:
+					# Values that cannot be frozen are still kept safe from outside changes, they just need to be copied like they would be otherwise.
+					self.Frozen = False
+
+			return copy.deepcopy(value)
+
+	def __init__ (self, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace, alwaysSaveValues: bool = False, frozenValues: bool = False, lazyVerify: bool = False):
 		"""
 		:param currentVersion: The current version of what ever will be controlling this persistence object.
 							   This value can allow you to correct outdated persistent data.
@@ -60,6 +248,13 @@ class Persistent(abc.ABC):
 		:param alwaysSaveValues: If this value is true this persistence object will save all values. Otherwise this object will not save values that have not been
 		set or were reset at some point.
 		:type alwaysSaveValues: bool
+		:param frozenValues: If this value is true values will be frozen when set and returned by the get method without being copied. Lists and dictionaries
+		are frozen into FrozenList and FrozenDictionary objects, which cannot be changed. Use the get mutable method if you need a copy that can be changed.
+		Values that cannot be frozen will be copied on every get, as they would be if this value was false.
+		:type frozenValues: bool
+		:param lazyVerify: If this value is true loaded values will not be verified until they are first retrieved, instead of all being verified while loading.
+		Problems found by the verify callbacks are reported the same way, just later. Values that have never been retrieved are saved as they were loaded.
+		:type lazyVerify: bool
 		"""
 
 		if not isinstance(currentVersion, Version.Version):
@@ -68,18 +263,44 @@ class Persistent(abc.ABC):
 		if not isinstance(hostNamespace, str):
 			raise Exceptions.IncorrectTypeException(hostNamespace, "hostNamespace", (str,))
 
+		if not isinstance(alwaysSaveValues, bool):
+			raise Exceptions.IncorrectTypeException(alwaysSaveValues, "alwaysSaveValues", (bool,))
+
+		if not isinstance(frozenValues, bool):
+			raise Exceptions.IncorrectTypeException(frozenValues, "frozenValues", (bool,))
+
+		if not isinstance(lazyVerify, bool):
+			raise Exceptions.IncorrectTypeException(lazyVerify, "lazyVerify", (bool,))
+
 		self.CurrentVersion = currentVersion  # type: Version.Version
 		self.HostNamespace = hostNamespace  # type: str
 
-		self.OnUpdate = Events.EventHandler()  # type: Events.EventHandler  # An event that is triggered to notify listeners of a changed value.
+		self.OnUpdate = Events.EventHandler()  # type: Events.EventHandler  # An event that is triggered to notify listeners of a changed value. The event arguments list the keys changed since the last update.
 		self.OnLoad = Events.EventHandler()  # type: Events.EventHandler  # An event that is triggered when new data is loaded.
 
 		self._loadedData = dict()  # type: typing.Dict[str, typing.Any]
+		self._loadedDataRevision = 0  # type: int
 		self._loadedLastVersion = None  # type: typing.Optional[Version.Version]
+		self._loadedKeyVersions = dict()  # type: typing.Dict[str, typing.Optional[Version.Version]]  # The versions of loaded values that were saved in a version other than the last version.
 
 		self._alwaysSaveValues = alwaysSaveValues  # type: bool
+		self._frozenValues = frozenValues  # type: bool
+		self._lazyVerify = lazyVerify  # type: bool
 
 		self._storage = dict()  # type: typing.Dict[str, Persistent.Value]
+		self._unsavedKeys = set()  # type: typing.Set[str]  # The keys set or reset since the last save, for persistence objects that save keys individually.
+
+		self._transaction = None  # type: typing.Optional[PersistentTransaction]
+		self._transactionLock = threading.RLock()  # type: threading.RLock  # Held by the thread with the open transaction until it has been committed.
+
+		# Stored values are replaced rather than modified, keeping a reference to the value a key had before it changed doesn't require a copy.
+		self._updateOldValues = dict()  # type: typing.Dict[str, typing.Any]
+
+		self._preloadLock = threading.RLock()  # type: threading.RLock
+		self._preloadThread = None  # type: typing.Optional[threading.Thread]
+		self._preloadPending = False  # type: bool
+		self._preloadApplying = False  # type: bool
+		self._preloadData = None  # type: typing.Any
 
 	@property
 	def LoadedLastVersion (self) -> typing.Optional[Version.Version]:
@@ -97,6 +318,22 @@ class Persistent(abc.ABC):
 	def PersistenceInformation (self) -> str:
 		return self.__class__.__name__
 
+	@property
+	def FrozenValues (self) -> bool:
+		"""
+		Whether or not values are frozen when set instead of being copied every time they are retrieved.
+		"""
+
+		return self._frozenValues
+
+	@property
+	def SupportsPreload (self) -> bool:
+		"""
+		Whether or not this persistence object can start loading on a background thread through the preload method.
+		"""
+
+		return False
+
 	@abc.abstractmethod
 	def Load (self, *args, **kwargs) -> typing.Any:
 		raise NotImplementedError()
@@ -155,12 +392,13 @@ class Persistent(abc.ABC):
 		if verifiedDefault != default:
 			Debug.Log("Verification of default value for persistent data '" + key + "' changed it.\n" + persistenceInformation, self.HostNamespace, level = Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
 
-		version = self.LoadedLastVersion
+		version = self._GetLoadedVersion(key)  # type: Version.Version
 
-		if version is None:
-			version = self.CurrentVersion
-
-		if key in self._loadedData:
+		if key in self._loadedData and self._lazyVerify:
+			valueStorage = self.Value(verifiedDefault, valueType, default, verify, True, frozen = self._frozenValues)  # type: Persistent.Value
+			valueStorage.SetUnverified(self._loadedData[key], version)
+			self._storage[key] = valueStorage
+		elif key in self._loadedData:
 			value = self._loadedData[key]
 
 			try:
@@ -169,9 +407,9 @@ class Persistent(abc.ABC):
 				Debug.Log("Verify callback found fault with the value that was stored for persistent data '" + key + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
 				value = verifiedDefault
 
-			self._storage[key] = self.Value(value, valueType, default, verify, True)
+			self._storage[key] = self.Value(value, valueType, default, verify, True, frozen = self._frozenValues)
 		else:
-			self._storage[key] = self.Value(verifiedDefault, valueType, default, verify, False)
+			self._storage[key] = self.Value(verifiedDefault, valueType, default, verify, False, frozen = self._frozenValues)
 
 	def IsSetup (self, key: str) -> bool:
 		"""
@@ -187,7 +425,33 @@ class Persistent(abc.ABC):
 	def Get (self, key: str):
 		"""
 		Gets the value of the persistent data specified by the key. The value returned will be a deep copy of what is stored, modifying it should never change
-		anything unless you set it with the set function.
+		anything unless you set it with the set function. If this object freezes its values, the stored value is returned as is; frozen values cannot be modified.
+
+		:param key: The name of the persistent data, is case sensitive.
+		:type key: str
+		:return: The return object will always be of the type specified for the target persistent data during setup.
+		"""
+
+		if not isinstance(key, str):
+			raise Exceptions.IncorrectTypeException(key, "key", (str,))
+
+		if not self.IsSetup(key):
+			raise Exception("Persistent data '" + key + "' is not setup.")
+
+		if self._preloadPending:
+			self._CompletePreload()
+
+		valueStorage = self._storage[key]  # type: Persistent.Value
+
+		if not valueStorage.IsVerified():
+			self._VerifyUnverifiedValue(key, valueStorage)
+
+		return valueStorage.Get()
+
+	def GetMutable (self, key: str):
+		"""
+		Gets a copy of the value of the persistent data specified by the key that can be modified. Frozen lists and dictionaries are turned back into regular
+		lists and dictionaries. Modifying the value returned will not change anything unless you set it with the set function.
 
 		:param key: The name of the persistent data, is case sensitive.
 		:type key: str
@@ -200,12 +464,20 @@ class Persistent(abc.ABC):
 		if not self.IsSetup(key):
 			raise Exception("Persistent data '" + key + "' is not setup.")
 
-		return self._storage[key].Get()
+		if self._preloadPending:
+			self._CompletePreload()
+
+		valueStorage = self._storage[key]  # type: Persistent.Value
+
+		if not valueStorage.IsVerified():
+			self._VerifyUnverifiedValue(key, valueStorage)
+
+		return valueStorage.GetMutable()
 
 	def Set (self, key: str, value, autoSave: bool = True, autoUpdate: bool = True) -> None:
 		"""
-		Set the value of the persistent data specified by the key. The value is deep copied before being but into storage, modifying the value after setting
-		it will not change the stored version.
+		Set the value of the persistent data specified by the key. The value is deep copied, or frozen if this object freezes its values, before being put into
+		storage, modifying the value after setting it will not change the stored version.
 
 		:param key: The name of the persistent data, is case sensitive.
 		:type key: str
@@ -236,10 +508,21 @@ class Persistent(abc.ABC):
 		if not isinstance(autoUpdate, bool):
 			raise Exceptions.IncorrectTypeException(autoUpdate, "autoUpdate", (bool,))
 
+		if self._preloadPending:
+			self._CompletePreload()
+
+		transaction = self._GetActiveTransaction()  # type: typing.Optional[PersistentTransaction]
+
+		if transaction is not None:
+			# Values are verified when staged, a value that cannot be verified should fail the call that tried to set it, not the commit.
+			transaction.StageSet(key, valueStorage.Verify(value, self.CurrentVersion), autoSave, autoUpdate)
+			return
+
+		self._RecordChange(key)
 		valueStorage.Set(value, self.CurrentVersion)
 
 		if autoSave:
-			self.Save()
+			self._AutoSave()
 
 		if autoUpdate:
 			self.Update()
@@ -257,6 +540,9 @@ class Persistent(abc.ABC):
 		if not self.IsSetup(key):
 			raise Exception("Persistent data '" + key + "' is not setup.")
 
+		if self._preloadPending:
+			self._CompletePreload()
+
 		valueStorage = self._storage[key]  # type: Persistent.Value
 		return valueStorage.IsSet()
 
@@ -276,18 +562,28 @@ class Persistent(abc.ABC):
 		if not isinstance(key, str) and key is not None:
 			raise Exceptions.IncorrectTypeException(key, "key", (str,))
 
+		if key is not None and not self.IsSetup(key):
+			raise Exception("Persistent data '" + key + "' is not setup.")
+
+		if self._preloadPending:
+			self._CompletePreload()
+
+		transaction = self._GetActiveTransaction()  # type: typing.Optional[PersistentTransaction]
+
+		if transaction is not None:
+			transaction.StageReset(key, autoSave, autoUpdate)
+			return
+
 		if key is None:
-			for valueStorage in self._storage.values():  # type: str, Persistent.Value
+			for resettingKey, valueStorage in self._storage.items():  # type: str, Persistent.Value
+				self._RecordChange(resettingKey)
 				valueStorage.Reset()
 		else:
-			if not self.IsSetup(key):
-				raise Exception("Persistent data '" + key + "' is not setup.")
-
-			valueStorage = self._storage[key]  # type: Persistent.Value
-			valueStorage.Reset()
+			self._RecordChange(key)
+			self._storage[key].Reset()
 
 		if autoSave:
-			self.Save()
+			self._AutoSave()
 
 		if autoUpdate:
 			self.Update()
@@ -300,6 +596,9 @@ class Persistent(abc.ABC):
 		:type key: str
 		"""
 
+		if self._preloadPending:
+			self._CompletePreload()
+
 		if key is None:
 			for valueStorage in self._storage.values():  # type: Persistent.Value
 				valueStorage.Commit()
@@ -309,22 +608,159 @@ class Persistent(abc.ABC):
 			if valueStorage is not None:
 				valueStorage.Commit()
 
+	def Preload (self) -> None:
+		"""
+		Start loading persistent data on a background thread. The rest of the load is finished by the first thread to get, set or reset a value, or to call
+		the load or save methods. That thread will wait for the background thread if it is not done yet. The 'OnLoad' and 'OnUpdate' events will be
+		triggered on that thread, never on the background thread. Not every persistence object supports this, check the supports preload property first.
+
+		:rtype: None
+		"""
+
+		if not self.SupportsPreload:
+			raise Exception("Persistence objects of the type '" + Types.GetFullName(self) + "' cannot be preloaded.\n" + self.PersistenceInformation)
+
+		with self._preloadLock:
+			if self._preloadPending:
+				return
+
+			self._preloadPending = True
+			self._preloadData = None
+			self._preloadThread = threading.Thread(target = self._PreloadThreadTarget, name = "Persistent Preload: " + self.PersistenceInformation, daemon = True)
+			self._preloadThread.start()
+
+	def Transaction (self) -> PersistentTransaction:
+		"""
+		Get a context manager that stages every set and reset call made within it on the current thread, then applies them all at once when it exits. At most one
+		save and one 'OnUpdate' event will occur, the event's arguments will list every key that was changed. If the context exits with an exception
+		nothing staged is applied. Getting a value within the context will still return the value from before the context was entered.
+
+		Transactions may be nested, the staged changes will be applied when the outermost transaction exits. Only one thread can have a transaction open at a
+		time, entering a transaction while another thread has one open waits until that transaction has been committed.
+
+		:rtype: PersistentTransaction
+		"""
+
+		return PersistentTransaction(self)
+
 	def Update (self) -> None:
 		"""
-		Triggers the 'OnUpdate' event.
+		Triggers the 'OnUpdate' event, the event arguments will list every key set or reset since the last update.
 		This should be called after any persistent data change where you elected not to allow for auto-updating.
 
 		:rtype: None
 		"""
 
-		self._InvokeOnUpdateEvent()
+		if self._preloadPending:
+			self._CompletePreload()
+
+		updateOldValues = self._updateOldValues  # type: typing.Dict[str, typing.Any]
+		self._updateOldValues = dict()
+
+		self._InvokeOnUpdateEvent(updateOldValues)
+
+	def _PreloadRead (self) -> typing.Any:
+		"""
+		Read and decode the persistent data. This is called on the background thread started by the preload method and should not touch any stored value.
+		Persistence objects that support preloading need to override this and the preload apply method.
+		:return: The data to be given to the preload apply method.
+		"""
+
+		raise NotImplementedError()
+
+	def _PreloadApply (self, preloadData: typing.Any) -> bool:
+		"""
+		Finish loading the data read by the preload read method. This is called on the first thread to need the loaded values.
+		:return: True if loading completed without incident, False if not.
+		:rtype: bool
+		"""
+
+		raise NotImplementedError()
+
+	def _PreloadThreadTarget (self) -> None:
+		try:
+			self._preloadData = self._PreloadRead()
+		except Exception:
+			Debug.Log("Failed to preload persistent data.\n" + self.PersistenceInformation, self.HostNamespace, Debug.LogLevels.Exception, group = self.HostNamespace, owner = __name__)
+			self._preloadData = None
+
+	def _CompletePreload (self) -> typing.Optional[bool]:
+		"""
+		Wait for the preload thread and finish loading its data, if a preload is pending.
+		:return: The result of the load, or None if no preload was pending.
+		:rtype: typing.Optional[bool]
+		"""
+
+		with self._preloadLock:
+			# Finishing the load will call methods that check for a pending preload, those calls need to pass straight through.
+			if not self._preloadPending or self._preloadApplying:
+				return None
+
+			self._preloadThread.join()
+			self._preloadApplying = True
+
+			try:
+				return self._PreloadApply(self._preloadData)
+			finally:
+				self._preloadThread = None
+				self._preloadData = None
+				self._preloadPending = False
+				self._preloadApplying = False
+
+	def _RecordChange (self, key: str) -> None:
+		"""
+		Note that a key is about to be set or reset, this must be called before the stored value is changed.
+		"""
+
+		self._unsavedKeys.add(key)
+
+		if key not in self._updateOldValues:
+			self._updateOldValues[key] = self._storage[key].Value
+
+	def _GetActiveTransaction (self) -> typing.Optional[PersistentTransaction]:
+		transaction = self._transaction  # type: typing.Optional[PersistentTransaction]
+
+		if transaction is None or transaction.ThreadIdentifier != threading.get_ident():
+			return None
+
+		return transaction
+
+	def _CommitTransaction (self, transaction: PersistentTransaction) -> None:
+		for stagedKey, stagedReset, stagedValue in transaction.StagedChanges:  # type: typing.Optional[str], bool, typing.Any
+			if stagedReset:
+				if stagedKey is None:
+					for resettingKey, valueStorage in self._storage.items():  # type: str, Persistent.Value
+						self._RecordChange(resettingKey)
+						valueStorage.Reset()
+				else:
+					self._RecordChange(stagedKey)
+					self._storage[stagedKey].Reset()
+			else:
+				self._RecordChange(stagedKey)
+				self._storage[stagedKey].Set(stagedValue, self.CurrentVersion, verify = False)
+
+		if transaction.SaveRequested:
+			self._AutoSave()
+
+		if transaction.UpdateRequested:
+			self.Update()
+
+	def _AutoSave (self) -> None:
+		"""
+		Called in place of the save method whenever a value changes and the caller asked for it to be saved automatically.
+		"""
+
+		self.Save()
 
-	def _LoadSetData (self, persistentData: dict, lastVersion: typing.Optional[Version.Version] = None) -> bool:
+	def _LoadSetData (self, persistentData: dict, lastVersion: typing.Optional[Version.Version] = None, keyVersions: typing.Optional[typing.Dict[str, typing.Optional[Version.Version]]] = None) -> bool:
 		"""
 		:param persistentData: The persistent data to be loaded. This should just be a dictionary with every key paired with its value.
 		:type persistentData: dict
 		:param lastVersion: The last version this data was saved successfully in.
 		:type lastVersion: Version.Version
+		:param keyVersions: The versions individual values were saved in, for persistence objects that do not save every value at once. Values not in this
+		dictionary are treated as having been saved in the last version.
+		:type keyVersions: typing.Optional[typing.Dict[str, typing.Optional[Version.Version]]]
 		:return: True if this completed without incident, False if not.
 		:rtype: bool
 		"""
@@ -335,6 +771,9 @@ class Persistent(abc.ABC):
 
 		changed = False
 
+		if keyVersions is None:
+			keyVersions = dict()
+
 		for persistentKey in list(persistentData.keys()):  # type: str
 			persistentValue = persistentData[persistentKey]  # type: typing.Any
 
@@ -357,8 +796,14 @@ class Persistent(abc.ABC):
 				operationSuccess = False
 				continue
 
+			keyVersion = keyVersions.get(persistentKey, lastVersion)  # type: typing.Optional[Version.Version]
+
+			if self._lazyVerify:
+				valueStorage.SetUnverified(persistentValue, keyVersion)
+				continue
+
 			try:
-				valueStorage.Set(persistentValue, lastVersion)
+				valueStorage.Set(persistentValue, keyVersion)
 			except Exception:
 				Debug.Log("Cannot set value '" + str(persistentValue) + "' for persistent data '" + persistentKey + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
 				persistentData.pop(persistentKey, None)
@@ -366,18 +811,57 @@ class Persistent(abc.ABC):
 				operationSuccess = False
 				continue
 
+		if self._frozenValues:
+			try:
+				persistentData = FreezeValue(persistentData)
+			except TypeError:
+				pass
+
 		self._loadedData = persistentData
+		self._loadedDataRevision += 1
 		self._loadedLastVersion = lastVersion
+		self._loadedKeyVersions = dict(keyVersions)
 
 		if changed:
-			self.Save()
+			self._AutoSave()
 
 		self.Update()
 
 		return operationSuccess
 
-	def _SaveGetData (self) -> typing.Tuple[bool, dict]:
+	def _GetLoadedVersion (self, key: str) -> Version.Version:
+		"""
+		Get the version the loaded value of a key was saved in. If that version is not known, the current version is returned.
+		"""
+
+		version = self._loadedKeyVersions.get(key, self._loadedLastVersion)  # type: typing.Optional[Version.Version]
+
+		if version is None:
+			return self.CurrentVersion
+
+		return Version.Version(str(version))
+
+	def _VerifyUnverifiedValue (self, key: str, valueStorage: Persistent.Value) -> None:
+		try:
+			valueStorage.VerifyUnverified()
+		except Exception:
+			Debug.Log("Verify callback found fault with the value that was stored for persistent data '" + key + "'.\n" + self.PersistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+
+			# Like a value that fails verification while loading, the stored value is discarded and will be replaced the next time this is saved.
+			if key in self._loadedData:
+				if isinstance(self._loadedData, FrozenDictionary):
+					self._loadedData = FrozenDictionary((loadedKey, loadedValue) for loadedKey, loadedValue in self._loadedData.items() if loadedKey != key)
+				else:
+					self._loadedData.pop(key, None)
+
+			self._unsavedKeys.add(key)
+
+	def _SaveGetData (self, entrySources: typing.Optional[typing.Dict[str, tuple]] = None) -> typing.Tuple[bool, dict]:
 		"""
+		:param entrySources: If this is not none, every saved key will be paired in this dictionary with where its value was copied from. Sources are the value's
+		storage object and its revision, or none and the loaded data revision for values that came from the loaded data. Revisions are read before the value is
+		copied, a value changed by another thread part way through this can only make the revision older than the copy, never newer.
+		:type entrySources: typing.Optional[typing.Dict[str, tuple]]
 		:return: The first value indicates if this method completed without incident. The second is the save data.
 		:rtype: typing.Tuple[bool, dict]
 		"""
@@ -386,23 +870,41 @@ class Persistent(abc.ABC):
 
 		persistenceInformation = self.PersistenceInformation  # type: str
 
-		persistentData = copy.deepcopy(self._loadedData)  # type: typing.Dict[str, typing.Any]
+		loadedDataRevision = self._loadedDataRevision  # type: int
+
+		if isinstance(self._loadedData, FrozenDictionary):
+			# Frozen loaded data cannot be changed by anyone, the save data only needs its own dictionary.
+			persistentData = dict(self._loadedData)  # type: typing.Dict[str, typing.Any]
+		else:
+			persistentData = copy.deepcopy(self._loadedData)  # type: typing.Dict[str, typing.Any]
+
+		if entrySources is not None:
+			for persistentKey in persistentData.keys():  # type: str
+				entrySources[persistentKey] = (None, loadedDataRevision)
 
-		for persistentKey, persistentValueStorage in self._storage.items():  # type: str, Persistent.Value
+		for persistentKey, persistentValueStorage in list(self._storage.items()):  # type: str, Persistent.Value
 			try:
 				if self._alwaysSaveValues or persistentValueStorage.IsSet:
+					valueRevision = persistentValueStorage.Revision  # type: int
 					persistentData[persistentKey] = persistentValueStorage.Save()
+
+					if entrySources is not None:
+						entrySources[persistentKey] = (persistentValueStorage, valueRevision)
 			except Exception:
 				Debug.Log("Failed to save value of '" + persistentKey + "'. This entry may be reset the next time this persistent data is loaded.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
 				persistentData.pop(persistentKey, None)
+
+				if entrySources is not None:
+					entrySources.pop(persistentKey, None)
+
 				operationSuccess = False
 
 		return operationSuccess, persistentData
 
-	def _InvokeOnUpdateEvent (self) -> Events.EventArguments:
-		eventArguments = Events.EventArguments()  # type: Events.EventArguments
+	def _InvokeOnUpdateEvent (self, oldValues: typing.Dict[str, typing.Any]) -> UpdateEventArguments:
+		eventArguments = UpdateEventArguments(self, oldValues)  # type: UpdateEventArguments
 
-		for updateCallback in self.OnUpdate:  # type: typing.Callable[[Persistent, Events.EventArguments], None]
+		for updateCallback in self.OnUpdate:  # type: typing.Callable[[Persistent, UpdateEventArguments], None]
 			try:
 				updateCallback(self, eventArguments)
 			except:
@@ -430,11 +932,13 @@ class PersistentDirect(Persistent):
 	_valuesKey = "Values"
 	_lastVersionKey = "LastVersion"
 
-	def Load (self, persistentDataContainer: dict) -> bool:
+	def Load (self, persistentDataContainer: dict, keyVersions: typing.Optional[typing.Dict[str, typing.Optional[Version.Version]]] = None) -> bool:
 		"""
 		Load persistent data from a persistent data container.
 		:param persistentDataContainer: The persistent data container dictionary.
 		:type persistentDataContainer: dict
+		:param keyVersions: The versions individual values were saved in, if they differ from the container's last version.
+		:type keyVersions: typing.Optional[typing.Dict[str, typing.Optional[Version.Version]]]
 		:rtype: None
 		"""
 
@@ -470,7 +974,7 @@ class PersistentDirect(Persistent):
 					operationSuccess = False
 
 		self.Reset(autoSave = False, autoUpdate = False)
-		setDataSuccess = self._LoadSetData(persistentData, lastVersion = lastVersion)  # type: bool
+		setDataSuccess = self._LoadSetData(persistentData, lastVersion = lastVersion, keyVersions = keyVersions)  # type: bool
 
 		self._InvokeOnLoadEvent()
 
@@ -502,6 +1006,12 @@ class PersistentJson(PersistentDirect):
 	as the return value when using the save method.
 	"""
 
+	def __init__ (self, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace, alwaysSaveValues: bool = False, frozenValues: bool = False, lazyVerify: bool = False):
+		super().__init__(currentVersion, hostNamespace = hostNamespace, alwaysSaveValues = alwaysSaveValues, frozenValues = frozenValues, lazyVerify = lazyVerify)
+
+		# Encoded entries are kept between saves and only encoded again once the value they were made from has changed.
+		self._entryStrings = dict()  # type: typing.Dict[str, typing.Tuple[tuple, str]]
+
 	def Load (self, persistentDataContainerString: str, *args) -> bool:
 		"""
 		Load persistent data from the file path specified when initiating this object, if it exists.
@@ -512,11 +1022,21 @@ class PersistentJson(PersistentDirect):
 
 		operationSuccess = True  # type: bool
 
-		persistenceInformation = self.PersistenceInformation  # type: str
-
 		if not isinstance(persistentDataContainerString, str):
 			raise Exceptions.IncorrectTypeException(persistentDataContainerString, "persistentDataContainerString", (str,))
 
+		persistentDataContainer = self._DecodeContainer(persistentDataContainerString)  # type: dict
+
+		loadSuccessful = super().Load(persistentDataContainer)  # type: bool
+
+		if not loadSuccessful:
+			return False
+
+		return operationSuccess
+
+	def _DecodeContainer (self, persistentDataContainerString: str) -> dict:
+		persistenceInformation = self.PersistenceInformation  # type: str
+
 		try:
 			persistentDataContainer = json.JSONDecoder().decode(persistentDataContainerString)
 		except Exception:
@@ -527,12 +1047,7 @@ class PersistentJson(PersistentDirect):
 			Debug.Log("Could not convert persistent data container string to a dictionary.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
 			persistentDataContainer = { }
 
-		loadSuccessful = super().Load(persistentDataContainer)  # type: bool
-
-		if not loadSuccessful:
-			return False
-
-		return operationSuccess
+		return persistentDataContainer
 
 	def Save (self) -> typing.Tuple[bool, str]:
 		"""
@@ -542,21 +1057,49 @@ class PersistentJson(PersistentDirect):
 		:rtype: typing.Tuple[bool, dict]
 		"""
 
+		# The cached entries are matched to where each value was copied from when it was copied, a value changed by another thread after that will be
+		# encoded again by the next save.
+		entrySources = dict()  # type: typing.Dict[str, tuple]
+		saveSuccess, persistentData = self._SaveGetData(entrySources)  # type: bool, dict
+
+		encodeSuccess, persistentDataContainerString = self._EncodeContainer(persistentData, entrySources)  # type: bool, str
+
+		if not saveSuccess:
+			return False, persistentDataContainerString
+
+		return encodeSuccess, persistentDataContainerString
+
+	def _EncodeContainer (self, persistentData: dict, entrySources: typing.Dict[str, tuple]) -> typing.Tuple[bool, str]:
+		"""
+		Encode data returned by the save get data method to a persistent data container string. This only reads the values it is given, not the stored values.
+		:return: The first value indicates if this method completed without incident. The second is the persistent data container string.
+		:rtype: typing.Tuple[bool, str]
+		"""
+
 		operationSuccess = True  # type: bool
 
 		persistenceInformation = self.PersistenceInformation  # type: str
 
-		saveSuccess, persistentDataContainer = super().Save()  # type: bool, dict
+		persistentDataEntryStrings = list()  # type: typing.List[str]
 
-		persistentData = persistentDataContainer[self._valuesKey]  # type: dict
-		persistentDataValuesString = ""  # type: str
+		entryStrings = dict()  # type: typing.Dict[str, typing.Tuple[tuple, str]]
+		encoder = json.JSONEncoder(indent = "\t")  # type: json.JSONEncoder
 
 		for persistentKey, persistentValue in persistentData.items():  # type: str, typing.Any
+			entrySource = entrySources[persistentKey]  # type: tuple
+
+			cachedEntry = self._entryStrings.get(persistentKey, None)  # type: typing.Optional[typing.Tuple[tuple, str]]
+
+			if cachedEntry is not None and cachedEntry[0][0] is entrySource[0] and cachedEntry[0][1] == entrySource[1]:
+				entryStrings[persistentKey] = cachedEntry
+				persistentDataEntryStrings.append(cachedEntry[1])
+				continue
+
 			keyInformation = "Key: " + persistentKey  # type: str
 
 			try:
 				assert isinstance(persistentKey, str)
-				persistentKeyString = json.JSONEncoder(indent = "\t").encode(persistentKey)  # type: str
+				persistentKeyString = encoder.encode(persistentKey)  # type: str
 				assert "\n" not in persistentKeyString and "\r" not in persistentKeyString
 			except Exception:
 				Debug.Log("Failed to encode a persistence key to a json string.\n" + keyInformation + "\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Exception, group = self.HostNamespace, owner = __name__)
@@ -566,7 +1109,7 @@ class PersistentJson(PersistentDirect):
 			valueInformation = "Value Type: " + Types.GetFullName(persistentKey) + "\nValue Value: " + persistentKey  # type: str
 
 			try:
-				persistentValueString = json.JSONEncoder(indent = "\t").encode(persistentValue)  # type: str
+				persistentValueString = encoder.encode(persistentValue)  # type: str
 			except Exception:
 				Debug.Log("Failed to encode a persistence value to a json string.\n" + keyInformation + "\n" + valueInformation + "\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Exception, group = self.HostNamespace, owner = __name__)
 				operationSuccess = False
@@ -574,10 +1117,13 @@ class PersistentJson(PersistentDirect):
 
 			persistentValueString = persistentValueString.replace("\n", "\n\t\t")
 
-			if persistentDataValuesString != "":
-				persistentDataValuesString += ",\n"
+			entryString = "\t\t" + persistentKeyString + ": " + persistentValueString  # type: str
+			entryStrings[persistentKey] = (entrySource, entryString)
+			persistentDataEntryStrings.append(entryString)
 
-			persistentDataValuesString += "\t\t" + persistentKeyString + ": " + persistentValueString
+		self._entryStrings = entryStrings
+
+		persistentDataValuesString = ",\n".join(persistentDataEntryStrings)  # type: str
 
 		persistentDataString = "\t\"" + self._valuesKey + "\": {"  # type: str
 
@@ -586,18 +1132,15 @@ class PersistentJson(PersistentDirect):
 		else:
 			persistentDataString += "}"
 
-		lastVersion = persistentDataContainer[self._lastVersionKey]  # type: str
+		lastVersion = str(self.CurrentVersion)  # type: str
 
 		try:
-			lastVersionString = "\t\"" + self._lastVersionKey + "\": " + json.JSONEncoder(indent = "\t").encode(lastVersion)  # type: str
+			lastVersionString = "\t\"" + self._lastVersionKey + "\": " + encoder.encode(lastVersion)  # type: str
 		except Exception as e:
 			raise Exception("Failed to encode a persistence last version to a json string.") from e
 
 		persistentDataContainerString = "{\n" + persistentDataString + ",\n" + lastVersionString + "\n}"  # type: str
 
-		if not saveSuccess:
-			return False, persistentDataContainerString
-
 		return operationSuccess, persistentDataContainerString
 
 class PersistentFile(PersistentJson):
@@ -605,7 +1148,8 @@ class PersistentFile(PersistentJson):
 	A class for handling persistent data. This version will read and write the data to a file through the load and save methods.
 	"""
 
-	def __init__ (self, filePath: str, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace, alwaysSaveValues: bool = False):
+	def __init__ (self, filePath: str, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace, alwaysSaveValues: bool = False, frozenValues: bool = False,
+				  lazyVerify: bool = False, writeBehind: bool = False, syncPolicy: FileSyncPolicies = FileSyncPolicies.Never):
 		"""
 		:param filePath: The file path this persistence object will be written to and read from.
 		:type filePath: str
@@ -617,39 +1161,77 @@ class PersistentFile(PersistentJson):
 		:param alwaysSaveValues: If this value is true this persistence object will save all values. Otherwise this object will not save values that have not been
 		set or were reset at some point.
 		:type alwaysSaveValues: bool
+		:param frozenValues: If this value is true values will be frozen when set and returned by the get method without being copied.
+		:type frozenValues: bool
+		:param lazyVerify: If this value is true loaded values will not be verified until they are first retrieved.
+		:type lazyVerify: bool
+		:param writeBehind: If this value is true automatic saves will not write the file immediately. The file will instead be written by a background thread
+		once no value has changed for the quiet period, or once the maximum delay has passed since the first unsaved change. Unsaved changes are also written
+		when the flush or save methods are called and when the game exits.
+		:type writeBehind: bool
+		:param syncPolicy: How much of a save should be forced onto the disk before it is considered finished. Saves are always written to a temporary file that
+		then replaces the real file, a crash during a save will leave either the old or the new file. The 'File' policy also makes sure the new file's contents
+		reached the disk before it replaces the old one, protecting against power loss or an operating system crash. The 'FileAndDirectory' policy also makes sure
+		the replacement itself reached the disk, this does nothing on Windows. Each step makes saving slower.
+		:type syncPolicy: FileSyncPolicies
 		"""
 
 		if not isinstance(filePath, str):
 			raise Exceptions.IncorrectTypeException(filePath, "path", (str,))
 
-		super().__init__(currentVersion, hostNamespace = hostNamespace, alwaysSaveValues = alwaysSaveValues)
+		if not isinstance(writeBehind, bool):
+			raise Exceptions.IncorrectTypeException(writeBehind, "writeBehind", (bool,))
+
+		if not isinstance(syncPolicy, FileSyncPolicies):
+			raise Exceptions.IncorrectTypeException(syncPolicy, "syncPolicy", (FileSyncPolicies,))
+
+		super().__init__(currentVersion, hostNamespace = hostNamespace, alwaysSaveValues = alwaysSaveValues, frozenValues = frozenValues, lazyVerify = lazyVerify)
 
 		self.FilePath = filePath  # type: str
+		self.SyncPolicy = syncPolicy  # type: FileSyncPolicies
+
+		self.WriteBehind = writeBehind  # type: bool
+		self.WriteBehindQuietPeriod = 1  # type: typing.Union[float, int]  # The time in seconds without any change that will cause unsaved changes to be written.
+		self.WriteBehindMaximumDelay = 10  # type: typing.Union[float, int]  # The most time in seconds unsaved changes may wait before being written.
+
+		self._writeCondition = threading.Condition()  # type: threading.Condition
+		self._writeThread = None  # type: typing.Optional[threading.Thread]
+		self._writing = False  # type: bool
+		self._firstUnsavedChangeTime = None  # type: typing.Optional[float]
+		self._lastUnsavedChangeTime = None  # type: typing.Optional[float]
 
 	@property
 	def PersistenceInformation (self) -> str:
 		return "%s | File %s" % (self.__class__.__name__, Paths.StripUserDataPath(self.FilePath))
 
+	@property
+	def SupportsPreload (self) -> bool:
+		return True
+
+	@property
+	def HasUnsavedChanges (self) -> bool:
+		"""
+		Whether or not changes are waiting to be written by the write behind thread.
+		"""
+
+		return self._firstUnsavedChangeTime is not None
+
 	def Load (self, *args) -> bool:
 		"""
-		Load persistent data from the file path specified when initiating this object, if it exists.
+		Load persistent data from the file path specified when initiating this object, if it exists. If a preload is pending this will finish it instead
+		of reading the file again.
 		:rtype: None
 		"""
 
-		operationSuccess = True  # type: bool
+		if self._preloadPending:
+			preloadSuccessful = self._CompletePreload()  # type: typing.Optional[bool]
 
-		persistenceInformation = self.PersistenceInformation  # type: str
+			if preloadSuccessful is not None:
+				return preloadSuccessful
 
-		persistentDataContainerString = "{}"  # type: str
+		operationSuccess = True  # type: bool
 
-		if os.path.exists(self.FilePath):
-			try:
-				with open(self.FilePath) as persistentFile:
-					persistentDataContainerString = persistentFile.read()
-			except Exception:
-				Debug.Log("Failed to read from '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
-
-		loadSuccessful = super().Load(persistentDataContainerString)  # type: bool
+		loadSuccessful = super().Load(self._ReadFile())  # type: bool
 
 		if not loadSuccessful:
 			return False
@@ -658,11 +1240,119 @@ class PersistentFile(PersistentJson):
 
 	def Save (self) -> bool:
 		"""
-		Saves the currently stored persistent data to the file path specified when initiating this object.
+		Saves the currently stored persistent data to the file path specified when initiating this object. This will always write the file immediately, any
+		changes waiting on the write behind thread are written along with it.
 		If the directory the save file is in doesn't exist one will be created.
 		:rtype: None
 		"""
 
+		# Saving before a pending preload is applied would replace the file with default values.
+		if self._preloadPending:
+			self._CompletePreload()
+
+		with self._writeCondition:
+			while self._writing:
+				self._writeCondition.wait()
+
+			self._firstUnsavedChangeTime = None
+			self._lastUnsavedChangeTime = None
+			self._writing = True
+
+		try:
+			return self._Write()
+		finally:
+			with self._writeCondition:
+				self._writing = False
+				self._writeCondition.notify_all()
+
+	def Flush (self) -> bool:
+		"""
+		Wait for any write in progress to finish, then write any changes still waiting on the write behind thread. Once this returns every change made before
+		it was called has been written to the file.
+		:return: False if the file needed to be written and writing it did not complete without incident, True otherwise.
+		:rtype: bool
+		"""
+
+		with self._writeCondition:
+			while self._writing:
+				self._writeCondition.wait()
+
+			if self._firstUnsavedChangeTime is None:
+				return True
+
+		return self.Save()
+
+	def _PreloadRead (self) -> dict:
+		return self._DecodeContainer(self._ReadFile())
+
+	def _PreloadApply (self, preloadData: typing.Optional[dict]) -> bool:
+		if preloadData is None:
+			preloadData = { }
+
+		return PersistentDirect.Load(self, preloadData)
+
+	def _ReadFile (self) -> str:
+		persistentDataContainerString = "{}"  # type: str
+
+		if os.path.exists(self.FilePath):
+			try:
+				with open(self.FilePath) as persistentFile:
+					persistentDataContainerString = persistentFile.read()
+			except Exception:
+				Debug.Log("Failed to read from '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + self.PersistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+
+		return persistentDataContainerString
+
+	def _AutoSave (self) -> None:
+		if not self.WriteBehind:
+			self.Save()
+			return
+
+		with self._writeCondition:
+			changeTime = time.monotonic()  # type: float
+
+			if self._firstUnsavedChangeTime is None:
+				self._firstUnsavedChangeTime = changeTime
+
+			self._lastUnsavedChangeTime = changeTime
+
+			if self._writeThread is None:
+				self._writeThread = threading.Thread(target = self._WriteBehindLoop, name = "PersistentFile Writer: " + os.path.basename(self.FilePath), daemon = True)
+				self._writeThread.start()
+				_writeBehindFiles.add(self)
+
+			self._writeCondition.notify_all()
+
+	def _WriteBehindLoop (self) -> None:
+		while True:
+			with self._writeCondition:
+				while True:
+					if self._firstUnsavedChangeTime is None or self._writing:
+						self._writeCondition.wait()
+						continue
+
+					writeTime = min(self._lastUnsavedChangeTime + self.WriteBehindQuietPeriod, self._firstUnsavedChangeTime + self.WriteBehindMaximumDelay)  # type: float
+					waitTime = writeTime - time.monotonic()  # type: float
+
+					if waitTime <= 0:
+						break
+
+					self._writeCondition.wait(waitTime)
+
+				self._firstUnsavedChangeTime = None
+				self._lastUnsavedChangeTime = None
+				self._writing = True
+
+			try:
+				self._Write()
+			except Exception:
+				Debug.Log("Write behind thread failed to save persistent data.\n" + self.PersistenceInformation, self.HostNamespace, Debug.LogLevels.Exception, group = self.HostNamespace, owner = __name__)
+			finally:
+				with self._writeCondition:
+					self._writing = False
+					self._writeCondition.notify_all()
+
+	def _Write (self) -> bool:
 		operationSuccess = True  # type: bool
 
 		persistenceInformation = self.PersistenceInformation  # type: str
@@ -670,16 +1360,925 @@ class PersistentFile(PersistentJson):
 		saveSuccessful, persistentDataContainerString = super().Save()  # type: bool, str
 
 		try:
-			if not os.path.exists(os.path.dirname(self.FilePath)):
-				os.makedirs(os.path.dirname(self.FilePath))
-
-			with open(self.FilePath, mode = "w+") as persistentFile:
-				persistentFile.write(persistentDataContainerString)
+			_WriteFileAtomically(self.FilePath, persistentDataContainerString, self.SyncPolicy)
 		except Exception:
-			Debug.Log("Failed to read to '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+			Debug.Log("Failed to write to '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
 			operationSuccess = False
 
 		if not saveSuccessful:
 			return False
 
-		return operationSuccess
\ No newline at end of file
+		return operationSuccess
+
+class PersistentJournal(PersistentJson):
+	"""
+	A class for handling persistent data. This version keeps a snapshot file, written in the same format as the persistent file class, and a journal file next
+	to it. Saving only appends a short record for each changed value to the journal instead of rewriting every value. Loading reads the snapshot and replays
+	the journal over it. Once the journal grows too large it is folded back into the snapshot on a background thread.
+	"""
+
+	_journalKeyKey = "Key"  # type: str
+	_journalValueKey = "Value"  # type: str
+
+	def __init__ (self, filePath: str, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace, alwaysSaveValues: bool = False, frozenValues: bool = False,
+				  lazyVerify: bool = False, syncPolicy: FileSyncPolicies = FileSyncPolicies.Never):
+		"""
+		:param filePath: The file path of the snapshot file. The journal file is kept at this path with '.journal' appended.
+		:type filePath: str
+		:param currentVersion: The current version of what ever will be controlling this persistence object.
+							   This value can allow you to correct outdated persistent data.
+		:type currentVersion: Version.Version
+		:param hostNamespace: Errors made by this persistent object will show up under this namespace.
+		:type hostNamespace: str
+		:param alwaysSaveValues: If this value is true this persistence object will save all values. Otherwise this object will not save values that have not been
+		set or were reset at some point.
+		:type alwaysSaveValues: bool
+		:param frozenValues: If this value is true values will be frozen when set and returned by the get method without being copied.
+		:type frozenValues: bool
+		:param lazyVerify: If this value is true loaded values will not be verified until they are first retrieved.
+		:type lazyVerify: bool
+		:param syncPolicy: How much of a save should be forced onto the disk before it is considered finished. Any policy other than 'Never' will make sure
+		journal records reached the disk every time they are appended.
+		:type syncPolicy: FileSyncPolicies
+		"""
+
+		if not isinstance(filePath, str):
+			raise Exceptions.IncorrectTypeException(filePath, "path", (str,))
+
+		if not isinstance(syncPolicy, FileSyncPolicies):
+			raise Exceptions.IncorrectTypeException(syncPolicy, "syncPolicy", (FileSyncPolicies,))
+
+		super().__init__(currentVersion, hostNamespace = hostNamespace, alwaysSaveValues = alwaysSaveValues, frozenValues = frozenValues, lazyVerify = lazyVerify)
+
+		self.FilePath = filePath  # type: str
+		self.JournalFilePath = filePath + ".journal"  # type: str
+		self.SyncPolicy = syncPolicy  # type: FileSyncPolicies
+
+		self.CompactionSize = 262144  # type: int  # The journal will be compacted once it is at least this many bytes long.
+		self.CompactionRatio = 2  # type: typing.Union[float, int]  # The journal will also be compacted once it is at least this many times longer than the snapshot.
+		self.CompactionMinimumSize = 4096  # type: int  # The journal will never be compacted because of the ratio while shorter than this many bytes.
+
+		self._journalLock = threading.RLock()  # type: threading.RLock
+		self._compactionLock = threading.Lock()  # type: threading.Lock
+		self._loading = False  # type: bool
+		self._journalHasHeader = False  # type: bool
+		self._journalSize = 0  # type: int
+		self._snapshotSize = 0  # type: int
+		self._compactionThread = None  # type: typing.Optional[threading.Thread]
+
+	@property
+	def PersistenceInformation (self) -> str:
+		return "%s | File %s" % (self.__class__.__name__, Paths.StripUserDataPath(self.FilePath))
+
+	@property
+	def OldJournalFilePath (self) -> str:
+		"""
+		The path a journal is moved to while it is being compacted.
+		"""
+
+		return self.JournalFilePath + ".old"
+
+	@property
+	def SupportsPreload (self) -> bool:
+		return True
+
+	def Load (self, *args) -> bool:
+		"""
+		Load persistent data from the snapshot file and replay the journal over it, if they exist. If a preload is pending this will finish it instead of
+		reading the files again.
+		:rtype: None
+		"""
+
+		if self._preloadPending:
+			preloadSuccessful = self._CompletePreload()  # type: typing.Optional[bool]
+
+			if preloadSuccessful is not None:
+				return preloadSuccessful
+
+		with self._journalLock:
+			return self._LoadRead(self._ReadFiles())
+
+	def Save (self) -> bool:
+		"""
+		Append a record to the journal for every value changed since the last save. The snapshot file is only rewritten by compaction.
+		If the directory the journal is in doesn't exist one will be created.
+		:rtype: None
+		"""
+
+		if self._preloadPending:
+			self._CompletePreload()
+
+		with self._journalLock:
+			operationSuccess = self._AppendJournal()  # type: bool
+			compactionNeeded = self._CompactionNeeded()  # type: bool
+
+		if compactionNeeded:
+			self._StartCompaction()
+
+		return operationSuccess
+
+	def Compact (self) -> bool:
+		"""
+		Write every value to the snapshot file and discard the journal. This is normally done automatically on a background thread, calling this will do it
+		immediately on the current thread.
+		:return: True if this completed without incident, False if not.
+		:rtype: bool
+		"""
+
+		# Compacting before a pending preload is applied would replace the snapshot with default values.
+		if self._preloadPending:
+			self._CompletePreload()
+
+		with self._compactionLock:
+			return self._Compact()
+
+	def _PreloadRead (self) -> tuple:
+		with self._journalLock:
+			return self._ReadFiles()
+
+	def _PreloadApply (self, preloadData: typing.Optional[tuple]) -> bool:
+		with self._journalLock:
+			if preloadData is None:
+				preloadData = self._ReadFiles()
+
+			return self._LoadRead(preloadData)
+
+	def _ReadFiles (self) -> typing.Tuple[bool, dict, typing.Dict[str, typing.Optional[Version.Version]], int, int]:
+		"""
+		Read the snapshot and replay the journal over it without touching any stored value.
+		:return: Whether or not this completed without incident, the persistent data container, the versions of the replayed values, the snapshot's size and
+		the journal's size.
+		"""
+
+		operationSuccess = True  # type: bool
+
+		persistenceInformation = self.PersistenceInformation  # type: str
+
+		persistentDataContainer = dict()  # type: dict
+		snapshotSize = 0  # type: int
+
+		if os.path.exists(self.FilePath):
+			try:
+				with open(self.FilePath) as snapshotFile:
+					snapshotString = snapshotFile.read()  # type: str
+
+				snapshotSize = len(snapshotString)
+				persistentDataContainer = json.JSONDecoder().decode(snapshotString)
+			except Exception:
+				Debug.Log("Failed to read the snapshot file '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+				operationSuccess = False
+
+			if not isinstance(persistentDataContainer, dict):
+				Debug.Log("Could not convert the snapshot file to a dictionary.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+				persistentDataContainer = dict()
+				operationSuccess = False
+
+		if not isinstance(persistentDataContainer.get(self._valuesKey, None), dict):
+			persistentDataContainer[self._valuesKey] = dict()
+
+		# A journal left behind by a compaction that did not finish holds records older than those in the current journal.
+		journalSize = 0  # type: int
+		keyVersions = dict()  # type: typing.Dict[str, typing.Optional[Version.Version]]
+
+		for journalFilePath in (self.OldJournalFilePath, self.JournalFilePath):  # type: str
+			if not os.path.exists(journalFilePath):
+				continue
+
+			if not self._CutTornRecord(journalFilePath):
+				operationSuccess = False
+
+			if not self._ReplayJournal(journalFilePath, persistentDataContainer, keyVersions):
+				operationSuccess = False
+
+			if journalFilePath == self.JournalFilePath:
+				journalSize = os.path.getsize(journalFilePath)
+
+		return operationSuccess, persistentDataContainer, keyVersions, snapshotSize, journalSize
+
+	def _LoadRead (self, readData: typing.Tuple[bool, dict, typing.Dict[str, typing.Optional[Version.Version]], int, int]) -> bool:
+		"""
+		Load the data returned by the read files method. This should be called while holding the journal lock.
+		"""
+
+		operationSuccess, persistentDataContainer, keyVersions, snapshotSize, journalSize = readData  # type: bool, dict, typing.Dict[str, typing.Optional[Version.Version]], int, int
+
+		self._snapshotSize = snapshotSize
+		self._journalSize = journalSize
+		self._journalHasHeader = False
+
+		# Loading resets and sets every value, none of which needs to be written back to the journal.
+		self._loading = True
+
+		try:
+			loadSuccessful = PersistentDirect.Load(self, persistentDataContainer, keyVersions = keyVersions)  # type: bool
+		finally:
+			self._unsavedKeys = set()
+			self._loading = False
+
+		if not loadSuccessful:
+			return False
+
+		return operationSuccess
+
+	def _AutoSave (self) -> None:
+		if self._loading:
+			return
+
+		self.Save()
+
+	def _Compact (self) -> bool:
+		persistenceInformation = self.PersistenceInformation  # type: str
+
+		with self._journalLock:
+			operationSuccess = self._AppendJournal()  # type: bool
+
+			# Only the values are copied while the journal is locked, saves on other threads should not wait for the snapshot to be encoded.
+			entrySources = dict()  # type: typing.Dict[str, tuple]
+			getDataSuccessful, persistentData = self._SaveGetData(entrySources)  # type: bool, dict
+
+			if not getDataSuccessful:
+				operationSuccess = False
+
+			try:
+				if os.path.exists(self.JournalFilePath):
+					if os.path.exists(self.OldJournalFilePath):
+						# The last compaction failed to write its snapshot, its journal still needs to be kept until one is written.
+						with open(self.JournalFilePath) as journalFile, open(self.OldJournalFilePath, mode = "a") as oldJournalFile:
+							oldJournalFile.write(journalFile.read())
+
+						os.remove(self.JournalFilePath)
+					else:
+						os.replace(self.JournalFilePath, self.OldJournalFilePath)
+			except Exception:
+				Debug.Log("Failed to move the journal file '" + Paths.StripUserDataPath(self.JournalFilePath) + "' aside for compaction.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+				return False
+
+			self._journalSize = 0
+			self._journalHasHeader = False
+
+		# Records appended while the snapshot is being encoded and written go to a new journal, which is replayed over the snapshot the next time it is loaded.
+
+		encodeSuccessful, snapshotString = self._EncodeContainer(persistentData, entrySources)  # type: bool, str
+
+		if not encodeSuccessful:
+			operationSuccess = False
+
+		try:
+			_WriteFileAtomically(self.FilePath, snapshotString, self.SyncPolicy)
+			self._snapshotSize = len(snapshotString)
+
+			if os.path.exists(self.OldJournalFilePath):
+				os.remove(self.OldJournalFilePath)
+		except Exception:
+			Debug.Log("Failed to write to '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+			return False
+
+		return operationSuccess
+
+	def _CompactionNeeded (self) -> bool:
+		if self._journalSize >= self.CompactionSize:
+			return True
+
+		if self._journalSize >= self.CompactionMinimumSize and self._journalSize >= self._snapshotSize * self.CompactionRatio:
+			return True
+
+		return False
+
+	def _StartCompaction (self) -> None:
+		with self._journalLock:
+			if self._compactionThread is not None and self._compactionThread.is_alive():
+				return
+
+			self._compactionThread = threading.Thread(target = self._CompactionThreadTarget, name = "PersistentJournal Compaction: " + os.path.basename(self.FilePath), daemon = True)
+			self._compactionThread.start()
+
+	def _CompactionThreadTarget (self) -> None:
+		try:
+			self.Compact()
+		except Exception:
+			Debug.Log("Failed to compact persistent data.\n" + self.PersistenceInformation, self.HostNamespace, Debug.LogLevels.Exception, group = self.HostNamespace, owner = __name__)
+
+	def _AppendJournal (self) -> bool:
+		if len(self._unsavedKeys) == 0:
+			return True
+
+		unsavedKeys = self._unsavedKeys  # type: typing.Set[str]
+		self._unsavedKeys = set()
+
+		operationSuccess = True  # type: bool
+
+		persistenceInformation = self.PersistenceInformation  # type: str
+
+		recordEncoder = json.JSONEncoder(separators = (",", ":"))  # type: json.JSONEncoder
+		recordsString = ""  # type: str
+
+		if not self._journalHasHeader:
+			recordsString += recordEncoder.encode({ self._lastVersionKey: str(self.CurrentVersion) }) + "\n"
+
+		for persistentKey in sorted(unsavedKeys):  # type: str
+			valueStorage = self._storage.get(persistentKey, None)  # type: typing.Optional[Persistent.Value]
+
+			if valueStorage is None:
+				continue
+
+			try:
+				recordsString += recordEncoder.encode({ self._journalKeyKey: persistentKey, self._journalValueKey: valueStorage.Save() }) + "\n"
+			except Exception:
+				Debug.Log("Failed to encode a journal record for the persistent data '" + persistentKey + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Exception, group = self.HostNamespace, owner = __name__)
+				operationSuccess = False
+
+		try:
+			if not os.path.exists(os.path.dirname(self.JournalFilePath)):
+				os.makedirs(os.path.dirname(self.JournalFilePath))
+
+			with open(self.JournalFilePath, mode = "a") as journalFile:
+				journalFile.write(recordsString)
+
+				if self.SyncPolicy >= FileSyncPolicies.File:
+					journalFile.flush()
+					os.fsync(journalFile.fileno())
+
+				self._journalSize = journalFile.tell()
+		except Exception:
+			Debug.Log("Failed to write to '" + Paths.StripUserDataPath(self.JournalFilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+			self._unsavedKeys.update(unsavedKeys)
+			return False
+
+		self._journalHasHeader = True
+
+		return operationSuccess
+
+	def _CutTornRecord (self, journalFilePath: str) -> bool:
+		"""
+		Cut a journal file back to its last line break. The last record will be cut off if the game stopped while it was being written, left in place the next
+		record appended would be joined to it and be lost along with it.
+		:return: True if the journal ended in a complete record, False if a record was cut off or the journal could not be checked.
+		:rtype: bool
+		"""
+
+		persistenceInformation = self.PersistenceInformation  # type: str
+
+		try:
+			with open(journalFilePath, mode = "r+b") as journalFile:
+				fileSize = journalFile.seek(0, os.SEEK_END)  # type: int
+				completeSize = fileSize  # type: int
+
+				while completeSize > 0:
+					chunkStart = max(completeSize - 4096, 0)  # type: int
+					journalFile.seek(chunkStart)
+					lineEnd = journalFile.read(completeSize - chunkStart).rfind(b"\n")  # type: int
+
+					if lineEnd != -1:
+						completeSize = chunkStart + lineEnd + 1
+						break
+
+					completeSize = chunkStart
+
+				if completeSize == fileSize:
+					return True
+
+				journalFile.truncate(completeSize)
+
+				if self.SyncPolicy >= FileSyncPolicies.File:
+					journalFile.flush()
+					os.fsync(journalFile.fileno())
+		except Exception:
+			Debug.Log("Failed to check the journal file '" + Paths.StripUserDataPath(journalFilePath) + "' for a record that was cut off.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+			return False
+
+		Debug.Log("Dropped a journal record that was cut off at the end of '" + Paths.StripUserDataPath(journalFilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+		return False
+
+	def _ReplayJournal (self, journalFilePath: str, persistentDataContainer: dict, keyVersions: typing.Dict[str, typing.Optional[Version.Version]]) -> bool:
+		"""
+		Replay the records of a journal file over the persistent data container. The version each replayed value was saved in is added to the key versions
+		dictionary, values that are not replayed keep the version of the snapshot.
+		"""
+
+		operationSuccess = True  # type: bool
+
+		persistenceInformation = self.PersistenceInformation  # type: str
+
+		try:
+			with open(journalFilePath) as journalFile:
+				journalLines = journalFile.read().splitlines()  # type: typing.List[str]
+		except Exception:
+			Debug.Log("Failed to read the journal file '" + Paths.StripUserDataPath(journalFilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+			return False
+
+		persistentData = persistentDataContainer[self._valuesKey]  # type: dict
+		recordDecoder = json.JSONDecoder()  # type: json.JSONDecoder
+
+		# Every session that appends to a journal starts with a header naming the version the records after it were saved in.
+		recordsVersionKnown = False  # type: bool
+		recordsVersion = None  # type: typing.Optional[Version.Version]
+
+		for journalLineIndex, journalLine in enumerate(journalLines):  # type: int, str
+			if journalLine == "":
+				continue
+
+			try:
+				journalRecord = recordDecoder.decode(journalLine)  # type: dict
+
+				if not isinstance(journalRecord, dict):
+					raise Exception("Journal record is not a dictionary.")
+			except Exception:
+				# Records cut off at the end of the journal are removed before it is replayed, any other record that cannot be decoded is skipped.
+				Debug.Log("Skipping a journal record that could not be decoded on line %d of '%s'.\n%s" % (journalLineIndex + 1, Paths.StripUserDataPath(journalFilePath), persistenceInformation),
+						  self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+				operationSuccess = False
+				continue
+
+			if self._lastVersionKey in journalRecord:
+				recordsVersionKnown = True
+
+				try:
+					recordsVersion = Version.Version(journalRecord[self._lastVersionKey])
+				except Exception:
+					Debug.Log("Cannot convert the journal header version on line %d of '%s' to a version number object.\n%s" % (journalLineIndex + 1, Paths.StripUserDataPath(journalFilePath), persistenceInformation),
+							  self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+					recordsVersion = None
+					operationSuccess = False
+
+				continue
+
+			persistentKey = journalRecord.get(self._journalKeyKey, None)  # type: typing.Optional[str]
+
+			if not isinstance(persistentKey, str) or self._journalValueKey not in journalRecord:
+				Debug.Log("Skipping an invalid journal record on line %d of '%s'.\n%s" % (journalLineIndex + 1, Paths.StripUserDataPath(journalFilePath), persistenceInformation),
+						  self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+				operationSuccess = False
+				continue
+
+			persistentData[persistentKey] = journalRecord[self._journalValueKey]
+
+			if recordsVersionKnown:
+				keyVersions[persistentKey] = recordsVersion
+			else:
+				keyVersions.pop(persistentKey, None)
+
+		return operationSuccess
+
+class PersistentSQLite(Persistent):
+	"""
+	A class for handling persistent data. This version keeps every value in its own row of an SQLite database. Only the rows of keys that have been setup are
+	ever read, and saving only writes the values that changed since the last save, all within a single transaction. This suits persistent data with a great
+	many keys, such as data kept for every sim or household. Each row also keeps the version its value was saved in, as rows are not all written at once.
+	"""
+
+	_valuesTable = "PersistentValues"  # type: str
+	_metadataTable = "PersistentMetadata"  # type: str
+	_lastVersionKey = "LastVersion"  # type: str
+
+	# The sqlite3 module keeps the statements it has prepared for each connection, using the same statement text every time lets it reuse them.
+	_selectValueStatement = "SELECT Value, Version FROM " + _valuesTable + " WHERE Key = ?"  # type: str
+	_replaceValueStatement = "INSERT OR REPLACE INTO " + _valuesTable + " (Key, Value, Version) VALUES (?, ?, ?)"  # type: str
+	_selectMetadataStatement = "SELECT Value FROM " + _metadataTable + " WHERE Key = ?"  # type: str
+	_replaceMetadataStatement = "INSERT OR REPLACE INTO " + _metadataTable + " (Key, Value) VALUES (?, ?)"  # type: str
+
+	_synchronousModes = {
+		FileSyncPolicies.Never: "NORMAL",
+		FileSyncPolicies.File: "FULL",
+		FileSyncPolicies.FileAndDirectory: "EXTRA"
+	}  # type: typing.Dict[FileSyncPolicies, str]
+
+	def __init__ (self, filePath: str, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace, alwaysSaveValues: bool = False, frozenValues: bool = False,
+				  lazyVerify: bool = False, syncPolicy: FileSyncPolicies = FileSyncPolicies.Never):
+		"""
+		:param filePath: The file path of the database this persistence object will be written to and read from.
+		:type filePath: str
+		:param currentVersion: The current version of what ever will be controlling this persistence object.
+							   This value can allow you to correct outdated persistent data.
+		:type currentVersion: Version.Version
+		:param hostNamespace: Errors made by this persistent object will show up under this namespace.
+		:type hostNamespace: str
+		:param alwaysSaveValues: If this value is true this persistence object will save all values. Otherwise this object will not save values that have not been
+		set or were reset at some point.
+		:type alwaysSaveValues: bool
+		:param frozenValues: If this value is true values will be frozen when set and returned by the get method without being copied.
+		:type frozenValues: bool
+		:param lazyVerify: If this value is true loaded values will not be verified until they are first retrieved.
+		:type lazyVerify: bool
+		:param syncPolicy: How much of a save should be forced onto the disk before it is considered finished. The database is always kept in write ahead log
+		mode, a crash will never leave it partially written. 'Never' may lose the last few saves if the computer loses power, the other policies will not.
+		:type syncPolicy: FileSyncPolicies
+		"""
+
+		if sqlite3 is None:
+			raise Exception("The sqlite3 module is not available, persistent data cannot be kept in an SQLite database.")
+
+		if not isinstance(filePath, str):
+			raise Exceptions.IncorrectTypeException(filePath, "path", (str,))
+
+		if not isinstance(syncPolicy, FileSyncPolicies):
+			raise Exceptions.IncorrectTypeException(syncPolicy, "syncPolicy", (FileSyncPolicies,))
+
+		super().__init__(currentVersion, hostNamespace = hostNamespace, alwaysSaveValues = alwaysSaveValues, frozenValues = frozenValues, lazyVerify = lazyVerify)
+
+		self.FilePath = filePath  # type: str
+		self.SyncPolicy = syncPolicy  # type: FileSyncPolicies
+
+		self._connection = None  # type: typing.Optional[sqlite3.Connection]
+		self._connectionLock = threading.RLock()  # type: threading.RLock
+		self._loaded = False  # type: bool
+		self._loading = False  # type: bool
+		self._rowVersions = dict()  # type: typing.Dict[str, Version.Version]  # Row versions that have already been converted, most rows share only a few versions.
+
+	@property
+	def PersistenceInformation (self) -> str:
+		return "%s | File %s" % (self.__class__.__name__, Paths.StripUserDataPath(self.FilePath))
+
+	def Setup (self, key: str, valueType: type, default, verify: typing.Callable) -> None:
+		# Only the rows of keys that have been setup are read. Keys setup after loading still need their row read before the value can be setup.
+		if self._loaded and isinstance(key, str) and not self.IsSetup(key) and key not in self._loadedData:
+			with self._connectionLock:
+				valueFound, value, valueVersion = self._ReadValue(key)  # type: bool, typing.Any, typing.Optional[Version.Version]
+
+			if valueFound:
+				if isinstance(self._loadedData, FrozenDictionary):
+					loadedData = dict(self._loadedData)  # type: typing.Dict[str, typing.Any]
+					loadedData[key] = value
+					self._loadedData = FrozenDictionary(loadedData)
+				else:
+					self._loadedData[key] = value
+
+				if valueVersion is not None:
+					self._loadedKeyVersions[key] = valueVersion
+
+		super().Setup(key, valueType, default, verify)
+
+	def Load (self, *args) -> bool:
+		"""
+		Load persistent data for every key that has been setup from the database specified when initiating this object, if it exists.
+		:rtype: None
+		"""
+
+		operationSuccess = True  # type: bool
+
+		persistenceInformation = self.PersistenceInformation  # type: str
+
+		with self._connectionLock:
+			try:
+				connection = self._GetConnection()  # type: sqlite3.Connection
+				lastVersionRow = connection.execute(self._selectMetadataStatement, (self._lastVersionKey,)).fetchone()  # type: typing.Optional[tuple]
+			except Exception:
+				Debug.Log("Failed to read from '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+				connection = None
+				lastVersionRow = None
+				operationSuccess = False
+
+			lastVersion = None  # type: typing.Optional[Version.Version]
+
+			if lastVersionRow is not None:
+				try:
+					lastVersion = Version.Version(lastVersionRow[0])
+				except Exception:
+					Debug.Log("Cannot convert persistent data's last version value '" + str(lastVersionRow[0]) + "' to a version number object.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+					operationSuccess = False
+
+			persistentData = dict()  # type: typing.Dict[str, typing.Any]
+			keyVersions = dict()  # type: typing.Dict[str, typing.Optional[Version.Version]]
+
+			# Reading a value that cannot be decoded marks its key as unsaved.
+			self._unsavedKeys = set()
+
+			if connection is not None:
+				for persistentKey in list(self._storage.keys()):  # type: str
+					valueFound, value, valueVersion = self._ReadValue(persistentKey)  # type: bool, typing.Any, typing.Optional[Version.Version]
+
+					if valueFound:
+						persistentData[persistentKey] = value
+
+						if valueVersion is not None:
+							keyVersions[persistentKey] = valueVersion
+
+			readKeys = set(persistentData.keys())  # type: typing.Set[str]
+			unreadableKeys = self._unsavedKeys  # type: typing.Set[str]
+
+			# Resetting every value marks every key as unsaved, those keys need to go to a set other than the unreadable keys.
+			self._unsavedKeys = set()
+			self._loading = True
+
+			try:
+				self.Reset(autoSave = False, autoUpdate = False)
+				setDataSuccess = self._LoadSetData(persistentData, lastVersion = lastVersion, keyVersions = keyVersions)  # type: bool
+			finally:
+				self._unsavedKeys = set()
+				self._loading = False
+
+			self._loaded = True
+
+			# Values that failed to load should not be found again the next time, their rows are overwritten with the values they were reset to.
+			self._unsavedKeys.update(unreadableKeys)
+			self._unsavedKeys.update(readKeys.difference(self._loadedData.keys()))
+
+		if len(self._unsavedKeys) != 0:
+			self.Save()
+
+		self._InvokeOnLoadEvent()
+
+		if not setDataSuccess:
+			return False
+
+		return operationSuccess
+
+	def Save (self) -> bool:
+		"""
+		Write every value set or reset since the last save to the database specified when initiating this object, in a single transaction.
+		If the directory the database is in doesn't exist one will be created.
+		:rtype: None
+		"""
+
+		operationSuccess = True  # type: bool
+
+		persistenceInformation = self.PersistenceInformation  # type: str
+
+		with self._connectionLock:
+			unsavedKeys = self._unsavedKeys  # type: typing.Set[str]
+			self._unsavedKeys = set()
+
+			encoder = json.JSONEncoder(separators = (",", ":"))  # type: json.JSONEncoder
+			valueRows = list()  # type: typing.List[typing.Tuple[str, str, str]]
+			currentVersionString = str(self.CurrentVersion)  # type: str
+
+			for persistentKey in unsavedKeys:  # type: str
+				valueStorage = self._storage.get(persistentKey, None)  # type: typing.Optional[Persistent.Value]
+
+				if valueStorage is None:
+					continue
+
+				try:
+					valueRows.append((persistentKey, encoder.encode(valueStorage.Save()), currentVersionString))
+				except Exception:
+					Debug.Log("Failed to encode a persistence value to a json string.\nKey: " + persistentKey + "\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Exception, group = self.HostNamespace, owner = __name__)
+					operationSuccess = False
+
+			try:
+				connection = self._GetConnection()  # type: sqlite3.Connection
+
+				with connection:
+					connection.executemany(self._replaceValueStatement, valueRows)
+					connection.execute(self._replaceMetadataStatement, (self._lastVersionKey, currentVersionString))
+			except Exception:
+				Debug.Log("Failed to write to '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+				self._unsavedKeys.update(unsavedKeys)
+				return False
+
+		return operationSuccess
+
+	def Close (self) -> None:
+		"""
+		Close the connection to the database. Unsaved changes are not written, a new connection will be opened the next time this object is loaded or saved.
+		"""
+
+		with self._connectionLock:
+			if self._connection is not None:
+				self._connection.close()
+				self._connection = None
+
+	def _AutoSave (self) -> None:
+		if self._loading:
+			return
+
+		self.Save()
+
+	def _GetConnection (self) -> sqlite3.Connection:
+		if self._connection is not None:
+			return self._connection
+
+		if not os.path.exists(os.path.dirname(self.FilePath)):
+			os.makedirs(os.path.dirname(self.FilePath))
+
+		connection = sqlite3.connect(self.FilePath, check_same_thread = False)  # type: sqlite3.Connection
+
+		try:
+			connection.execute("PRAGMA journal_mode = WAL")
+			connection.execute("PRAGMA synchronous = " + self._synchronousModes[self.SyncPolicy])
+
+			with connection:
+				connection.execute("CREATE TABLE IF NOT EXISTS " + self._valuesTable + " (Key TEXT PRIMARY KEY NOT NULL, Value TEXT NOT NULL, Version TEXT)")
+				connection.execute("CREATE TABLE IF NOT EXISTS " + self._metadataTable + " (Key TEXT PRIMARY KEY NOT NULL, Value TEXT NOT NULL)")
+
+				valueColumns = [columnRow[1] for columnRow in connection.execute("PRAGMA table_info(" + self._valuesTable + ")")]  # type: typing.List[str]
+
+				if "Version" not in valueColumns:
+					# Databases written before rows kept their own version were all last saved in the version in the metadata table. That version is given to
+					# their rows before the metadata's version can be changed by a save.
+					connection.execute("ALTER TABLE " + self._valuesTable + " ADD COLUMN Version TEXT")
+					connection.execute("UPDATE " + self._valuesTable + " SET Version = (SELECT Value FROM " + self._metadataTable + " WHERE Key = ?)", (self._lastVersionKey,))
+		except Exception:
+			connection.close()
+			raise
+
+		self._connection = connection
+		return connection
+
+	def _ReadValue (self, key: str) -> typing.Tuple[bool, typing.Any, typing.Optional[Version.Version]]:
+		"""
+		Read the row of a key. The first returned value indicates if a value was found, the second is the value and the third is the version the value was saved
+		in, or none if that version is not known.
+		"""
+
+		persistenceInformation = self.PersistenceInformation  # type: str
+
+		try:
+			valueRow = self._GetConnection().execute(self._selectValueStatement, (key,)).fetchone()  # type: typing.Optional[tuple]
+		except Exception:
+			Debug.Log("Failed to read the persistent data '" + key + "' from '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+			return False, None, None
+
+		if valueRow is None:
+			return False, None, None
+
+		try:
+			value = json.JSONDecoder().decode(valueRow[0])  # type: typing.Any
+		except Exception:
+			Debug.Log("Could not decode the stored value for persistent data '" + key + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+			self._unsavedKeys.add(key)
+			return False, None, None
+
+		valueVersionString = valueRow[1]  # type: typing.Optional[str]
+
+		if valueVersionString is None:
+			return True, value, None
+
+		valueVersion = self._rowVersions.get(valueVersionString, None)  # type: typing.Optional[Version.Version]
+
+		if valueVersion is None:
+			try:
+				valueVersion = Version.Version(valueVersionString)
+			except Exception:
+				Debug.Log("Cannot convert the version value '" + str(valueVersionString) + "' stored for persistent data '" + key + "' to a version number object.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+				return True, value, None
+
+			self._rowVersions[valueVersionString] = valueVersion
+
+		return True, value, valueVersion
+
+class FrozenList(list):
+	"""
+	A list that cannot be changed. Every item is frozen when the list is created. This is still a list so it will pass type checks and can be encoded to json
+	like any other list.
+	"""
+
+	def __init__ (self, iterable: typing.Iterable = ()):
+		super().__init__(FreezeValue(item) for item in iterable)
+
+	def __copy__ (self) -> FrozenList:
+		return self
+
+	def __deepcopy__ (self, memo: dict) -> FrozenList:
+		return self
+
+	def __reduce__ (self):
+		return self.__class__, (list(self),)
+
+	def _Frozen (self, *args, **kwargs) -> typing.NoReturn:
+		raise TypeError("'" + self.__class__.__name__ + "' objects cannot be changed, use a mutable copy instead.")
+
+	__setitem__ = _Frozen
+	__delitem__ = _Frozen
+	__iadd__ = _Frozen
+	__imul__ = _Frozen
+	append = _Frozen
+	extend = _Frozen
+	insert = _Frozen
+	pop = _Frozen
+	remove = _Frozen
+	clear = _Frozen
+	sort = _Frozen
+	reverse = _Frozen
+
+class FrozenDictionary(dict):
+	"""
+	A dictionary that cannot be changed. Every value is frozen when the dictionary is created. This is still a dictionary so it will pass type checks and can
+	be encoded to json like any other dictionary.
+	"""
+
+	def __init__ (self, *args, **kwargs):
+		super().__init__((key, FreezeValue(value)) for key, value in dict(*args, **kwargs).items())
+
+	def __copy__ (self) -> FrozenDictionary:
+		return self
+
+	def __deepcopy__ (self, memo: dict) -> FrozenDictionary:
+		return self
+
+	def __reduce__ (self):
+		return self.__class__, (dict(self),)
+
+	def _Frozen (self, *args, **kwargs) -> typing.NoReturn:
+		raise TypeError("'" + self.__class__.__name__ + "' objects cannot be changed, use a mutable copy instead.")
+
+	__setitem__ = _Frozen
+	__delitem__ = _Frozen
+	__ior__ = _Frozen
+	clear = _Frozen
+	pop = _Frozen
+	popitem = _Frozen
+	setdefault = _Frozen
+	update = _Frozen
+
+_immutableTypes = (str, int, float, bool, bytes, type(None))  # type: typing.Tuple[type, ...]
+
+def FreezeValue (value: typing.Any) -> typing.Any:
+	"""
+	Get a version of a value that cannot be changed. Lists become FrozenList objects, dictionaries become FrozenDictionary objects and the items of tuples
+	are frozen. Values that are already immutable are returned as is.
+	:param value: The value to be frozen.
+	:type value: typing.Any
+	:return: The frozen value. Freezing an already frozen value will not create a new object.
+	:rtype: typing.Any
+	:raises TypeError: Raised if the value, or any value within it, is of a type that cannot be frozen.
+	"""
+
+	valueType = type(value)  # type: type
+
+	if valueType in _immutableTypes or valueType is FrozenList or valueType is FrozenDictionary:
+		return value
+
+	if valueType is tuple:
+		frozenItems = tuple(FreezeValue(item) for item in value)  # type: tuple
+
+		if all(frozenItem is item for frozenItem, item in zip(frozenItems, value)):
+			return value
+
+		return frozenItems
+
+	if valueType is list:
+		return FrozenList(value)
+
+	if valueType is dict:
+		return FrozenDictionary(value)
+
+	raise TypeError("Cannot freeze values of the type '" + Types.GetFullName(value) + "'.")
+
+def ThawValue (value: typing.Any) -> typing.Any:
+	"""
+	Get a copy of a value that can be changed. FrozenList and FrozenDictionary objects are turned back into regular lists and dictionaries, anything else
+	is deep copied.
+	:param value: The value to be thawed.
+	:type value: typing.Any
+	:rtype: typing.Any
+	"""
+
+	if isinstance(value, FrozenList):
+		return [ThawValue(item) for item in value]
+
+	if isinstance(value, FrozenDictionary):
+		return { key: ThawValue(item) for key, item in value.items() }
+
+	if type(value) is tuple:
+		return tuple(ThawValue(item) for item in value)
+
+	return copy.deepcopy(value)
+
+def FlushAll () -> None:
+	"""
+	Write the unsaved changes of every persistent file object that has started a write behind thread.
+	"""
+
+	for persistentFile in list(_writeBehindFiles):  # type: PersistentFile
+		try:
+			persistentFile.Flush()
+		except Exception:
+			Debug.Log("Failed to flush persistent data.\n" + persistentFile.PersistenceInformation, persistentFile.HostNamespace, Debug.LogLevels.Exception, group = persistentFile.HostNamespace, owner = __name__)
+
+def _WriteFileAtomically (filePath: str, fileText: str, syncPolicy: FileSyncPolicies) -> None:
+	fileDirectory = os.path.dirname(filePath)  # type: str
+	temporaryFilePath = filePath + ".tmp"  # type: str
+
+	if not os.path.exists(fileDirectory):
+		os.makedirs(fileDirectory)
+
+	try:
+		with open(temporaryFilePath, mode = "w") as temporaryFile:
+			temporaryFile.write(fileText)
+
+			if syncPolicy >= FileSyncPolicies.File:
+				temporaryFile.flush()
+				os.fsync(temporaryFile.fileno())
+
+		os.replace(temporaryFilePath, filePath)
+	except Exception:
+		try:
+			if os.path.exists(temporaryFilePath):
+				os.remove(temporaryFilePath)
+		except Exception:
+			pass
+
+		raise
+
+	if syncPolicy >= FileSyncPolicies.FileAndDirectory and hasattr(os, "O_DIRECTORY"):
+		# Windows cannot open directories, the replacement is left for the file system to commit on its own there.
+		directoryDescriptor = os.open(fileDirectory, os.O_RDONLY | os.O_DIRECTORY)  # type: int
+
+		try:
+			os.fsync(directoryDescriptor)
+		finally:
+			os.close(directoryDescriptor)
+
+def _Setup () -> None:
+	atexit.register(FlushAll)
+
+_Setup()
@@ -5,16 +5,17 @@ import os
 import shutil
 import sys
 import threading
-import traceback
 import types
 import typing
 
 import singletons
 from NeonOcean.S4.Order import DebugShared, Paths, This
-from NeonOcean.S4.Order.DebugShared import LogLevels, Report
+from NeonOcean.S4.Order.DebugShared import LogFormats, LogLevels, Report, StackPolicies
 from NeonOcean.S4.Order.Tools import Exceptions
 from sims4 import log
 
+JsonLoggingFilePath = os.path.join(Paths.DebugPath, "EnableJsonLogging")  # type: str
+
 # noinspection PyTypeChecker
 _activeLogger = None  # type: Logger
 
@@ -31,6 +32,12 @@ class Logger(DebugShared.Logger):
 		self._lockHandler = _Locking()  # type: _Locking
 		self._lockHandlerLock = threading.Lock()  # type: threading.Lock
 
+		# Log files are kept open between writes, these are only ever touched by the writer thread.
+		self._logFiles = dict()  # type: typing.Dict[typing.Optional[str], _LogFile]
+		self._latestLogFiles = dict()  # type: typing.Dict[typing.Optional[str], _LogFile]
+		self._logFilesDirectoryName = self.GetLoggingDirectoryName()  # type: str
+		self._logFilesFormat = self.LogFormat  # type: LogFormats
+
 		def _CreateIncreaseNamespaceLoggingCount () -> None:
 			increaseLock = threading.Lock()
 
@@ -53,12 +60,13 @@ class Logger(DebugShared.Logger):
 	def Log (self, message, namespace: typing.Optional[str], level: LogLevels,
 			 group: str = None, owner: str = None, exception: BaseException = None, logStack: bool = False, frame: types.FrameType = None, logToGame: bool = True,
 			 lockIdentifier: typing.Optional[str] = None, lockReference: typing.Any = None, lockIncrement: int = 1, lockThreshold: int = 2,
-			 retryOnError: bool = True) -> None:
+			 retryOnError: bool = True, messageArguments: typing.Optional[tuple] = None) -> None:
 		"""
 		Logs a message even if no mod has enabled the game's logging system. It will also report the log to the module 'sims4.log' by default.
-		Logs will be writen to '<Sims4 user data path>/NeonOcean/Debug/Mods/<Namespace>/<Game start time>/Log.xml'. This system is not recommended for
-		logging in high volume.
-		:param message: The message is converted to a string with str(message) if it isn't one already.
+		Logs will be writen to '<Sims4 user data path>/NeonOcean/Debug/Mods/<Namespace>/<Game start time>/Log.xml', or 'Log.jsonl' when the json lines format is used. This system is not recommended for
+		logging in high volume. Reports less severe than the namespace's level threshold are dropped before anything else is done.
+		:param message: The message is converted to a string with str(message) if it isn't one already. If the message is callable it will be called and
+		the return value used instead, this only happens if the report is not filtered out.
 		:param namespace: The namespace or mod the log is coming from, it can Be None. Logs will be separated in to their own directory named with this value.
 						  This parameter will not be passed to the module 'sims4.log' in any way.
 		:type namespace: typing.Optional[str]
@@ -68,9 +76,11 @@ class Logger(DebugShared.Logger):
 		:param exception: The 'exception' argument is not necessary as it will automatically find it for you. This argument is only required if the
 		level is set to 'exception' and you are calling this function from where the exception won't be found by sys.exc_info().
 		:type exception: BaseException
-		:param logStack: Forces a stacktrace to be logged even if the level is not an error or exception.
+		:param logStack: Forces a stacktrace to be logged even if the level is not an error or exception. This will be ignored if the level's stack policy
+		is set to never.
 		:type logStack: bool
 		:param frame: If this is not none the function will use it to get a stacktrace. The parameter not be used if the function is not logging a stacktrace.
+		The stack is captured when this is called, but is only formatted once the report is written.
 		:type frame: types.FrameType | None
 		:param logToGame: Controls whether or not this will also report to the module 'sims4.log'
 		:type logToGame: bool
@@ -86,8 +96,13 @@ class Logger(DebugShared.Logger):
 		:type lockThreshold: int
 		:param retryOnError: Whether or not we should try to log this in the into the next log file when encountering a write error.
 		:type retryOnError: bool
+		:param messageArguments: Values to be formatted into the message with the '%' operator. Formatting only happens if the report is not filtered out.
+		:type messageArguments: tuple | None
 		"""
 
+		if level > self._namespaceLevelThresholds.get(namespace, self._levelThreshold):
+			return
+
 		if not isinstance(namespace, str) and namespace is not None:
 			raise Exceptions.IncorrectTypeException(namespace, "namespace", (str, "None"))
 
@@ -127,6 +142,9 @@ class Logger(DebugShared.Logger):
 		if not isinstance(retryOnError, bool):
 			raise Exceptions.IncorrectTypeException(retryOnError, "retryOnError", (bool,))
 
+		if not isinstance(messageArguments, tuple) and messageArguments is not None:
+			raise Exceptions.IncorrectTypeException(messageArguments, "messageArguments", (tuple, "None"))
+
 		if lockIdentifier is not None:
 			self._LockHandlerClearUnlockingPoints(lockIdentifier, lockReference)
 
@@ -138,17 +156,19 @@ class Logger(DebugShared.Logger):
 		if exception is None:
 			exception = sys.exc_info()[1]
 
+		messageText = DebugShared.RenderMessage(message, messageArguments)  # type: str
+
 		if logToGame:
 			if level == LogLevels.Debug:
-				log.debug(group, str(message), owner = owner)
+				log.debug(group, messageText, owner = owner)
 			elif level == LogLevels.Info:
-				log.info(group, str(message), owner = owner)
+				log.info(group, messageText, owner = owner)
 			elif level == LogLevels.Warning:
-				log.warn(group, str(message), owner = owner)
+				log.warn(group, messageText, owner = owner)
 			elif level == LogLevels.Error:
-				log.error(group, str(message), owner = owner)
+				log.error(group, messageText, owner = owner)
 			elif level == LogLevels.Exception:
-				log.exception(group, str(message), exc = exception, frame = (frame if frame is not None else log.DEFAULT), owner = owner)
+				log.exception(group, messageText, exc = exception, frame = (frame if frame is not None else log.DEFAULT), owner = owner)
 
 		if self._writeFailureCount >= self._writeFailureLimit:
 			return
@@ -158,13 +178,21 @@ class Logger(DebugShared.Logger):
 
 		lockable = True if lockIdentifier is not None else False  # type: bool
 
+		stackPolicy = self.GetStackPolicy(level)  # type: StackPolicies
+
+		if stackPolicy == StackPolicies.Always or (stackPolicy == StackPolicies.Requested and logStack):
+			stackFrames = DebugShared.CaptureStack(frame if frame is not None else sys._getframe())  # type: typing.Optional[typing.List[typing.Tuple[types.CodeType, int]]]
+			logStack = True
+		else:
+			stackFrames = None
+			logStack = False
+
 		report = Report(namespace, logCount + 1, datetime.datetime.now().isoformat(),
-						str(message), level = level, group = str(group),
+						messageText, level = level, group = str(group),
 						owner = owner, exception = exception, logStack = logStack,
-						stacktrace = str.join("", traceback.format_stack(f = frame)), lockable = lockable, retryOnError = retryOnError)  # type: Report
+						lockable = lockable, retryOnError = retryOnError, stackFrames = stackFrames)  # type: Report
 
-		self._reportStorage.append(report)
-		self.Flush()
+		self._QueueReport(report)
 
 	def IsLocked (self, lockIdentifier: str, lockReference: typing.Any = None) -> bool:
 		"""
@@ -216,92 +244,56 @@ class Logger(DebugShared.Logger):
 
 		writeTime = datetime.datetime.now().isoformat()  # type: str
 
+		lineSeparatorBytes = self.GetLogEntrySeparatorBytes()  # type: bytes
+
 		for report in reports:  # type: Report
-			reportTextBytes = report.GetBytes(writeTime = writeTime)  # type: bytes
+			reportTextBytes = self.GetReportBytes(report, writeTime = writeTime)  # type: bytes
 
 			if report.Namespace in namespaceTextBytes:
-				namespaceTextBytes[report.Namespace] += (os.linesep + os.linesep).encode("utf-8") + reportTextBytes
+				namespaceTextBytes[report.Namespace] += lineSeparatorBytes + reportTextBytes
 			else:
 				namespaceTextBytes[report.Namespace] = reportTextBytes
 
-		for namespace, namespaceBytes in namespaceTextBytes.items():  # type: str, bytes
-			namespaceDirectory = os.path.join(self.GetLoggingRootPath(), str(namespace))  # type: str
-			namespaceLoggingDirectory = os.path.join(namespaceDirectory, self.GetLoggingDirectoryName())  # type: str
-
-			namespaceFilePath = os.path.join(namespaceLoggingDirectory, "Log.xml")  # type: str
-			namespaceLatestFilePath = os.path.join(namespaceDirectory, "Latest.xml")  # type: str
-			namespaceFirstWrite = False  # type: bool
-
-			namespaceSessionFilePath = os.path.join(namespaceLoggingDirectory, "Session.json")  # type: str
-			namespaceModsDirectoryFilePath = os.path.join(namespaceLoggingDirectory, "Mods.txt")  # type: str
-
-			logSizeLimit = self.GetLogSizeLimit()  # type: int
-			logSizeLimitReachedBytes = "<!--Log file size limit reached-->".encode("utf-8")  # type: bytes
+		if self._logFilesDirectoryName != self.GetLoggingDirectoryName() or self._logFilesFormat != self.LogFormat:
+			# The log file or its format was changed, every file still open belongs to the old logging directory or is in the wrong format.
+			self._CloseLogFiles()
+			self._logFilesDirectoryName = self.GetLoggingDirectoryName()
+			self._logFilesFormat = self.LogFormat
 
-			logStartBytes = self.GetLogStartBytes()  # type: bytes
-			logEndBytes = self.GetLogEndBytes()  # type: bytes
+		logSizeLimit = self.GetLogSizeLimit()  # type: int
+		logSizeLimitReachedBytes = self.GetLogSizeLimitReachedBytes()  # type: bytes
 
-			lineSeparatorBytes = (os.linesep + os.linesep).encode("utf-8")  # type: bytes
+		logEndBytes = self.GetLogEndBytes()  # type: bytes
 
+		for namespace, namespaceBytes in namespaceTextBytes.items():  # type: str, bytes
 			try:
-				if not os.path.exists(namespaceFilePath):
-					namespaceFirstWrite = True
+				namespaceLogFile = self._logFiles.get(namespace, None)  # type: typing.Optional[_LogFile]
 
-					if not os.path.exists(namespaceLoggingDirectory):
-						os.makedirs(namespaceLoggingDirectory)
-				else:
-					self._VerifyLogFile(namespaceFilePath)
+				if namespaceLogFile is None:
+					namespaceLogFile = self._OpenNamespaceLogFiles(namespace)
 
-				if not os.path.exists(namespaceSessionFilePath):
-					with open(namespaceSessionFilePath, mode = "w+") as sessionFile:
-						sessionFile.write(self._sessionInformation)
+				logSize = namespaceLogFile.GetSize()  # type: int
 
-				if not os.path.exists(namespaceModsDirectoryFilePath):
-					with open(namespaceModsDirectoryFilePath, mode = "w+") as modsDirectoryFile:
-						modsDirectoryFile.write(self._modsDirectoryInformation)
+				if logSize >= logSizeLimit:
+					continue
 
-				if namespaceFirstWrite:
-					if len(logStartBytes) + len(namespaceBytes) + len(logEndBytes) >= logSizeLimit:
-						namespaceBytes += logSizeLimitReachedBytes
+				if logSize + len(lineSeparatorBytes) + len(namespaceBytes) >= logSizeLimit:
+					namespaceBytes += logSizeLimitReachedBytes
 
-					with open(namespaceFilePath, mode = "wb+") as namespaceFile:
-						namespaceFile.write(logStartBytes)
-						namespaceFile.write(namespaceBytes)
-						namespaceFile.write(logEndBytes)
+				namespaceLogFile.Append(namespaceBytes, lineSeparatorBytes)
 
-					if os.path.exists(namespaceLatestFilePath):
-						os.remove(namespaceLatestFilePath)
+				namespaceLatestLogFile = self._latestLogFiles.get(namespace, None)  # type: typing.Optional[_LogFile]
 
-					with open(namespaceLatestFilePath, mode = "wb+") as namespaceLatestFile:
-						namespaceLatestFile.write(logStartBytes)
-						namespaceLatestFile.write(namespaceBytes)
-						namespaceLatestFile.write(logEndBytes)
-				else:
-					logSize = os.path.getsize(namespaceFilePath)  # type: int
-
-					if logSize >= logSizeLimit:
-						continue
-
-					if logSize + len(lineSeparatorBytes) + len(namespaceBytes) + len(logEndBytes) >= logSizeLimit:
-						namespaceBytes += logSizeLimitReachedBytes
-
-					with open(namespaceFilePath, "r+b") as namespaceFile:
-						namespaceFile.seek(-len(logEndBytes), os.SEEK_END)
-						namespaceFile.write(lineSeparatorBytes)
-						namespaceFile.write(namespaceBytes)
-						namespaceFile.write(logEndBytes)
-
-					try:
-						self._VerifyLogFile(namespaceLatestFilePath)
-
-						with open(namespaceLatestFilePath, "r+b") as namespaceLatestFile:
-							namespaceLatestFile.seek(-len(logEndBytes), os.SEEK_END)
-							namespaceLatestFile.write(lineSeparatorBytes)
-							namespaceLatestFile.write(namespaceBytes)
-							namespaceLatestFile.write(logEndBytes)
-					except:
-						shutil.copy(namespaceFilePath, namespaceLatestFilePath)
+				try:
+					namespaceLatestLogFile.Append(namespaceBytes, lineSeparatorBytes)
+				except Exception:
+					namespaceLatestLogFile.Close()
+					namespaceLatestFilePath = namespaceLatestLogFile.FilePath  # type: str
+
+					shutil.copy(namespaceLogFile.FilePath, namespaceLatestFilePath)
+					self._latestLogFiles[namespace] = _LogFile.OpenExisting(namespaceLatestFilePath, logEndBytes)
 			except Exception as e:
+				self._CloseNamespaceLogFiles(namespace)
 				self._writeFailureCount += 1
 
 				if not getattr(self.DebugGlobal, self._globalShownWriteFailureNotification):
@@ -324,6 +316,67 @@ class Logger(DebugShared.Logger):
 
 				return
 
+	def _OpenNamespaceLogFiles (self, namespace: typing.Optional[str]) -> _LogFile:
+		# Log files are only checked when they are opened, after that this logger is assumed to be the only thing writing to them.
+
+		namespaceDirectory = os.path.join(self.GetLoggingRootPath(), str(namespace))  # type: str
+		namespaceLoggingDirectory = os.path.join(namespaceDirectory, self.GetLoggingDirectoryName())  # type: str
+
+		logFileExtension = self.GetLogFileExtension()  # type: str
+
+		namespaceFilePath = os.path.join(namespaceLoggingDirectory, "Log" + logFileExtension)  # type: str
+		namespaceLatestFilePath = os.path.join(namespaceDirectory, "Latest" + logFileExtension)  # type: str
+
+		namespaceSessionFilePath = os.path.join(namespaceLoggingDirectory, "Session.json")  # type: str
+		namespaceModsDirectoryFilePath = os.path.join(namespaceLoggingDirectory, "Mods.txt")  # type: str
+
+		logStartBytes = self.GetLogStartBytes()  # type: bytes
+		logEndBytes = self.GetLogEndBytes()  # type: bytes
+
+		if not os.path.exists(namespaceLoggingDirectory):
+			os.makedirs(namespaceLoggingDirectory)
+
+		if not os.path.exists(namespaceSessionFilePath):
+			with open(namespaceSessionFilePath, mode = "w+") as sessionFile:
+				sessionFile.write(self._sessionInformation)
+
+		if not os.path.exists(namespaceModsDirectoryFilePath):
+			with open(namespaceModsDirectoryFilePath, mode = "w+") as modsDirectoryFile:
+				modsDirectoryFile.write(self._modsDirectoryInformation)
+
+		if not os.path.exists(namespaceFilePath):
+			namespaceLogFile = _LogFile.Create(namespaceFilePath, logStartBytes, logEndBytes)  # type: _LogFile
+			namespaceLatestLogFile = _LogFile.Create(namespaceLatestFilePath, logStartBytes, logEndBytes)  # type: _LogFile
+		else:
+			self._VerifyLogFile(namespaceFilePath)
+			namespaceLogFile = _LogFile.OpenExisting(namespaceFilePath, logEndBytes)
+
+			try:
+				self._VerifyLogFile(namespaceLatestFilePath)
+				namespaceLatestLogFile = _LogFile.OpenExisting(namespaceLatestFilePath, logEndBytes)
+			except Exception:
+				shutil.copy(namespaceFilePath, namespaceLatestFilePath)
+				namespaceLatestLogFile = _LogFile.OpenExisting(namespaceLatestFilePath, logEndBytes)
+
+		self._logFiles[namespace] = namespaceLogFile
+		self._latestLogFiles[namespace] = namespaceLatestLogFile
+
+		return namespaceLogFile
+
+	def _CloseNamespaceLogFiles (self, namespace: typing.Optional[str]) -> None:
+		namespaceLogFile = self._logFiles.pop(namespace, None)  # type: typing.Optional[_LogFile]
+		namespaceLatestLogFile = self._latestLogFiles.pop(namespace, None)  # type: typing.Optional[_LogFile]
+
+		if namespaceLogFile is not None:
+			namespaceLogFile.Close()
+
+		if namespaceLatestLogFile is not None:
+			namespaceLatestLogFile.Close()
+
+	def _CloseLogFiles (self) -> None:
+		for namespace in list(self._logFiles.keys()):  # type: typing.Optional[str]
+			self._CloseNamespaceLogFiles(namespace)
+
 	def _LockHandlerLock (self, identifier: str, reference: typing.Any) -> None:
 		self._lockHandlerLock.acquire()
 		self._lockHandler.Lock(identifier, reference)
@@ -361,6 +414,64 @@ class Logger(DebugShared.Logger):
 		self._lockHandler.ClearUnlockingPoints(identifier, reference)
 		self._lockHandlerLock.release()
 
+class _LogFile:
+	def __init__ (self, filePath: str, file: typing.BinaryIO, insertionOffset: int, logEndBytes: bytes, hasEntries: bool):
+		"""
+		An open log file. The position new entries are to be inserted at, right before the closing tag, is tracked here so the file never needs to be read
+		after it is opened.
+		"""
+
+		self.FilePath = filePath  # type: str
+		self.File = file  # type: typing.BinaryIO
+		self.InsertionOffset = insertionOffset  # type: int
+		self.LogEndBytes = logEndBytes  # type: bytes
+		self.HasEntries = hasEntries  # type: bool
+
+	@classmethod
+	def Create (cls, filePath: str, logStartBytes: bytes, logEndBytes: bytes) -> _LogFile:
+		file = open(filePath, mode = "wb+")  # type: typing.BinaryIO
+
+		try:
+			file.write(logStartBytes + logEndBytes)
+			file.flush()
+		except:
+			file.close()
+			raise
+
+		return cls(filePath, file, len(logStartBytes), logEndBytes, False)
+
+	@classmethod
+	def OpenExisting (cls, filePath: str, logEndBytes: bytes) -> _LogFile:
+		file = open(filePath, mode = "r+b")  # type: typing.BinaryIO
+
+		try:
+			insertionOffset = file.seek(0, os.SEEK_END) - len(logEndBytes)  # type: int
+		except:
+			file.close()
+			raise
+
+		return cls(filePath, file, insertionOffset, logEndBytes, True)
+
+	def GetSize (self) -> int:
+		return self.InsertionOffset + len(self.LogEndBytes)
+
+	def Append (self, entryBytes: bytes, separatorBytes: bytes) -> None:
+		if self.HasEntries:
+			entryBytes = separatorBytes + entryBytes
+
+		self.File.seek(self.InsertionOffset)
+		self.File.write(entryBytes + self.LogEndBytes)
+		self.File.flush()
+
+		self.InsertionOffset += len(entryBytes)
+		self.HasEntries = True
+
+	def Close (self) -> None:
+		try:
+			self.File.close()
+		except Exception:
+			pass
+
 class _Locking:
 	def __init__ (self):
 		self._locked = dict()  # type: typing.Dict[str, typing.Set[typing.Any]]
@@ -473,9 +584,15 @@ def _Setup () -> None:
 
 	_activeLogger = Logger(os.path.join(Paths.DebugPath, "Mods"), hostNamespace = This.Mod.Namespace)  # type: Logger
 
+	# Like tracing, the log format needs to be decided on before any settings could be read. Creating a file named 'EnableJsonLogging' in the debug
+	# directory will switch to the json lines format.
+	if os.path.exists(JsonLoggingFilePath):
+		_activeLogger.LogFormat = LogFormats.JSONLines
+
 _Setup()
 
 Log = ActiveLogger().Log
+IsEnabled = ActiveLogger().IsEnabled
 IsLocked = ActiveLogger().IsLocked
 Unlock = ActiveLogger().Unlock
 GetNextLogNumber = ActiveLogger().GetNextLogNumber
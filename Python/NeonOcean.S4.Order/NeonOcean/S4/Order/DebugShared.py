@@ -1,23 +1,31 @@
 from __future__ import annotations
 
+import atexit
+import collections
 import datetime
 import enum_lib
 import json
 import os
 import platform
+import sys
 import threading
 import traceback
+import types
 import typing
 import uuid
+import weakref
 from xml.sax import saxutils
 
-from NeonOcean.S4.Order import Language, Paths, This
+from NeonOcean.S4.Order import Language, ModsDirectory, This
 from NeonOcean.S4.Order.Data import Global
-from NeonOcean.S4.Order.Tools import Exceptions, Threading as ToolsThreading
+from NeonOcean.S4.Order.Tools import Exceptions
 from NeonOcean.S4.Order.UI import Notifications
 from sims4 import common, log
 from ui import ui_dialog_notification
 
+_loggers = weakref.WeakSet()  # type: weakref.WeakSet
+_jsonLineEncoder = json.JSONEncoder(separators = (",", ":"))  # type: json.JSONEncoder
+
 class LogLevels(enum_lib.IntEnum):
 	Exception = 0  # type: LogLevels
 	Error = 1  # type: LogLevels
@@ -25,11 +33,26 @@ class LogLevels(enum_lib.IntEnum):
 	Info = 3  # type: LogLevels
 	Debug = 4  # type: LogLevels
 
+class StackPolicies(enum_lib.IntEnum):
+	Never = 0  # type: StackPolicies
+	Requested = 1  # type: StackPolicies
+	Always = 2  # type: StackPolicies
+
+class OverflowPolicies(enum_lib.IntEnum):
+	Block = 0  # type: OverflowPolicies
+	DropOldest = 1  # type: OverflowPolicies
+	DropNewest = 2  # type: OverflowPolicies
+
+class LogFormats(enum_lib.IntEnum):
+	XML = 0  # type: LogFormats
+	JSONLines = 1  # type: LogFormats
+
 class Report:
 	def __init__ (self, namespace: typing.Optional[str], logNumber: int, logTime: str,
 				  message: str, level: LogLevels, group: str = None,
 				  owner: str = None, exception: BaseException = None, logStack: bool = False,
-				  stacktrace: str = None, lockable: bool = False, retryOnError: bool = False):
+				  stacktrace: str = None, lockable: bool = False, retryOnError: bool = False,
+				  stackFrames: typing.Optional[typing.List[typing.Tuple[types.CodeType, int]]] = None):
 		self.Namespace = namespace  # type: typing.Optional[str]
 		self.LogNumber = logNumber  # type: int
 		self.LogTime = logTime  # type: str
@@ -39,13 +62,73 @@ class Report:
 		self.Owner = owner  # type: typing.Optional[str]
 		self.Exception = exception  # type: typing.Optional[BaseException]
 		self.LogStack = logStack  # type: bool
-		self.Stacktrace = stacktrace  # type: typing.Optional[str]
 		self.Lockable = lockable  # type: bool
 		self.RetryOnError = retryOnError  # type: bool
 
+		self._stacktrace = stacktrace  # type: typing.Optional[str]
+		self._stackFrames = stackFrames  # type: typing.Optional[typing.List[typing.Tuple[types.CodeType, int]]]
+
+	@property
+	def Stacktrace (self) -> typing.Optional[str]:
+		"""
+		The stacktrace of this report. If the report was given stack frames captured with 'CaptureStack' they will be formatted the first time this is read.
+		"""
+
+		if self._stacktrace is None and self._stackFrames is not None:
+			self._stacktrace = FormatStack(self._stackFrames)
+			self._stackFrames = None
+
+		return self._stacktrace
+
+	@Stacktrace.setter
+	def Stacktrace (self, value: typing.Optional[str]) -> None:
+		self._stacktrace = value
+		self._stackFrames = None
+
 	def GetBytes (self, writeTime: str = None) -> bytes:
 		return self.GetText(writeTime).encode("utf-8")
 
+	def GetJsonBytes (self, writeTime: str = None) -> bytes:
+		"""
+		Get this report as a single line of json, ending in a line feed.
+		"""
+
+		return (_jsonLineEncoder.encode(self.GetJsonDictionary(writeTime)) + "\n").encode("utf-8")
+
+	def GetJsonDictionary (self, writeTime: str = None) -> dict:
+		"""
+		Get this report as a dictionary that can be converted to json. The dictionary holds the same information as the report's xml text, in the same order.
+		"""
+
+		reportDictionary = {
+			"Number": self.LogNumber,
+			"Level": self.Level.name,
+			"Group": str(self.Group)
+		}  # type: dict
+
+		if self.Owner is not None:
+			reportDictionary["Owner"] = self.Owner
+
+		reportDictionary["LogTime"] = self.LogTime
+
+		if writeTime is not None:
+			reportDictionary["WriteTime"] = writeTime
+
+		if self.Lockable:
+			reportDictionary["Lockable"] = self.Lockable
+
+		reportDictionary["Message"] = str(self.Message)
+
+		if self.Exception is not None:
+			reportDictionary["Exception"] = FormatException(self.Exception)
+
+		stackTraceText = self._GetShownStacktrace()  # type: typing.Optional[str]
+
+		if stackTraceText is not None:
+			reportDictionary["Stacktrace"] = stackTraceText
+
+		return reportDictionary
+
 	def GetText (self, writeTime: str = None) -> str:
 		logTemplate = "\t<Log Number=\"{}\" Level=\"{}\" Group=\"{}\""  # type: str
 
@@ -90,12 +173,13 @@ class Report:
 			exceptionText = saxutils.escape(exceptionText).replace("\n", "\n<!--\t\t-->")
 			logFormatting.append(exceptionText)
 
-		if self.Level <= LogLevels.Error or self.LogStack:
+		stackTraceText = self._GetShownStacktrace()  # type: typing.Optional[str]
+
+		if stackTraceText is not None:
 			logTemplate += "\t\t<Stacktrace><!--\n" \
 						   "\t\t\t-->{}<!--\n" \
 						   "\t\t--></Stacktrace>\n"
 
-			stackTraceText = self.Stacktrace  # type: str
 			stackTraceText = stackTraceText.replace("\r\n", "\n")
 			stackTraceText = saxutils.escape(stackTraceText).replace("\n", "\n<!--\t\t-->")
 			logFormatting.append(stackTraceText)
@@ -107,6 +191,12 @@ class Report:
 
 		return logText
 
+	def _GetShownStacktrace (self) -> typing.Optional[str]:
+		if self.Level <= LogLevels.Error or self.LogStack:
+			return self.Stacktrace
+
+		return None
+
 class Logger:
 	WriteFailureNotificationTitle = Language.String(This.Mod.Namespace + ".Write_Failure_Notification.Title")
 	WriteFailureNotificationText = Language.String(This.Mod.Namespace + ".Write_Failure_Notification.Text")
@@ -116,6 +206,15 @@ class Logger:
 
 	_globalShownWriteFailureNotification = "ShownWriteFailureNotification"  # type: str
 
+	# The number of reports that can be waiting on the writer thread, and what to do with a new report when that many are already waiting.
+	# Reports logged by the writer thread itself are never blocked or dropped.
+	QueueLimit = 10000  # type: int
+	OverflowPolicy = OverflowPolicies.Block  # type: OverflowPolicies
+
+	# The format new log files are written in. Json lines files are only ever appended to, they can be converted to the xml format with the
+	# 'Convert-Log.py' automation script.
+	LogFormat = LogFormats.XML  # type: LogFormats
+
 	def __init__ (self, loggingRootPath: str, hostNamespace: str = This.Mod.Namespace):
 		"""
 		An object for logging debug information.
@@ -146,8 +245,24 @@ class Logger:
 
 		self.HostNamespace = hostNamespace  # type: str
 
-		self._reportStorage = list()  # type: typing.List[Report]
-		self._flushThread = None  # type: typing.Optional[threading.Thread]
+		self._levelThreshold = LogLevels.Debug  # type: int
+		self._namespaceLevelThresholds = dict()  # type: typing.Dict[typing.Optional[str], int]
+
+		self._stackPolicies = {
+			LogLevels.Exception: StackPolicies.Always,
+			LogLevels.Error: StackPolicies.Always,
+			LogLevels.Warning: StackPolicies.Requested,
+			LogLevels.Info: StackPolicies.Requested,
+			LogLevels.Debug: StackPolicies.Requested
+		}  # type: typing.Dict[int, StackPolicies]
+
+		self._reportQueue = collections.deque()  # type: typing.Deque[Report]
+		self._reportCondition = threading.Condition(threading.Lock())  # type: threading.Condition
+		self._writerThread = None  # type: typing.Optional[threading.Thread]
+		self._writing = False  # type: bool
+
+		self._droppedReportCount = 0  # type: int
+		self._unannouncedDroppedReportCount = 0  # type: int
 
 		self._loggingRootPath = loggingRootPath  # type: str
 		self._loggingDirectoryName = GetDateTimePathString(getattr(self.DebugGlobal, self._globalSessionStartTime))  # type: str
@@ -159,6 +274,8 @@ class Logger:
 		self._sessionInformation = self._CreateSessionInformation()  # type: str
 		self._modsDirectoryInformation = self._CreateModsDirectoryInformation()  # type: str
 
+		_loggers.add(self)
+
 	def Log (self, *args, **kwargs) -> None:
 		raise NotImplementedError()
 
@@ -177,112 +294,207 @@ class Logger:
 	def GetSessionStartTime (self) -> datetime.datetime:
 		return getattr(self.DebugGlobal, self._globalSessionStartTime)
 
+	def GetLogFileExtension (self) -> str:
+		if self.LogFormat == LogFormats.JSONLines:
+			return ".jsonl"
+
+		return ".xml"
+
 	def GetLogStartBytes (self) -> bytes:
+		if self.LogFormat == LogFormats.JSONLines:
+			# The first line of a json lines log holds the same information as the xml log's root element.
+			return (_jsonLineEncoder.encode({ "SessionID": str(self.GetSessionID()), "SessionStartTime": self.GetSessionStartTime().isoformat() }) + "\n").encode("utf-8")
+
 		logStartString = "<?xml version=\"1.0\" encoding=\"utf-8\"?>" + os.linesep + \
 						 "<LogFile SessionID=\"%s\" SessionStartTime=\"%s\">" % (str(self.GetSessionID()), self.GetSessionStartTime().isoformat()) + os.linesep
 
 		return logStartString.encode("utf-8")  # type: bytes
 
 	def GetLogEndBytes (self) -> bytes:
+		if self.LogFormat == LogFormats.JSONLines:
+			return bytes()
+
 		return (os.linesep + "</LogFile>").encode("utf-8")  # type: bytes
 
-	def ChangeLogFile (self) -> None:
+	def GetLogEntrySeparatorBytes (self) -> bytes:
+		if self.LogFormat == LogFormats.JSONLines:
+			return bytes()
+
+		return (os.linesep + os.linesep).encode("utf-8")
+
+	def GetLogSizeLimitReachedBytes (self) -> bytes:
+		if self.LogFormat == LogFormats.JSONLines:
+			return (_jsonLineEncoder.encode({ "SizeLimitReached": True }) + "\n").encode("utf-8")
+
+		return "<!--Log file size limit reached-->".encode("utf-8")
+
+	def GetReportBytes (self, report: Report, writeTime: str = None) -> bytes:
+		if self.LogFormat == LogFormats.JSONLines:
+			return report.GetJsonBytes(writeTime = writeTime)
+
+		return report.GetBytes(writeTime = writeTime)
+
+	def IsEnabled (self, level: LogLevels, namespace: typing.Optional[str] = None) -> bool:
 		"""
-		Change the current directory name for a new one. The new directory name will be the time this method was called.
-		:rtype: None
+		Get whether reports of this level and namespace would be logged. Checking this first can save the cost of building a message that would be ignored.
+		:type level: LogLevels
+		:type namespace: typing.Optional[str]
 		"""
 
-		self._loggingDirectoryName = GetDateTimePathString(datetime.datetime.now())
-		self._isContinuation = True
+		return level <= self._namespaceLevelThresholds.get(namespace, self._levelThreshold)
 
-		self._sessionInformation = self._CreateSessionInformation()
-		self._modsDirectoryInformation = self._CreateModsDirectoryInformation()
+	def GetLevelThreshold (self, namespace: typing.Optional[str] = None) -> int:
+		"""
+		Get the least severe level that will be logged for a namespace.
+		:param namespace: The namespace to get the threshold for. If the namespace has no threshold of its own, or this is None, the logger's threshold is returned.
+		:type namespace: typing.Optional[str]
+		"""
 
-	def Flush (self) -> None:
-		mainThread = threading.main_thread()  # type: threading.Thread
-		mainThreadAlive = mainThread.is_alive()  # type: bool
+		return self._namespaceLevelThresholds.get(namespace, self._levelThreshold)
 
-		currentThreadIsMain = mainThread == threading.current_thread()  # type: bool
+	def SetLevelThreshold (self, level: LogLevels, namespace: typing.Optional[str] = None) -> None:
+		"""
+		Change the least severe level that will be logged. Reports less severe than this are dropped as soon as the log method is called, before any of its
+		arguments are checked or its message is built.
+		:param level: The least severe level to be logged.
+		:type level: LogLevels
+		:param namespace: The namespace this threshold is for. If this is None the logger's threshold is changed, which applies to every namespace without
+		a threshold of its own.
+		:type namespace: typing.Optional[str]
+		"""
 
-		if not mainThreadAlive and not currentThreadIsMain:
-			# Unfortunately any daemonic thread's reports will not be written unless they are logged before the last reports from the main thread are written.
-			# At this point, any flush thread started will not finish in time before it all comes to an end. Though the flush thread is not daemonic, Python will
-			# not stop for it while a shutdown is already in progress. The best way of getting any more reports out during this time would be to co-opt the
-			# main thread and make it wait while we write the stored reports.
-			return
+		if not isinstance(level, int):
+			raise Exceptions.IncorrectTypeException(level, "level", (int,))
 
-		if self._flushThread is not None:
-			if not mainThreadAlive:
-				if self._flushThread.is_alive():
-					self._flushThread.join(1)
+		if not isinstance(namespace, str) and namespace is not None:
+			raise Exceptions.IncorrectTypeException(namespace, "namespace", (str, "None"))
 
-					if self._flushThread.is_alive():
-						return
-				else:
-					self._flushThread = None
-			else:
-				return
+		if namespace is None:
+			self._levelThreshold = level
+		else:
+			self._namespaceLevelThresholds[namespace] = level
 
-		if not mainThreadAlive:
-			flushThread = self._CreateFlushThread()  # type: threading.Thread
-			self._SetFlushThreadUnsafe(flushThread)
+	def ResetLevelThreshold (self, namespace: str) -> None:
+		"""
+		Remove a namespace's threshold, the namespace will use the logger's threshold again.
+		:type namespace: str
+		"""
 
-			flushThread.start()
-			flushThread.join(1)
-		else:
-			flushThread = self._CreateFlushThread()  # type: threading.Thread
+		if not isinstance(namespace, str):
+			raise Exceptions.IncorrectTypeException(namespace, "namespace", (str,))
 
-			try:
-				self._SetFlushThread(flushThread)
-			except ToolsThreading.SimultaneousCallException:
-				return
+		self._namespaceLevelThresholds.pop(namespace, None)
+
+	def GetStackPolicy (self, level: LogLevels) -> StackPolicies:
+		"""
+		Get whether reports of this level are logged with a stacktrace.
+		:type level: LogLevels
+		"""
 
-			mainThreadStateChanged = not mainThread.is_alive()  # type: bool
+		return self._stackPolicies.get(level, StackPolicies.Requested)
 
-			if mainThreadStateChanged:
-				self.Flush()
-				return
+	def SetStackPolicy (self, level: LogLevels, policy: StackPolicies) -> None:
+		"""
+		Change whether reports of this level are logged with a stacktrace. By default, errors and exceptions always are, while every other level only gets a
+		stacktrace when the log call asks for one. Setting a level's policy to never will skip capturing the stack entirely, even if the log call asked for it.
+		:type level: LogLevels
+		:type policy: StackPolicies
+		"""
 
-			flushThread.start()
+		if not isinstance(level, int):
+			raise Exceptions.IncorrectTypeException(level, "level", (int,))
 
-	def _CreateFlushThread (self) -> threading.Thread:
-		mainThread = threading.main_thread()  # type: threading.Thread
-		mainThreadAlive = mainThread.is_alive()  # type: bool
+		if not isinstance(policy, StackPolicies):
+			raise Exceptions.IncorrectTypeException(policy, "policy", (StackPolicies,))
 
-		def _FlushThread () -> None:
-			nonlocal mainThreadAlive
+		self._stackPolicies[level] = policy
 
-			mainThreadAlive = mainThread.is_alive()
+	def ChangeLogFile (self) -> None:
+		"""
+		Change the current directory name for a new one. The new directory name will be the time this method was called.
+		:rtype: None
+		"""
 
-			try:
-				while len(self._reportStorage) != 0:
-					reportStorageLength = len(self._reportStorage)  # type: int
-					targetReports = self._reportStorage[:reportStorageLength]
-					self._reportStorage = self._reportStorage[reportStorageLength:]
+		self._loggingDirectoryName = GetDateTimePathString(datetime.datetime.now())
+		self._isContinuation = True
 
-					filteredReports = self._FilterReports(targetReports)
+		self._sessionInformation = self._CreateSessionInformation()
+		self._modsDirectoryInformation = self._CreateModsDirectoryInformation()
 
-					self._LogAllReports(filteredReports)
+	def GetDroppedReportCount (self) -> int:
+		"""
+		Get the number of reports that were dropped because too many reports were waiting to be written.
+		"""
 
-					mainThreadAlive = mainThread.is_alive()
+		return self._droppedReportCount
 
-					if not mainThreadAlive:
-						break
-			finally:
-				self._flushThread = None
+	def Flush (self, timeout: typing.Optional[float] = None) -> bool:
+		"""
+		Wait for every report logged before this was called to be written. This will return immediately if called from this logger's writer thread.
+		:param timeout: The maximum number of seconds to wait, if this is None there is no limit.
+		:type timeout: float | None
+		:return: True if every report was written, False if the timeout ran out first.
+		:rtype: bool
+		"""
+
+		if self._writerThread is threading.current_thread():
+			return len(self._reportQueue) == 0
+
+		with self._reportCondition:
+			return self._reportCondition.wait_for(lambda: len(self._reportQueue) == 0 and not self._writing, timeout = timeout)
+
+	def _QueueReport (self, report: Report) -> None:
+		with self._reportCondition:
+			if len(self._reportQueue) >= self.QueueLimit and self._writerThread is not threading.current_thread():
+				if self.OverflowPolicy == OverflowPolicies.Block:
+					self._reportCondition.wait_for(lambda: len(self._reportQueue) < self.QueueLimit)
+				elif self.OverflowPolicy == OverflowPolicies.DropOldest:
+					self._reportQueue.popleft()
+					self._droppedReportCount += 1
+					self._unannouncedDroppedReportCount += 1
+				elif self.OverflowPolicy == OverflowPolicies.DropNewest:
+					self._droppedReportCount += 1
+					self._unannouncedDroppedReportCount += 1
+					return
+
+			self._reportQueue.append(report)
+
+			if self._writerThread is None:
+				self._writerThread = threading.Thread(target = self._WriterLoop, name = "Logger Writer: " + self.HostNamespace, daemon = True)
+				self._writerThread.start()
+
+			self._reportCondition.notify_all()
 
-			if mainThreadAlive:
-				if len(self._reportStorage) != 0:
-					self.Flush()
+	def _WriterLoop (self) -> None:
+		while True:
+			with self._reportCondition:
+				while len(self._reportQueue) == 0:
+					self._reportCondition.wait()
 
-		return threading.Thread(target = _FlushThread, daemon = False)
+				# Every waiting report is taken at once, the reports for each namespace are then written with as few file operations as possible.
+				targetReports = list(self._reportQueue)  # type: typing.List[Report]
+				self._reportQueue.clear()
 
-	@ToolsThreading.NotThreadSafe(raiseException = True)
-	def _SetFlushThread (self, flushThread: threading.Thread) -> None:
-		self._SetFlushThreadUnsafe(flushThread)
+				unannouncedDroppedReportCount = self._unannouncedDroppedReportCount  # type: int
+				self._unannouncedDroppedReportCount = 0
 
-	def _SetFlushThreadUnsafe (self, flushThread: threading.Thread) -> None:
-		self._flushThread = flushThread
+				self._writing = True
+				self._reportCondition.notify_all()
+
+			try:
+				if unannouncedDroppedReportCount != 0:
+					self.Log("Dropped %d report(s) because too many were waiting to be written.", self.HostNamespace, LogLevels.Warning,
+							 group = self.HostNamespace, owner = __name__, logToGame = False, retryOnError = False, messageArguments = (unannouncedDroppedReportCount,))
+
+				filteredReports = self._FilterReports(targetReports)
+				self._LogAllReports(filteredReports)
+			except Exception as e:
+				# The writer thread needs to survive anything, otherwise every report logged after this would wait forever.
+				log.exception(self.HostNamespace, "Failed to write reports.", exc = e, owner = __name__)
+			finally:
+				with self._reportCondition:
+					self._writing = False
+					self._reportCondition.notify_all()
 
 	def _FilterReports (self, reports: typing.List[Report]) -> typing.List[Report]:
 		return list(reports)
@@ -331,36 +543,37 @@ class Logger:
 
 	def _CreateModsDirectoryInformation (self) -> str:
 		try:
-			modFolderString = os.path.split(Paths.ModsPath)[1] + " {" + os.path.split(Paths.ModsPath)[1] + "}"  # type: str
-
-			for directoryRoot, directoryNames, fileNames in os.walk(Paths.ModsPath):  # type: str, list, list
-				depth = 1
-
-				if directoryRoot != Paths.ModsPath:
-					depth = len(directoryRoot.replace(Paths.ModsPath + os.path.sep, "").split(os.path.sep)) + 1  # type: int
-
-				indention = "\t" * depth  # type: str
-
-				newString = ""  # type: str
-
-				for directory in directoryNames:
-					newString += "\n" + indention + directory + " {" + directory + "}"
+			return ModsDirectory.GetScan().GetTreeString()
+		except Exception as e:
+			return "Failed to get mod information\n" + FormatException(e)
 
-				for file in fileNames:
-					newString += "\n" + indention + file + " (" + str(os.path.getsize(os.path.join(directoryRoot, file))) + " B)"
+	def _VerifyLogFile (self, logFilePath: str) -> None:
+		if self.LogFormat == LogFormats.JSONLines:
+			# The last line will be cut off if the game stopped while it was being written. That line is dropped and the log continues after the last
+			# complete line, the earlier entries are still good.
+			with open(logFilePath, "r+b") as logFile:
+				fileSize = logFile.seek(0, os.SEEK_END)  # type: int
+				completeSize = fileSize  # type: int
+
+				while completeSize > 0:
+					chunkStart = max(completeSize - 4096, 0)  # type: int
+					logFile.seek(chunkStart)
+					lineEnd = logFile.read(completeSize - chunkStart).rfind(b"\n")  # type: int
+
+					if lineEnd != -1:
+						completeSize = chunkStart + lineEnd + 1
+						break
 
-				if len(newString) == 0:
-					newString = "\n"
+					completeSize = chunkStart
 
-				newString += "\n"
+				if completeSize == 0:
+					raise Exception("The log file doesn't contain a complete line.")
 
-				modFolderString = modFolderString.replace("{" + os.path.split(directoryRoot)[1] + "}", "{" + newString + "\t" * (depth - 1) + "}", 1)
+				if completeSize != fileSize:
+					logFile.truncate(completeSize)
 
-			return modFolderString
-		except Exception as e:
-			return "Failed to get mod information\n" + FormatException(e)
+			return
 
-	def _VerifyLogFile (self, logFilePath: str) -> None:
 		logEndBytes = self.GetLogEndBytes()  # type: bytes
 
 		with open(logFilePath, "rb") as logFile:
@@ -376,12 +589,65 @@ class Logger:
 									   expand_behavior = ui_dialog_notification.UiDialogNotification.UiDialogNotificationExpandBehavior.FORCE_EXPAND,
 									   urgency = ui_dialog_notification.UiDialogNotification.UiDialogNotificationUrgency.URGENT)
 
+def FlushAll (timeout: typing.Optional[float] = None) -> None:
+	"""
+	Wait for every logger's waiting reports to be written.
+	:param timeout: The maximum number of seconds to wait for each logger, if this is None there is no limit.
+	:type timeout: float | None
+	"""
+
+	for logger in list(_loggers):  # type: Logger
+		logger.Flush(timeout = timeout)
+
 def FormatException (exception: BaseException) -> str:
 	if not isinstance(exception, BaseException):
 		raise Exceptions.IncorrectTypeException(exception, "exception", (BaseException,))
 
 	return str.join("", traceback.format_exception(type(exception), exception, exception.__traceback__))
 
+def RenderMessage (message, messageArguments: typing.Optional[tuple] = None) -> str:
+	"""
+	Build the text of a log message. If the message is callable it will be called and its return value used as the message. If there are message arguments,
+	the message will be formatted with them using the '%' operator.
+	"""
+
+	if callable(message):
+		message = message()
+
+	messageText = str(message)  # type: str
+
+	if messageArguments:
+		messageText = messageText % messageArguments
+
+	return messageText
+
+def CaptureStack (frame: typing.Optional[types.FrameType] = None) -> typing.List[typing.Tuple[types.CodeType, int]]:
+	"""
+	Capture the code object and line number of every frame in a stack, starting at the specified frame and going outwards. This is much cheaper than formatting
+	the stack, which can be put off until the stacktrace is needed with 'FormatStack'.
+	:param frame: The innermost frame to be captured. This will default to the frame that called this function.
+	:type frame: types.FrameType | None
+	"""
+
+	if frame is None:
+		frame = sys._getframe(1)
+
+	stackFrames = list()  # type: typing.List[typing.Tuple[types.CodeType, int]]
+
+	while frame is not None:
+		stackFrames.append((frame.f_code, frame.f_lineno))
+		frame = frame.f_back
+
+	return stackFrames
+
+def FormatStack (stackFrames: typing.List[typing.Tuple[types.CodeType, int]]) -> str:
+	"""
+	Format a stack captured by 'CaptureStack' the same way 'traceback.format_stack' would, outermost frame first.
+	"""
+
+	stackSummary = traceback.StackSummary.from_list([(code.co_filename, lineNumber, code.co_name, None) for code, lineNumber in reversed(stackFrames)])  # type: traceback.StackSummary
+	return str.join("", stackSummary.format())
+
 def ConvertEALevelToLogLevel (level: int) -> LogLevels:
 	if not isinstance(level, int):
 		raise Exceptions.IncorrectTypeException(level, "level", (int,))
@@ -418,3 +684,9 @@ def ConvertLogLevelToEALevel (level: LogLevels) -> int:
 
 def GetDateTimePathString (dateTime: datetime.datetime) -> str:
 	return dateTime.date().isoformat() + " " + dateTime.time().isoformat().replace(":", ".")  # type: str
+
+def _Setup () -> None:
+	# Writer threads are daemonic so they cannot keep the game from closing, any waiting reports are written before the interpreter shuts down instead.
+	atexit.register(FlushAll)
+
+_Setup()
@@ -4,7 +4,7 @@ import typing
 
 import services
 import zone
-from NeonOcean.S4.Order import Director
+from NeonOcean.S4.Order import Director, Tracing
 from NeonOcean.S4.Order.Tools import Patcher, Types
 
 class _Announcement:
@@ -22,6 +22,10 @@ class _Announcement:
 		Patcher.Patch(targetObject, targetCallableName, AnnouncementAfterPatch, patchType = Patcher.PatchTypes.After, permanent = True)
 
 	def _TriggerAnnouncement (self, announcementMethodName: str, preemptive: bool, *announcementArgs, **announcementKwargs) -> None:
+		with Tracing.Span(announcementMethodName + (" (Preemptive)" if preemptive else ""), "Director"):
+			self._TriggerAnnouncers(announcementMethodName, preemptive, *announcementArgs, **announcementKwargs)
+
+	def _TriggerAnnouncers (self, announcementMethodName: str, preemptive: bool, *announcementArgs, **announcementKwargs) -> None:
 		for announcer in Director.GetAllAnnouncers():  # type: typing.Type[Director.Announcer]
 			try:
 				if not announcer.Enabled:
@@ -36,10 +40,11 @@ class _Announcement:
 				announcementMethod = getattr(announcer, announcementMethodName, None)  # type: typing.Callable
 
 				if announcementMethod is not None:
-					if self.AnnouncementCallWrapper is None:
-						announcementMethod(*announcementArgs, **announcementKwargs)
-					else:
-						self.AnnouncementCallWrapper(announcementMethod, *announcementArgs, **announcementKwargs)
+					with Tracing.Span(Types.GetFullName(announcer) + "." + announcementMethodName, "Director"):
+						if self.AnnouncementCallWrapper is None:
+							announcementMethod(*announcementArgs, **announcementKwargs)
+						else:
+							self.AnnouncementCallWrapper(announcementMethod, *announcementArgs, **announcementKwargs)
 
 			except Exception:
 				from NeonOcean.S4.Order import Debug
@@ -8,10 +8,9 @@ import pathlib
 import sys
 import types
 import typing
-import zipfile
 from functools import wraps
 
-from NeonOcean.S4.Order import Debug, ImportingEvents, Information, LoadingShared, Paths, This
+from NeonOcean.S4.Order import Archives, Debug, ImportingEvents, LoadingShared, ModsDirectory, Paths, This, Tracing
 from NeonOcean.S4.Order.Tools import Exceptions
 from sims4.importer import custom_import, utils
 
@@ -46,7 +45,8 @@ class Level:
 
 			for module in modules:  # type: str
 				try:
-					importer.load_module(module)
+					with Tracing.Span("Import " + module, "Importing"):
+						importer.load_module(module)
 				except Exception:
 					Debug.Log("Failed to import module '" + module + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
 
@@ -101,7 +101,8 @@ def ImportModules () -> None:
 
 	Importing = True
 
-	levels = _GetLevels()
+	with Tracing.Span("Importing._GetLevels", "Importing"):
+		levels = _GetLevels()
 
 	moduleRootPathObject = pathlib.Path(Paths.ModuleRootPath)  # type: pathlib.Path
 	moduleRootPathIndex = -1  # type: int
@@ -160,8 +161,11 @@ def ImportModules () -> None:
 			sysInsertedPathCount += 1
 
 	for level in levels:  # type: Level
-		level.ImportModules()
-		level.CallFunctions()
+		with Tracing.Span("Import level " + str(level.Level), "Importing"):
+			level.ImportModules()
+			level.CallFunctions()
+
+	Archives.SaveCache()
 
 	Importing = False
 	Imported = True
@@ -219,141 +223,137 @@ def _GetLevels () -> typing.List[Level]:
 	_RemoveDuplicates(defaultLevel.Paths)
 	levels.append(defaultLevel)
 
-	for directoryRoot, directoryNames, fileNames in os.walk(Paths.ModsPath):  # type: str, list, list
-		for orderFileName in fileNames:  # type: str
-			orderFileNameLower = orderFileName.lower()  # type: str
-
-			if os.path.splitext(orderFileNameLower)[1] == ".json":
-				if (Information.RootNamespace + "-load-order").lower() in orderFileNameLower:
-					orderFilePath = os.path.join(directoryRoot, orderFileName)  # type: str
+	for loadOrderFile in ModsDirectory.GetScan().LoadOrderFiles:  # type: ModsDirectory.File
+		directoryRoot = os.path.dirname(loadOrderFile.Path)  # type: str
+		orderFilePath = loadOrderFile.Path  # type: str
 
-					try:
-						Debug.Log("Loading order file at '" + Paths.StripUserDataPath(orderFilePath) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+		try:
+			Debug.Log("Loading order file at '" + Paths.StripUserDataPath(orderFilePath) + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 
-						try:
-							with open(orderFilePath) as orderFile:
-								orderInformation = json.JSONDecoder().decode(orderFile.read())  # type: typing.List[dict]
-						except Exception:
-							Debug.Log("Failed to read load order file '" + Paths.StripUserDataPath(os.path.join(directoryRoot, orderFileName)) + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
-							continue
+			try:
+				with open(orderFilePath) as orderFile:
+					orderInformation = json.JSONDecoder().decode(orderFile.read())  # type: typing.List[dict]
+			except Exception:
+				Debug.Log("Failed to read load order file '" + Paths.StripUserDataPath(orderFilePath) + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+				continue
 
-						if not isinstance(orderInformation, list):
-							raise Exceptions.IncorrectTypeException(orderInformation, "Root", (list,))
+			if not isinstance(orderInformation, list):
+				raise Exceptions.IncorrectTypeException(orderInformation, "Root", (list,))
 
-						for levelIndex, levelDictionary in enumerate(orderInformation):  # type: int, dict
-							if not isinstance(levelDictionary, dict):
-								raise Exceptions.IncorrectTypeException(levelDictionary, "Root[%d]" % levelIndex, (dict,))
+			for levelIndex, levelDictionary in enumerate(orderInformation):  # type: int, dict
+				if not isinstance(levelDictionary, dict):
+					raise Exceptions.IncorrectTypeException(levelDictionary, "Root[%d]" % levelIndex, (dict,))
 
-							if not _pathsKey in levelDictionary and not _functionsKey in levelDictionary:
-								raise Exception("Missing dictionary entry '%s' or '%s' in 'Root[%d]'" % (_pathsKey, _functionsKey, levelIndex))
+				if not _pathsKey in levelDictionary and not _functionsKey in levelDictionary:
+					raise Exception("Missing dictionary entry '%s' or '%s' in 'Root[%d]'" % (_pathsKey, _functionsKey, levelIndex))
 
-							levelLevelValue = levelDictionary.get(_levelKey, 0.0)  # type: typing.Union[float, int]
+				levelLevelValue = levelDictionary.get(_levelKey, 0.0)  # type: typing.Union[float, int]
 
-							levelPathsValue = levelDictionary.get(_pathsKey, list())  # type: typing.List[typing.Union[pathlib.Path, dict]]
-							levelFunctionsValue = levelDictionary.get(_functionsKey, list())  # type: typing.List[dict]
+				levelPathsValue = levelDictionary.get(_pathsKey, list())  # type: typing.List[typing.Union[pathlib.Path, dict]]
+				levelFunctionsValue = levelDictionary.get(_functionsKey, list())  # type: typing.List[dict]
 
-							if not isinstance(levelLevelValue, int) and not isinstance(levelLevelValue, float):
-								raise Exceptions.IncorrectTypeException(levelLevelValue, "Root[%d][%s]" % (levelIndex, _levelKey), (int, float))
+				if not isinstance(levelLevelValue, int) and not isinstance(levelLevelValue, float):
+					raise Exceptions.IncorrectTypeException(levelLevelValue, "Root[%d][%s]" % (levelIndex, _levelKey), (int, float))
 
-							if not isinstance(levelPathsValue, list):
-								raise Exceptions.IncorrectTypeException(levelPathsValue, "Root[%d][%s]" % (levelIndex, _pathsKey), (list,))
+				if not isinstance(levelPathsValue, list):
+					raise Exceptions.IncorrectTypeException(levelPathsValue, "Root[%d][%s]" % (levelIndex, _pathsKey), (list,))
 
-							if not isinstance(levelFunctionsValue, list):
-								raise Exceptions.IncorrectTypeException(levelFunctionsValue, "Root[%d][%s]" % (levelIndex, _functionsKey), (list,))
+				if not isinstance(levelFunctionsValue, list):
+					raise Exceptions.IncorrectTypeException(levelFunctionsValue, "Root[%d][%s]" % (levelIndex, _functionsKey), (list,))
 
-							for pathIndex, pathDictionary in enumerate(levelPathsValue):  # type: int, typing.Dict[str, str]
-								if not isinstance(pathDictionary, dict):
-									raise Exceptions.IncorrectTypeException(pathDictionary, "Root[%d][%s][%d]" % (levelIndex, _pathsKey, pathIndex), (dict,))
+				for pathIndex, pathDictionary in enumerate(levelPathsValue):  # type: int, typing.Dict[str, str]
+					if not isinstance(pathDictionary, dict):
+						raise Exceptions.IncorrectTypeException(pathDictionary, "Root[%d][%s][%d]" % (levelIndex, _pathsKey, pathIndex), (dict,))
 
-								if not _pathsRootKey in pathDictionary:
-									raise Exception("Missing dictionary entry '" + _pathsRootKey + "' in 'Root[%d][%s][%d]'" % (levelIndex, _pathsKey, pathIndex))
+					if not _pathsRootKey in pathDictionary:
+						raise Exception("Missing dictionary entry '" + _pathsRootKey + "' in 'Root[%d][%s][%d]'" % (levelIndex, _pathsKey, pathIndex))
 
-								if not _pathsPathKey in pathDictionary:
-									raise Exception("Missing dictionary entry '" + _pathsPathKey + "' in 'Root[%d][%s][%d]'" % (levelIndex, _pathsKey, pathIndex))
+					if not _pathsPathKey in pathDictionary:
+						raise Exception("Missing dictionary entry '" + _pathsPathKey + "' in 'Root[%d][%s][%d]'" % (levelIndex, _pathsKey, pathIndex))
 
-								pathsRootValue = pathDictionary.get(_pathsRootKey)  # type: str
-								pathsPathValue = pathDictionary.get(_pathsPathKey)  # type: str
+					pathsRootValue = pathDictionary.get(_pathsRootKey)  # type: str
+					pathsPathValue = pathDictionary.get(_pathsPathKey)  # type: str
 
-								if not isinstance(pathsRootValue, str):
-									raise Exceptions.IncorrectTypeException(pathsRootValue, "Root[%d][%s][%d][%s]" % (levelIndex, _pathsKey, pathIndex, _pathsRootKey), (str,))
+					if not isinstance(pathsRootValue, str):
+						raise Exceptions.IncorrectTypeException(pathsRootValue, "Root[%d][%s][%d][%s]" % (levelIndex, _pathsKey, pathIndex, _pathsRootKey), (str,))
 
-								if not isinstance(pathsPathValue, str):
-									raise Exceptions.IncorrectTypeException(pathsPathValue, "Root[%d][%s][%d][%s]" % (levelIndex, _pathsKey, pathIndex, _pathsPathKey), (str,))
+					if not isinstance(pathsPathValue, str):
+						raise Exceptions.IncorrectTypeException(pathsPathValue, "Root[%d][%s][%d][%s]" % (levelIndex, _pathsKey, pathIndex, _pathsPathKey), (str,))
 
-								pathsRootValueLower = pathsRootValue.lower()
+					pathsRootValueLower = pathsRootValue.lower()
 
-								if pathsRootValueLower == "mods":
-									pathsRootActual = Paths.ModsPath
-								elif pathsRootValueLower == "s4":
-									pathsRootActual = Paths.UserDataPath
-								elif pathsRootValueLower == "current":
-									pathsRootActual = directoryRoot
-								else:
-									raise Exception("'" + pathsRootValue + "' is not a valid path root, valid roots are 'mods', 's4' and 'current'.")
+					if pathsRootValueLower == "mods":
+						pathsRootActual = Paths.ModsPath
+					elif pathsRootValueLower == "s4":
+						pathsRootActual = Paths.UserDataPath
+					elif pathsRootValueLower == "current":
+						pathsRootActual = directoryRoot
+					else:
+						raise Exception("'" + pathsRootValue + "' is not a valid path root, valid roots are 'mods', 's4' and 'current'.")
 
-								levelPathsValue[pathIndex] = pathlib.Path(os.path.join(pathsRootActual, os.path.normpath(pathsPathValue)))
+					levelPathsValue[pathIndex] = pathlib.Path(os.path.join(pathsRootActual, os.path.normpath(pathsPathValue)))
 
-								for defaultPath in defaultLevel.Paths:  # type: pathlib.Path
-									if defaultPath == levelPathsValue[pathIndex]:
-										defaultLevel.Paths.remove(defaultPath)
+					for defaultPath in defaultLevel.Paths:  # type: pathlib.Path
+						if defaultPath == levelPathsValue[pathIndex]:
+							defaultLevel.Paths.remove(defaultPath)
 
-							_RemoveDuplicates(levelPathsValue)
+				_RemoveDuplicates(levelPathsValue)
 
-							for functionIndex, functionDictionary in enumerate(levelFunctionsValue):  # type: int, dict
-								if not isinstance(functionDictionary, dict):
-									raise Exceptions.IncorrectTypeException(functionDictionary, "Root[%d][%s][%d]" % (levelIndex, _functionsKey, functionIndex), (dict,))
+				for functionIndex, functionDictionary in enumerate(levelFunctionsValue):  # type: int, dict
+					if not isinstance(functionDictionary, dict):
+						raise Exceptions.IncorrectTypeException(functionDictionary, "Root[%d][%s][%d]" % (levelIndex, _functionsKey, functionIndex), (dict,))
 
-								if not _functionsModuleKey in functionDictionary:
-									raise Exception("Missing dictionary entry '" + _functionsModuleKey + "' in 'Root[%d][%s][%d]'" % (levelIndex, _functionsKey, functionIndex))
+					if not _functionsModuleKey in functionDictionary:
+						raise Exception("Missing dictionary entry '" + _functionsModuleKey + "' in 'Root[%d][%s][%d]'" % (levelIndex, _functionsKey, functionIndex))
 
-								if not _functionsFunctionKey in functionDictionary:
-									raise Exception("Missing dictionary entry '" + _functionsFunctionKey + "' in 'Root[%d][%s][%d]'" % (levelIndex, _functionsKey, functionIndex))
+					if not _functionsFunctionKey in functionDictionary:
+						raise Exception("Missing dictionary entry '" + _functionsFunctionKey + "' in 'Root[%d][%s][%d]'" % (levelIndex, _functionsKey, functionIndex))
 
-								functionModuleValue = functionDictionary[_functionsModuleKey]  # type: str
-								functionFunctionValue = functionDictionary[_functionsFunctionKey]  # type: str
-								functionArgumentsValue = functionDictionary.get(_functionsArgumentKey, list())  # type: list
-								functionKeywordArgumentsValue = functionDictionary.get(_functionsKeywordArgumentsKey, dict())  # type: dict
+					functionModuleValue = functionDictionary[_functionsModuleKey]  # type: str
+					functionFunctionValue = functionDictionary[_functionsFunctionKey]  # type: str
+					functionArgumentsValue = functionDictionary.get(_functionsArgumentKey, list())  # type: list
+					functionKeywordArgumentsValue = functionDictionary.get(_functionsKeywordArgumentsKey, dict())  # type: dict
 
-								if not isinstance(functionModuleValue, str):
-									raise Exceptions.IncorrectTypeException(functionModuleValue, "Root[%d][%s][%d][%s]" % (levelIndex, _functionsKey, functionIndex, _functionsModuleKey), (str,))
+					if not isinstance(functionModuleValue, str):
+						raise Exceptions.IncorrectTypeException(functionModuleValue, "Root[%d][%s][%d][%s]" % (levelIndex, _functionsKey, functionIndex, _functionsModuleKey), (str,))
 
-								if not isinstance(functionFunctionValue, str):
-									raise Exceptions.IncorrectTypeException(functionFunctionValue, "Root[%d][%s][%d][%s]" % (levelIndex, _functionsKey, functionIndex, _functionsFunctionKey), (str,))
+					if not isinstance(functionFunctionValue, str):
+						raise Exceptions.IncorrectTypeException(functionFunctionValue, "Root[%d][%s][%d][%s]" % (levelIndex, _functionsKey, functionIndex, _functionsFunctionKey), (str,))
 
-								if not isinstance(functionArgumentsValue, list):
-									raise Exceptions.IncorrectTypeException(functionArgumentsValue, "Root[%d][%s][%d][%s]" % (levelIndex, _functionsKey, functionIndex, _functionsArgumentKey), (list,))
+					if not isinstance(functionArgumentsValue, list):
+						raise Exceptions.IncorrectTypeException(functionArgumentsValue, "Root[%d][%s][%d][%s]" % (levelIndex, _functionsKey, functionIndex, _functionsArgumentKey), (list,))
 
-								if not isinstance(functionKeywordArgumentsValue, dict):
-									raise Exceptions.IncorrectTypeException(functionArgumentsValue, "Root[%d][%s][%d][%s]" % (levelIndex, _functionsKey, functionIndex, _functionsKeywordArgumentsKey), (dict,))
+					if not isinstance(functionKeywordArgumentsValue, dict):
+						raise Exceptions.IncorrectTypeException(functionArgumentsValue, "Root[%d][%s][%d][%s]" % (levelIndex, _functionsKey, functionIndex, _functionsKeywordArgumentsKey), (dict,))
 
-								for functionKeywordArgumentsValueKey in functionKeywordArgumentsValue.keys():  # type: int, dict
-									if not isinstance(functionKeywordArgumentsValueKey, str):
-										raise Exceptions.IncorrectTypeException(functionKeywordArgumentsValueKey, "Root[%d][%s][%d][%s]<Key>" % (levelIndex, _functionsKey, functionIndex, _functionsKeywordArgumentsKey), (str,))
+					for functionKeywordArgumentsValueKey in functionKeywordArgumentsValue.keys():  # type: int, dict
+						if not isinstance(functionKeywordArgumentsValueKey, str):
+							raise Exceptions.IncorrectTypeException(functionKeywordArgumentsValueKey, "Root[%d][%s][%d][%s]<Key>" % (levelIndex, _functionsKey, functionIndex, _functionsKeywordArgumentsKey), (str,))
 
-							_RemoveDuplicates(levelFunctionsValue)
+				_RemoveDuplicates(levelFunctionsValue)
 
-							if levelLevelValue == 0.0:
-								defaultLevel.Paths.extend(levelPathsValue)
-								defaultLevel.Functions.extend(levelFunctionsValue)
-								_RemoveDuplicates(defaultLevel.Paths)
-								_RemoveDuplicates(defaultLevel.Functions)
-							else:
-								matchedLevel = False  # type: bool
+				if levelLevelValue == 0.0:
+					defaultLevel.Paths.extend(levelPathsValue)
+					defaultLevel.Functions.extend(levelFunctionsValue)
+					_RemoveDuplicates(defaultLevel.Paths)
+					_RemoveDuplicates(defaultLevel.Functions)
+				else:
+					matchedLevel = False  # type: bool
 
-								for level in levels:  # type: Level
-									if level.Level == levelLevelValue:
-										level.Paths.extend(levelPathsValue)
-										level.Functions.extend(levelFunctionsValue)
-										_RemoveDuplicates(level.Paths)
-										_RemoveDuplicates(level.Paths)
+					for level in levels:  # type: Level
+						if level.Level == levelLevelValue:
+							level.Paths.extend(levelPathsValue)
+							level.Functions.extend(levelFunctionsValue)
+							_RemoveDuplicates(level.Paths)
+							_RemoveDuplicates(level.Paths)
 
-										matchedLevel = True
-										break
+							matchedLevel = True
+							break
 
-								if not matchedLevel:
-									levels.append(Level(levelLevelValue, levelPathsValue, levelFunctionsValue))
-					except Exception:
-						Debug.Log("Encountered a problem while reading load order file '" + Paths.StripUserDataPath(os.path.join(directoryRoot, orderFileName)) + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+					if not matchedLevel:
+						levels.append(Level(levelLevelValue, levelPathsValue, levelFunctionsValue))
+		except Exception:
+			Debug.Log("Encountered a problem while reading load order file '" + Paths.StripUserDataPath(orderFilePath) + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
 
 	return _SortLevels(levels)
 
@@ -410,20 +410,7 @@ def _GetModules (path: pathlib.Path) -> list:
 
 	try:
 		if path.is_file():
-			archive = zipfile.ZipFile(str(path), "r")  # type: zipfile.ZipFile
-
-			for fileInfo in archive.filelist:  # type: zipfile.ZipInfo
-				if fileInfo.filename[-1] != "/":
-					file, extension = os.path.splitext(fileInfo.filename)  # type: str, str
-					if extension.lower() == ".pyc":
-						moduleName = file.replace("/", ".").replace("\\", ".")  # type: str
-
-						if moduleName.endswith(".__init__"):
-							moduleName = moduleName[:-len(".__init__")]
-
-						modules.append(moduleName)
-
-			archive.close()
+			modules.extend(Archives.GetArchiveModules(str(path)))
 		elif path.is_dir():
 			for directoryRoot, directoryNames, fileNames in os.walk(str(path)):  # type: str, list, list
 				for fileName in fileNames:  # type: str
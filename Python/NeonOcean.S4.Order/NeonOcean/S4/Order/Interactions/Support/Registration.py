@@ -5,7 +5,7 @@ import typing
 
 import services
 import zone
-from NeonOcean.S4.Order import Debug, Director, This
+from NeonOcean.S4.Order import Debug, Director, This, Tracing
 from NeonOcean.S4.Order.Tools import Types
 from objects import definition_manager, script_object
 from sims4.tuning import tunable
@@ -166,8 +166,10 @@ class _Announcer(Director.Announcer):
 def RegisterInteractionsToObjects () -> None:
 	operationStartTime = time.time()  # type: float
 
-	for extensionInteraction in _registrationExtensionInteractions:  # type: RegistrationExtension
-		extensionInteraction.RegisterToObjects()
+	with Tracing.Span("RegisterInteractionsToObjects", "Registration"):
+		for extensionInteraction in _registrationExtensionInteractions:  # type: RegistrationExtension
+			with Tracing.Span(Types.GetFullName(extensionInteraction), "Registration"):
+				extensionInteraction.RegisterToObjects()
 
 	operationTime = time.time() - operationStartTime
 	Debug.Log("Finished registering %s interactions in %s seconds." % (len(_registrationExtensionInteractions), operationTime), This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
@@ -3,18 +3,17 @@ from __future__ import annotations
 import atexit
 import datetime
 import functools
+import heapq
 import importlib
-import inspect
 import json
 import os
 import sys
-import types
 import typing
 import time
-import zipfile
+from concurrent import futures
 
 import zone
-from NeonOcean.S4.Order import Debug, Language, LoadingEvents, LoadingShared, Mods, Paths, This
+from NeonOcean.S4.Order import Archives, Debug, Language, LoadingEvents, LoadingShared, LoadingTimings, Mods, Paths, This, Tracing
 from NeonOcean.S4.Order.Tools import Exceptions, Parse, Version
 from NeonOcean.S4.Order.UI import Notifications
 from sims4.importer import custom_import
@@ -33,10 +32,14 @@ NotLoadedFailureNotificationTitle = Language.String(This.Mod.Namespace + ".Mod_L
 NotLoadedFailureNotificationText = Language.String(This.Mod.Namespace + ".Mod_Loading.Not_Loaded_Notification.Text")  # type: Language.String
 
 _allLoaders = list()  # type: typing.List[_Loader]
+_loadersByNamespace = dict()  # type: typing.Dict[str, _Loader]
+_dependentsByNamespace = dict()  # type: typing.Dict[str, typing.List[str]]
 
 _autoLoad = True  # type: bool
 
 _inLoadLoop = False  # type: bool
+_activeScheduler = None  # type: typing.Optional[_LoadScheduler]
+_loadOrderGraph = None  # type: typing.Optional[_LoadOrderGraph]
 _loadedModules = list()  # type: typing.List[str]
 
 _failedLoadingMods = set()  # type: typing.Set[str]
@@ -44,6 +47,13 @@ _invalidSetupMods = set()  # type: typing.Set[str]
 _cascadeFailureMods = set()  # type: typing.Set[str]
 
 _showedNotLoadedFailureNotification = False  # type: bool
+_wroteLoadingTimings = False  # type: bool
+
+_informationReadingWorkerLimit = 8  # type: int
+
+_loadPlanFilePath = os.path.join(This.Mod.PersistentPath, "LoadPlan.json")  # type: str
+_loadPlanFormatVersion = 1  # type: int
+_installationVerdicts = list()  # type: typing.List[typing.Tuple[str, str, str]]
 
 class _Loader:
 	"""
@@ -73,7 +83,10 @@ class _Loader:
 
 		self.AutoLoad = True  # type: bool
 
+		self._archiveModules = dict()  # type: typing.Dict[str, typing.Union[typing.List[str], Exception]]
+
 		_allLoaders.append(self)
+		_loadersByNamespace[mod.Namespace] = self
 
 	def Disable (self, cascade: bool = True, warningList: typing.Set[str] = None) -> None:
 		if self.Mod.Blocked or not self.Mod.ControlsLoading(This.Mod.Namespace):
@@ -93,10 +106,25 @@ class _Loader:
 		if self.Mod.IsReadyToUnload(This.Mod.Namespace):
 			self.Unload()
 
-	def GetInformation (self) -> None:
+	def GetInformation (self, informationReading: typing.Optional[_InformationReading] = None) -> None:
+		"""
+		Update the mod object with the information in its information file, disabling the mod if the information is not valid.
+		:param informationReading: The already read information file, if this is None the file will be read now.
+		:type informationReading: _InformationReading | None
+		"""
+
+		if informationReading is None:
+			informationReading = _ReadInformationFileTimed(self)
+
+		LoadingTimings.Record(self.Mod.Namespace, LoadingTimings.ReadInformationOperation, informationReading.ReadDuration)
+
+		self._archiveModules = informationReading.ArchiveModules
+
 		try:
-			with open(self.Mod.InformationFilePath) as informationFile:
-				informationDictionary = json.JSONDecoder().decode(informationFile.read())  # type: dict
+			if informationReading.ReadException is not None:
+				raise informationReading.ReadException
+
+			informationDictionary = informationReading.InformationDictionary  # type: dict
 
 			if not isinstance(informationDictionary, dict):
 				raise TypeError("Cannot convert mod file to a dictionary.")
@@ -105,12 +133,56 @@ class _Loader:
 			self.Disable(warningList = _failedLoadingMods)
 			return
 
-		if not self._UpdateInformation(informationDictionary):
-			self._ResetInformation()
-			self.Disable(warningList = _failedLoadingMods)
-			return
+		verifyStartTime = time.perf_counter_ns()  # type: int
+
+		try:
+			if not self._UpdateInformation(informationDictionary):
+				self._ResetInformation()
+				self.Disable(warningList = _failedLoadingMods)
+				return
+		finally:
+			self._archiveModules = dict()
+			LoadingTimings.Record(self.Mod.Namespace, LoadingTimings.VerifyInformationOperation, time.perf_counter_ns() - verifyStartTime)
 
 		self.Mod.ReadInformation = True
+		self.Mod.ClearCachedChecks()
+		self._IndexDependencies()
+
+	def ReadInformationFile (self) -> _InformationReading:
+		"""
+		Read and decode this mod's information file and list the modules in every script archive it points to, without changing the mod object or
+		logging anything. This is safe to call from any thread, problems are stored in the returned object to be reported by 'GetInformation'.
+		"""
+
+		informationReading = _InformationReading()  # type: _InformationReading
+
+		try:
+			with open(self.Mod.InformationFilePath) as informationFile:
+				informationReading.InformationDictionary = json.JSONDecoder().decode(informationFile.read())
+		except Exception as e:
+			informationReading.ReadException = e
+			return informationReading
+
+		if not isinstance(informationReading.InformationDictionary, dict):
+			return informationReading
+
+		scriptPaths = informationReading.InformationDictionary.get("ScriptPaths", None)  # type: typing.Optional[list]
+
+		if not isinstance(scriptPaths, list):
+			return informationReading
+
+		for index, scriptPath in enumerate(scriptPaths):  # type: int, typing.Union[str, dict]
+			try:
+				scriptPathValue = self._GetScriptPathValue(scriptPath, index)  # type: str
+			except Exception:
+				continue
+
+			try:
+				informationReading.ArchiveModules[scriptPathValue] = _GetArchiveModules(scriptPathValue)
+			except Exception as e:
+				informationReading.ArchiveModules[scriptPathValue] = e
+
+		return informationReading
 
 	def Load (self, cause: LoadingShared.LoadingCauses = LoadingShared.LoadingCauses.Normal, loadIfUnsafe: bool = True) -> bool:
 		"""
@@ -147,7 +219,7 @@ class _Loader:
 			else:
 				Debug.Log("The mod '" + self.Mod.Namespace + "' is being loaded despite that one or more mods that are suppose to be already loaded are not.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 
-		operationStartTime = time.time()  # type: float
+		operationStartTime = time.perf_counter_ns()  # type: int
 
 		self.Mod.Loading = True
 
@@ -184,7 +256,7 @@ class _Loader:
 
 			self.Mod.Started = True
 
-		operationTime = time.time() - operationStartTime  # type: float
+		operationTime = (time.perf_counter_ns() - operationStartTime) / 1000000000  # type: float
 		self.Mod.Loading = False
 		self.Mod.LoadTime = operationTime
 
@@ -206,7 +278,7 @@ class _Loader:
 
 		Debug.Log("Unloading mod '" + self.Mod.Namespace + "'.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 
-		operationStartTime = time.time()  # type: float
+		operationStartTime = time.perf_counter_ns()  # type: int
 
 		successful = True  # type: bool
 
@@ -228,7 +300,7 @@ class _Loader:
 			Debug.Log("Unloading '" + self.Mod.Namespace + "' from it's mod object is not allowed.", This.Mod.Namespace, Debug.LogLevels.Error, group = This.Mod.Namespace, owner = __name__)
 			return False
 
-		operationTime = time.time() - operationStartTime  # type: float
+		operationTime = (time.perf_counter_ns() - operationStartTime) / 1000000000  # type: float
 
 		Debug.Log("Successfully unloaded the mod " + self.Mod.Namespace + "' in " + str(operationTime) + " seconds.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 
@@ -378,53 +450,74 @@ class _Loader:
 				raise Exceptions.IncorrectTypeException(scriptPaths, "Root[%s]" % informationKey, (list,))
 
 			for index, scriptPath in enumerate(scriptPaths):  # type: int, str
-				if not isinstance(scriptPath, str) and not isinstance(scriptPath, dict):
-					raise Exceptions.IncorrectTypeException(scriptPath, "Root[%s][%d]" % (informationKey, index), (str, dict))
+				scriptPaths[index] = self._GetScriptPathValue(scriptPath, index)
+
+			self.Mod.ScriptPaths = scriptPaths
+
+			for scriptPath in self.Mod.ScriptPaths:
+				self.Mod.Modules.extend(self._GetArchiveModules(scriptPath))
 
-				if isinstance(scriptPath, dict):
-					if not scriptPathRootKey in scriptPath:
-						raise Exception("Missing dictionary entry '%s' in 'Root[%s][%d]'." % (scriptPathRootKey, informationKey, index))
+			return True
+		except Exception:
+			Debug.Log("Failed to read mod information file value '%s' for '%s'." % (informationKey, self.Mod.Namespace), This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+			return False
 
-					if not scriptPathPathKey in scriptPath:
-						raise Exception("Missing dictionary entry '%s' in 'Root[%s][%d]'." % (scriptPathPathKey, informationKey, index))
+	def _GetScriptPathValue (self, scriptPath: typing.Union[str, dict], index: int) -> str:
+		informationKey = "ScriptPaths"  # type: str
 
-					scriptPathRoot = scriptPath[scriptPathRootKey]  # type: str
+		scriptPathRootKey = "Root"  # type: str
+		scriptPathPathKey = "Path"  # type: str
 
-					if not isinstance(scriptPathRoot, str):
-						raise Exceptions.IncorrectTypeException(scriptPathRoot, "Root[%s][%d][%s]" % (informationKey, index, scriptPathRootKey), (str,))
+		if not isinstance(scriptPath, str) and not isinstance(scriptPath, dict):
+			raise Exceptions.IncorrectTypeException(scriptPath, "Root[%s][%d]" % (informationKey, index), (str, dict))
 
-					scriptPathPath = scriptPath[scriptPathPathKey]  # type: str
+		if isinstance(scriptPath, dict):
+			if not scriptPathRootKey in scriptPath:
+				raise Exception("Missing dictionary entry '%s' in 'Root[%s][%d]'." % (scriptPathRootKey, informationKey, index))
 
-					if not isinstance(scriptPathPath, str):
-						raise Exceptions.IncorrectTypeException(scriptPathRoot, "Root[%s][%d][%s]" % (informationKey, index, scriptPathPathKey), (str,))
+			if not scriptPathPathKey in scriptPath:
+				raise Exception("Missing dictionary entry '%s' in 'Root[%s][%d]'." % (scriptPathPathKey, informationKey, index))
 
-					scriptPathRootLower = scriptPathRoot.lower()
+			scriptPathRoot = scriptPath[scriptPathRootKey]  # type: str
 
-					if scriptPathRootLower == "mods":
-						scriptPathRootValue = Paths.ModsPath
-					elif scriptPathRootLower == "s4":
-						scriptPathRootValue = Paths.UserDataPath
-					elif scriptPathRootLower == "current":
-						scriptPathRootValue = self.Mod.InformationFileDirectoryPath
-					else:
-						raise Exception("'" + scriptPathPath + "' is not a valid path root, valid roots are 'mods', 's4' and 'current'.")
+			if not isinstance(scriptPathRoot, str):
+				raise Exceptions.IncorrectTypeException(scriptPathRoot, "Root[%s][%d][%s]" % (informationKey, index, scriptPathRootKey), (str,))
 
-					scriptPaths[index] = os.path.join(scriptPathRootValue, os.path.normpath(scriptPathPath))
-				else:
-					scriptPaths[index] = os.path.join(Paths.ModsPath, os.path.normpath(scriptPath))
+			scriptPathPath = scriptPath[scriptPathPathKey]  # type: str
 
-				if not os.path.exists(scriptPaths[index]):
-					raise Exception("'" + scriptPaths[index] + "' does not exist.")
+			if not isinstance(scriptPathPath, str):
+				raise Exceptions.IncorrectTypeException(scriptPathRoot, "Root[%s][%d][%s]" % (informationKey, index, scriptPathPathKey), (str,))
 
-			self.Mod.ScriptPaths = scriptPaths
+			scriptPathRootLower = scriptPathRoot.lower()
 
-			for scriptPath in self.Mod.ScriptPaths:
-				self.Mod.Modules.extend(_GetArchiveModules(scriptPath))
+			if scriptPathRootLower == "mods":
+				scriptPathRootValue = Paths.ModsPath
+			elif scriptPathRootLower == "s4":
+				scriptPathRootValue = Paths.UserDataPath
+			elif scriptPathRootLower == "current":
+				scriptPathRootValue = self.Mod.InformationFileDirectoryPath
+			else:
+				raise Exception("'" + scriptPathPath + "' is not a valid path root, valid roots are 'mods', 's4' and 'current'.")
 
-			return True
-		except Exception:
-			Debug.Log("Failed to read mod information file value '%s' for '%s'." % (informationKey, self.Mod.Namespace), This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
-			return False
+			scriptPathValue = os.path.join(scriptPathRootValue, os.path.normpath(scriptPathPath))  # type: str
+		else:
+			scriptPathValue = os.path.join(Paths.ModsPath, os.path.normpath(scriptPath))  # type: str
+
+		if not os.path.exists(scriptPathValue):
+			raise Exception("'" + scriptPathValue + "' does not exist.")
+
+		return scriptPathValue
+
+	def _GetArchiveModules (self, archivePath: str) -> typing.List[str]:
+		archiveModules = self._archiveModules.get(archivePath, None)  # type: typing.Union[typing.List[str], Exception, None]
+
+		if archiveModules is None:
+			return _GetArchiveModules(archivePath)
+
+		if isinstance(archiveModules, Exception):
+			raise archiveModules
+
+		return list(archiveModules)
 
 	def _UpdateRequiredMods (self, informationDictionary: dict) -> bool:
 		informationKey = "RequiredMods"  # type: str
@@ -631,6 +724,7 @@ class _Loader:
 
 		self.Mod.ScriptPaths = list()
 		self.Mod.Modules = list()
+		self.Mod.ModuleHooks = None
 
 		self.Mod.RequiredMods = set()
 		self.Mod.IncompatibleMods = set()
@@ -643,10 +737,84 @@ class _Loader:
 
 		self.Mod.Additional = dict()
 
+		self.Mod.ClearCachedChecks()
+
+	def _GetInformationState (self) -> dict:
+		return {
+			"Author": self.Mod.Author,
+			"Version": str(self.Mod.Version),
+			"VersionDisplay": self.Mod.VersionDisplay,
+			"Distribution": [
+				self.Mod.Distribution.UpdatesController,
+				self.Mod.Distribution.UpdatesFileURL,
+				self.Mod.Distribution.DownloadURL,
+				self.Mod.Distribution.PreviewDownloadURL
+			],
+			"Rating": int(self.Mod.Rating),
+			"ScriptPaths": list(self.Mod.ScriptPaths),
+			"Modules": list(self.Mod.Modules),
+			"RequiredMods": sorted(self.Mod.RequiredMods),
+			"IncompatibleMods": sorted(self.Mod.IncompatibleMods),
+			"LoadAfter": sorted(self.Mod.LoadAfter),
+			"LoadBefore": sorted(self.Mod.LoadBefore),
+			"Compatibility": [
+				[
+					modCompatibility.Namespace,
+					str(modCompatibility.LowestVersion) if modCompatibility.LowestVersion is not None else None,
+					str(modCompatibility.HighestVersion) if modCompatibility.HighestVersion is not None else None
+				] for modCompatibility in self.Mod.Compatibility
+			],
+			"BuildDate": self.Mod.BuildDate.isoformat() if self.Mod.BuildDate is not None else None,
+			"BuildGameVersion": str(self.Mod.BuildGameVersion) if self.Mod.BuildGameVersion is not None else None,
+			"Additional": self.Mod.Additional
+		}
+
+	def _SetInformationState (self, informationState: dict) -> None:
+		# The state was taken from a mod object that had already been through verification, it is trusted as is.
+
+		self.Mod.Author = informationState["Author"]
+		self.Mod.Version = Version.Version(informationState["Version"])
+		self.Mod.VersionDisplay = informationState["VersionDisplay"]
+		self.Mod.Distribution = Mods.Distribution(*informationState["Distribution"])
+		self.Mod.Rating = Mods.Rating(informationState["Rating"])
+
+		self.Mod.ScriptPaths = list(informationState["ScriptPaths"])
+		self.Mod.Modules = list(informationState["Modules"])
+		self.Mod.ModuleHooks = None
+
+		self.Mod.RequiredMods = set(informationState["RequiredMods"])
+		self.Mod.IncompatibleMods = set(informationState["IncompatibleMods"])
+		self.Mod.LoadAfter = set(informationState["LoadAfter"])
+		self.Mod.LoadBefore = set(informationState["LoadBefore"])
+		self.Mod.Compatibility = [
+			Mods.Compatibility(
+				compatibilityNamespace,
+				Version.Version(lowestVersion) if lowestVersion is not None else None,
+				Version.Version(highestVersion) if highestVersion is not None else None
+			) for compatibilityNamespace, lowestVersion, highestVersion in informationState["Compatibility"]
+		]
+
+		self.Mod.BuildDate = datetime.datetime.fromisoformat(informationState["BuildDate"]) if informationState["BuildDate"] is not None else None
+		self.Mod.BuildGameVersion = Version.Version(informationState["BuildGameVersion"], translate = True) if informationState["BuildGameVersion"] is not None else None
+
+		self.Mod.Additional = informationState["Additional"]
+
+		self.Mod.ReadInformation = True
+		self.Mod.ClearCachedChecks()
+		self._IndexDependencies()
+
+	def _IndexDependencies (self) -> None:
+		for requiredModNamespace in self.Mod.RequiredMods:  # type: str
+			requiredModDependents = _dependentsByNamespace.get(requiredModNamespace, None)  # type: typing.Optional[typing.List[str]]
+
+			if requiredModDependents is None:
+				_dependentsByNamespace[requiredModNamespace] = [self.Mod.Namespace]
+			else:
+				requiredModDependents.append(self.Mod.Namespace)
+
 	def _UnloadAndDisableRelatedMods (self) -> None:
-		for testingModLoader in _allLoaders:  # type: _Loader
-			if self.Mod.Namespace in testingModLoader.Mod.RequiredMods:
-				testingModLoader.Disable(warningList = _cascadeFailureMods)
+		for dependentNamespace in _GetDependents(self.Mod.Namespace):  # type: str
+			_loadersByNamespace[dependentNamespace].Disable(warningList = _cascadeFailureMods)
 
 	def _ImportModules (self) -> bool:
 		for scriptPath in self.Mod.ScriptPaths:  # type: str
@@ -661,67 +829,42 @@ class _Loader:
 				sys.path.append(scriptPathNormalized)
 
 		if len(self.Mod.Modules) != 0:
-			_Import(self.Mod.Modules)
+			_Import(self.Mod.Namespace, self.Mod.Modules)
 		else:
 			if len(self.Mod.ScriptPaths) != 0:
 				Debug.Log("Found no modules to import for the mod '" + self.Mod.Namespace + "', even though there are one or more script paths designated.'", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
 
+		self.Mod.ResolveModuleHooks()
 		self.Mod.Imported = True
 
 		return True
 
+	def _CallModuleHook (self, hookName: str, module: str, hook: typing.Callable, cause: typing.Union[LoadingShared.LoadingCauses, LoadingShared.UnloadingCauses]) -> None:
+		hookStartTime = time.perf_counter_ns()  # type: int
+
+		try:
+			with Tracing.Span(module + "." + hookName, "Loading", { "Mod": self.Mod.Namespace }):
+				hook(cause)
+		finally:
+			LoadingTimings.Record(self.Mod.Namespace, hookName, time.perf_counter_ns() - hookStartTime, module = module)
+
 	def _InitiateModules (self, cause: LoadingShared.LoadingCauses) -> None:
 		for module in self.Mod.Modules:  # type: str
 			if not module in _loadedModules:
 				_loadedModules.append(module)
 
-			OnInitiate = None  # type: typing.Optional[typing.Callable]
-
-			try:
-				OnInitiate = getattr(sys.modules[module], "_OnInitiate")
-			except Exception:
-				pass
-
-			if isinstance(OnInitiate, types.FunctionType):
-				if len(inspect.signature(OnInitiate).parameters) == 1:
-					OnInitiate(cause)
-
-		for module in self.Mod.Modules:  # type: str
-			OnInitiateLate = None  # type: typing.Optional[typing.Callable]
-
-			try:
-				OnInitiateLate = getattr(sys.modules[module], "_OnInitiateLate")
-			except Exception:
-				pass
+		for module, OnInitiate in self.Mod.GetModuleHooks("_OnInitiate"):  # type: str, typing.Callable
+			self._CallModuleHook("_OnInitiate", module, OnInitiate, cause)
 
-			if isinstance(OnInitiateLate, types.FunctionType):
-				if len(inspect.signature(OnInitiateLate).parameters) == 1:
-					OnInitiateLate(cause)
+		for module, OnInitiateLate in self.Mod.GetModuleHooks("_OnInitiateLate"):  # type: str, typing.Callable
+			self._CallModuleHook("_OnInitiateLate", module, OnInitiateLate, cause)
 
 	def _StartModules (self, cause: LoadingShared.LoadingCauses) -> None:
-		for module in self.Mod.Modules:  # type: str
-			OnStart = None  # type: typing.Optional[typing.Callable]
-
-			try:
-				OnStart = getattr(sys.modules[module], "_OnStart")
-			except Exception:
-				pass
+		for module, OnStart in self.Mod.GetModuleHooks("_OnStart"):  # type: str, typing.Callable
+			self._CallModuleHook("_OnStart", module, OnStart, cause)
 
-			if isinstance(OnStart, types.FunctionType):
-				if len(inspect.signature(OnStart).parameters) == 1:
-					OnStart(cause)
-
-		for module in self.Mod.Modules:  # type: str
-			OnStartLate = None  # type: typing.Optional[typing.Callable]
-
-			try:
-				OnStartLate = getattr(sys.modules[module], "_OnStartLate")
-			except Exception:
-				pass
-
-			if isinstance(OnStartLate, types.FunctionType):
-				if len(inspect.signature(OnStartLate).parameters) == 1:
-					OnStartLate(cause)
+		for module, OnStartLate in self.Mod.GetModuleHooks("_OnStartLate"):  # type: str, typing.Callable
+			self._CallModuleHook("_OnStartLate", module, OnStartLate, cause)
 
 	def _StopModules (self, cause: LoadingShared.UnloadingCauses) -> bool:
 		successful = True  # type: bool
@@ -730,73 +873,38 @@ class _Loader:
 			if module in _loadedModules:
 				_loadedModules.remove(module)
 
-			OnStopEarly = None  # type: typing.Optional[typing.Callable]
-
+		for module, OnStopEarly in self.Mod.GetModuleHooks("_OnStopEarly"):  # type: str, typing.Callable
 			try:
-				OnStopEarly = getattr(sys.modules[module], "_OnStopEarly")
+				self._CallModuleHook("_OnStopEarly", module, OnStopEarly, cause)
 			except Exception:
-				pass
-
-			if isinstance(OnStopEarly, types.FunctionType):
-				if len(inspect.signature(OnStopEarly).parameters) == 1:
-					try:
-						OnStopEarly(cause)
-					except Exception:
-						Debug.Log("Failed to call '_StopEarly' for module '" + module + "'.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
-						successful = False
-
-		for module in self.Mod.Modules:  # type: str
-			OnStop = None  # type: typing.Optional[typing.Callable]
+				Debug.Log("Failed to call '_StopEarly' for module '" + module + "'.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+				successful = False
 
+		for module, OnStop in self.Mod.GetModuleHooks("_OnStop"):  # type: str, typing.Callable
 			try:
-				OnStop = getattr(sys.modules[module], "_OnStop")
+				self._CallModuleHook("_OnStop", module, OnStop, cause)
 			except Exception:
-				pass
-
-			if isinstance(OnStop, types.FunctionType):
-				if len(inspect.signature(OnStop).parameters) == 1:
-					try:
-						OnStop(cause)
-					except Exception:
-						Debug.Log("Failed to call '_Stop' for module '" + module + "'.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
-						successful = False
+				Debug.Log("Failed to call '_Stop' for module '" + module + "'.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+				successful = False
 
 		return successful
 
 	def _UnloadModules (self, cause: LoadingShared.UnloadingCauses) -> bool:
 		successful = True  # type: bool
 
-		for module in self.Mod.Modules:  # type: str
-			OnUnloadEarly = None  # type: typing.Optional[typing.Callable]
-
+		for module, OnUnloadEarly in self.Mod.GetModuleHooks("_OnUnloadEarly"):  # type: str, typing.Callable
 			try:
-				OnUnloadEarly = getattr(sys.modules[module], "_OnUnloadEarly")
+				self._CallModuleHook("_OnUnloadEarly", module, OnUnloadEarly, cause)
 			except Exception:
-				pass
-
-			if isinstance(OnUnloadEarly, types.FunctionType):
-				if len(inspect.signature(OnUnloadEarly).parameters) == 1:
-					try:
-						OnUnloadEarly(cause)
-					except Exception:
-						Debug.Log("Failed to call '_UnloadEarly' for module '" + module + "'.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
-						successful = False
-
-		for module in self.Mod.Modules:  # type: str
-			OnUnload = None  # type: typing.Optional[typing.Callable]
+				Debug.Log("Failed to call '_UnloadEarly' for module '" + module + "'.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+				successful = False
 
+		for module, OnUnload in self.Mod.GetModuleHooks("_OnUnload"):  # type: str, typing.Callable
 			try:
-				OnUnload = getattr(sys.modules[module], "_OnUnload")
+				self._CallModuleHook("_OnUnload", module, OnUnload, cause)
 			except Exception:
-				pass
-
-			if isinstance(OnUnload, types.FunctionType):
-				if len(inspect.signature(OnUnload).parameters) == 1:
-					try:
-						OnUnload(cause)
-					except Exception:
-						Debug.Log("Failed to call '_Unload' for module '" + module + "'.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
-						successful = False
+				Debug.Log("Failed to call '_Unload' for module '" + module + "'.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+				successful = False
 
 		return successful
 
@@ -804,6 +912,237 @@ class _Importer:
 	def load_module (self, fullname: str):
 		return importlib.import_module(fullname)
 
+class _InformationReading:
+	def __init__ (self):
+		"""
+		The raw results of reading a mod's information file and its script archives, before anything has been verified.
+		"""
+
+		self.InformationDictionary = None  # type: typing.Any
+		self.ReadException = None  # type: typing.Optional[Exception]
+		self.ArchiveModules = dict()  # type: typing.Dict[str, typing.Union[typing.List[str], Exception]]
+		self.ReadDuration = 0  # type: int
+
+class _LoadOrderGraph:
+	def __init__ (self, mods: typing.Dict[str, Mods.Mod]):
+		"""
+		The load order relationships between every installed mod that has scripts. A mod's prerequisites are the mods in its 'LoadAfter' and
+		'RequiredMods' values and any mod that lists it in their 'LoadBefore' value.
+
+		:param mods: All installed mods, listed by their namespaces.
+		:type mods: typing.Dict[str, Mods.Mod]
+		"""
+
+		self.Prerequisites = dict()  # type: typing.Dict[str, typing.Set[str]]
+		self.Successors = dict()  # type: typing.Dict[str, typing.Set[str]]
+		self.CyclicNamespaces = set()  # type: typing.Set[str]
+
+		for modNamespace, mod in mods.items():  # type: str, Mods.Mod
+			if len(mod.ScriptPaths) == 0:
+				continue
+
+			self.Prerequisites[modNamespace] = set()
+			self.Successors[modNamespace] = set()
+
+		for modNamespace, mod in mods.items():  # type: str, Mods.Mod
+			if not modNamespace in self.Prerequisites:
+				continue
+
+			for prerequisiteNamespace in mod.LoadAfter | mod.RequiredMods:  # type: str
+				if prerequisiteNamespace in self.Prerequisites:
+					self._AddEdge(prerequisiteNamespace, modNamespace)
+
+			for successorNamespace in mod.LoadBefore:  # type: str
+				if successorNamespace in self.Prerequisites:
+					self._AddEdge(modNamespace, successorNamespace)
+
+	@classmethod
+	def FromPrerequisites (cls, prerequisites: typing.Dict[str, typing.List[str]], cyclicNamespaces: typing.List[str]) -> _LoadOrderGraph:
+		"""
+		Recreate a graph from the prerequisites and cycles of one that was saved earlier.
+		"""
+
+		loadOrderGraph = cls(dict())  # type: _LoadOrderGraph
+
+		for modNamespace in prerequisites.keys():  # type: str
+			loadOrderGraph.Prerequisites[modNamespace] = set()
+			loadOrderGraph.Successors[modNamespace] = set()
+
+		for modNamespace, modPrerequisites in prerequisites.items():  # type: str, typing.List[str]
+			for prerequisiteNamespace in modPrerequisites:  # type: str
+				loadOrderGraph._AddEdge(prerequisiteNamespace, modNamespace)
+
+		loadOrderGraph.CyclicNamespaces = set(cyclicNamespaces)
+
+		return loadOrderGraph
+
+	def GetPrerequisites (self, namespace: str) -> typing.Set[str]:
+		"""
+		Get the namespaces of the mods that need to be loaded before this one. Mods without scripts have no prerequisites.
+		"""
+
+		return self.Prerequisites.get(namespace, set())
+
+	def GetSuccessors (self, namespace: str) -> typing.Set[str]:
+		"""
+		Get the namespaces of the mods that need this one to be loaded before them. Mods without scripts have no successors.
+		"""
+
+		return self.Successors.get(namespace, set())
+
+	def FindCycles (self, namespaces: typing.Set[str]) -> typing.Set[str]:
+		"""
+		Find every mod among these namespaces that is part of a load order cycle. Edges to mods outside of the namespaces are ignored.
+		:param namespaces: The namespaces of the mods to be checked.
+		:type namespaces: typing.Set[str]
+		:return: The namespaces of every mod that is in a cycle, or is stuck between two of them.
+		:rtype: typing.Set[str]
+		"""
+
+		inDegrees = { namespace: len(self.GetPrerequisites(namespace) & namespaces) for namespace in namespaces }  # type: typing.Dict[str, int]
+		freeNamespaces = [namespace for namespace, inDegree in inDegrees.items() if inDegree == 0]  # type: typing.List[str]
+
+		while len(freeNamespaces) != 0:
+			freeNamespace = freeNamespaces.pop()  # type: str
+
+			for successorNamespace in self.GetSuccessors(freeNamespace):  # type: str
+				if successorNamespace in inDegrees:
+					inDegrees[successorNamespace] -= 1
+
+					if inDegrees[successorNamespace] == 0:
+						freeNamespaces.append(successorNamespace)
+
+		cyclicNamespaces = { namespace for namespace, inDegree in inDegrees.items() if inDegree != 0 }  # type: typing.Set[str]
+
+		# Mods that are only waiting on a cycle are not part of one, trim them off from the end.
+		outDegrees = { namespace: len(self.GetSuccessors(namespace) & cyclicNamespaces) for namespace in cyclicNamespaces }  # type: typing.Dict[str, int]
+		freeNamespaces = [namespace for namespace, outDegree in outDegrees.items() if outDegree == 0]
+
+		while len(freeNamespaces) != 0:
+			freeNamespace = freeNamespaces.pop()  # type: str
+			cyclicNamespaces.discard(freeNamespace)
+
+			for prerequisiteNamespace in self.GetPrerequisites(freeNamespace):  # type: str
+				if prerequisiteNamespace in outDegrees:
+					outDegrees[prerequisiteNamespace] -= 1
+
+					if outDegrees[prerequisiteNamespace] == 0:
+						freeNamespaces.append(prerequisiteNamespace)
+
+		return cyclicNamespaces
+
+	def _AddEdge (self, prerequisiteNamespace: str, successorNamespace: str) -> None:
+		self.Prerequisites[successorNamespace].add(prerequisiteNamespace)
+		self.Successors[prerequisiteNamespace].add(successorNamespace)
+
+class _LoadScheduler:
+	def __init__ (self, loaders: typing.List[_Loader], unsafeAllowed: bool):
+		"""
+		Loads mods in an order where every mod's prerequisites are loaded before it, using Kahn's algorithm. Mods become ready once their last prerequisite
+		has loaded, ready mods are loaded in the order they were registered. The number of prerequisites each mod is still waiting on is the one counted by
+		the mods module, this only keeps the queue of mods that are ready.
+
+		:param loaders: The loaders this scheduler may load, in the order they were registered.
+		:type loaders: typing.List[_Loader]
+		:param unsafeAllowed: Whether or not mods should still be loaded once no mod can be safely loaded.
+		:type unsafeAllowed: bool
+		"""
+
+		self.UnsafeAllowed = unsafeAllowed  # type: bool
+
+		self._loaders = list(loaders)  # type: typing.List[_Loader]
+		self._loaderIndexes = { loader.Mod.Namespace: loaderIndex for loaderIndex, loader in enumerate(self._loaders) }  # type: typing.Dict[str, int]
+
+		self._waitingNamespaces = set(self._loaderIndexes.keys())  # type: typing.Set[str]
+
+		self._readyQueue = list()  # type: typing.List[typing.Tuple[int, str]]
+		self._deferredQueue = list()  # type: typing.List[typing.Tuple[int, str]]
+
+		for loaderIndex, loader in enumerate(self._loaders):  # type: int, _Loader
+			# Mods with untracked prerequisites never become ready, they can only be loaded unsafely.
+			if loader.Mod.GetUnloadedPrerequisiteCount() == 0:
+				heapq.heappush(self._readyQueue, (loaderIndex, loader.Mod.Namespace))
+
+	def Run (self) -> None:
+		"""
+		Load every mod that can be loaded, stopping when none are left.
+		"""
+
+		while True:
+			selectedLoader = self._PopReadyLoader()  # type: typing.Optional[_Loader]
+
+			if selectedLoader is None:
+				if not self.UnsafeAllowed:
+					break
+
+				selectedLoader = self._PopUnsafeLoader()
+
+				if selectedLoader is None:
+					break
+
+			with Tracing.Span("Load " + selectedLoader.Mod.Namespace, "Loading"):
+				selectedLoader.Load()
+
+	def NotifyLoaded (self, namespace: str, readyMods: typing.List[Mods.Mod]) -> None:
+		"""
+		Tell this scheduler a mod has finished loading.
+		:param namespace: The namespace of the mod that was loaded.
+		:type namespace: str
+		:param readyMods: The mods that were waiting only on this one, as returned by 'Mods.NotifyModLoaded'. Those this scheduler may load become ready.
+		:type readyMods: typing.List[Mods.Mod]
+		"""
+
+		self._waitingNamespaces.discard(namespace)
+
+		for readyMod in readyMods:  # type: Mods.Mod
+			if readyMod.Namespace in self._waitingNamespaces:
+				heapq.heappush(self._readyQueue, (self._loaderIndexes[readyMod.Namespace], readyMod.Namespace))
+
+	def _PopReadyLoader (self) -> typing.Optional[_Loader]:
+		# Mods that had auto loading disabled when they became ready are checked again in case it was re-enabled.
+		for deferredEntry in self._deferredQueue:  # type: typing.Tuple[int, str]
+			heapq.heappush(self._readyQueue, deferredEntry)
+
+		self._deferredQueue = list()
+
+		while len(self._readyQueue) != 0:
+			readyEntry = heapq.heappop(self._readyQueue)  # type: typing.Tuple[int, str]
+			readyIndex, readyNamespace = readyEntry  # type: int, str
+
+			if not readyNamespace in self._waitingNamespaces:
+				continue
+
+			readyLoader = self._loaders[readyIndex]  # type: _Loader
+
+			if not readyLoader.Mod.IsReadyToLoad(This.Mod.Namespace):
+				self._waitingNamespaces.discard(readyNamespace)
+				continue
+
+			if not readyLoader.AutoLoad:
+				self._deferredQueue.append(readyEntry)
+				continue
+
+			self._waitingNamespaces.discard(readyNamespace)
+			return readyLoader
+
+		return None
+
+	def _PopUnsafeLoader (self) -> typing.Optional[_Loader]:
+		for loader in self._loaders:  # type: _Loader
+			if not loader.Mod.Namespace in self._waitingNamespaces:
+				continue
+
+			if not loader.AutoLoad:
+				continue
+
+			if not loader.Mod.IsReadyToLoad(This.Mod.Namespace):
+				continue
+
+			self._waitingNamespaces.discard(loader.Mod.Namespace)
+			return loader
+
+		return None
+
 def LoadingAll () -> bool:
 	"""
 	Whether or not a load loop is currently active. A load loop cannot start if it was triggered from inside another load loop.
@@ -835,10 +1174,11 @@ def LoadMod (namespace: str, loadIfUnsafe: bool = True) -> None:
 	:type loadIfUnsafe: bool
 	"""
 
-	for modLoader in _allLoaders:  # type: _Loader
-		if modLoader.Mod.Namespace == namespace:
-			modLoader.Load(loadIfUnsafe = loadIfUnsafe)
-			return
+	modLoader = _loadersByNamespace.get(namespace, None)  # type: typing.Optional[_Loader]
+
+	if modLoader is not None:
+		modLoader.Load(loadIfUnsafe = loadIfUnsafe)
+		return
 
 	Debug.Log("Tried to load '" + namespace + "' but no such mod exists.", This.Mod.Namespace, Debug.LogLevels.Error, group = This.Mod.Namespace, owner = __name__)
 
@@ -847,15 +1187,16 @@ def DisableModAutoLoad (namespace: str) -> None:
 	Disable the automatic loading of a mod to allow for it to be manually loaded at another time.
 	"""
 
-	for modLoader in _allLoaders:  # type: _Loader
-		if modLoader.Mod.Namespace == namespace:
-			if modLoader.Mod.IsLoaded():
-				Debug.Log("Tried to block the automatic load of '" + namespace + "' but it is already loaded.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
-				return
+	modLoader = _loadersByNamespace.get(namespace, None)  # type: typing.Optional[_Loader]
 
-			modLoader.AutoLoad = False
+	if modLoader is not None:
+		if modLoader.Mod.IsLoaded():
+			Debug.Log("Tried to block the automatic load of '" + namespace + "' but it is already loaded.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
 			return
 
+		modLoader.AutoLoad = False
+		return
+
 	Debug.Log("Tried to block the automatic load of '" + namespace + "' but no such mod exists.", This.Mod.Namespace, Debug.LogLevels.Error, group = This.Mod.Namespace, owner = __name__)
 
 def EnableModAutoLoad (namespace: str) -> None:
@@ -863,15 +1204,16 @@ def EnableModAutoLoad (namespace: str) -> None:
 	Allows for a mod to be loaded automatically if it was previously disabled.
 	"""
 
-	for modLoader in _allLoaders:  # type: _Loader
-		if modLoader.Mod.Namespace == namespace:
-			if modLoader.Mod.IsLoaded():
-				Debug.Log("Tried to unblock the automatic load of '" + namespace + "' but it is already loaded.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
-				return
+	modLoader = _loadersByNamespace.get(namespace, None)  # type: typing.Optional[_Loader]
 
-			modLoader.AutoLoad = True
+	if modLoader is not None:
+		if modLoader.Mod.IsLoaded():
+			Debug.Log("Tried to unblock the automatic load of '" + namespace + "' but it is already loaded.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
 			return
 
+		modLoader.AutoLoad = True
+		return
+
 	Debug.Log("Tried to unblock the automatic load of '" + namespace + "' but no such mod exists.", This.Mod.Namespace, Debug.LogLevels.Error, group = This.Mod.Namespace, owner = __name__)
 
 def PauseAutoLoad () -> None:
@@ -893,121 +1235,247 @@ def UnpauseAutoLoad () -> None:
 	_autoLoad = True
 
 def _Setup () -> None:
-	for mod in Mods.GetAllMods():  # type: Mods.Mod
-		modLoader = _Loader(mod)  # type: _Loader
-		modLoader.GetInformation()
+	with Tracing.Span("Loading._Setup", "Loading"):
+		modLoaders = [_Loader(mod) for mod in Mods.GetAllMods()]  # type: typing.List[_Loader]
 
-	registeredMods = ""  # type: str
+		loadPlan = _ReadLoadPlan(modLoaders)  # type: typing.Optional[dict]
 
-	for mod in Mods.GetAllMods():  # type: Mods.Mod
-		if not mod.ReadInformation:
-			continue
+		if loadPlan is not None and not _ApplyLoadPlanInformation(loadPlan, modLoaders):
+			loadPlan = None
+
+		if loadPlan is None:
+			informationReadings = _ReadAllInformation(modLoaders)  # type: typing.List[_InformationReading]
+
+			for modLoader, informationReading in zip(modLoaders, informationReadings):  # type: _Loader, _InformationReading
+				modLoader.GetInformation(informationReading = informationReading)
+
+		Archives.SaveCache()
+
+		registeredMods = ""  # type: str
+
+		for mod in Mods.GetAllMods():  # type: Mods.Mod
+			if not mod.ReadInformation:
+				continue
+
+			if registeredMods != "":
+				registeredMods += "\n"
+
+			versionString = str(mod.Version)
 
-		if registeredMods != "":
-			registeredMods += "\n"
+			if versionString == mod.VersionDisplay:
+				registeredMods += "%s, v%s" % (mod.Namespace, versionString)
+			else:
+				registeredMods += "%s, v%s (%s)" % (mod.Namespace, versionString, mod.VersionDisplay)
+
+		Debug.Log("Registered mods:\n" + registeredMods, This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 
-		versionString = str(mod.Version)
+		if loadPlan is None:
+			_CheckInstallation()
+			_BuildLoadOrderGraph()
 
-		if versionString == mod.VersionDisplay:
-			registeredMods += "%s, v%s" % (mod.Namespace, versionString)
+			if all(modLoader.Mod.ReadInformation for modLoader in modLoaders):
+				_WriteLoadPlan(modLoaders)
 		else:
-			registeredMods += "%s, v%s (%s)" % (mod.Namespace, versionString, mod.VersionDisplay)
+			_ApplyLoadPlanVerdicts(loadPlan)
 
-	Debug.Log("Registered mods:\n" + registeredMods, This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+		Mods.UpdatePrerequisiteMods(_loadOrderGraph.Prerequisites)
 
-	_CheckInstallation()
+		LoadingEvents.ModLoadedEvent += _ModLoadedCallback
+		LoadingEvents.ModUnloadedEvent += _ModUnloadedCallback
+		atexit.register(_OnExitCallback)
+		_PatchOnLoadingScreenAnimationFinished()
 
-	LoadingEvents.ModLoadedEvent += _ModLoadedCallback
-	atexit.register(_OnExitCallback)
-	_PatchOnLoadingScreenAnimationFinished()
+def _ReadLoadPlan (modLoaders: typing.List[_Loader]) -> typing.Optional[dict]:
+	# A load plan can only be used if every mod is the same as when it was written, down to the last information file and script archive. Any
+	# difference at all and we go back to reading and checking everything from scratch.
 
-def _LoadLoop (unsafeAllowed: bool = False) -> None:
-	global _inLoadLoop
+	if not os.path.exists(_loadPlanFilePath):
+		return None
 
-	if _inLoadLoop:
-		raise Exception("Cannot start a load loop from inside another load loop.")
+	try:
+		with open(_loadPlanFilePath) as loadPlanFile:
+			loadPlan = json.JSONDecoder().decode(loadPlanFile.read())  # type: dict
 
-	loadableLoaders = [
-		modLoader for modLoader in _allLoaders if \
-		modLoader.Mod.IsLoadable(This.Mod.Namespace) and \
-		modLoader.Mod.RequiredModsInstalled() and \
-		not modLoader.Mod.IncompatibleModsInstalled()
-	]
+		if not isinstance(loadPlan, dict) or loadPlan.get("Version", None) != _loadPlanFormatVersion:
+			return None
 
-	while len(loadableLoaders) != 0:
-		_inLoadLoop = True
+		planMods = loadPlan["Mods"]  # type: typing.List[list]
 
-		safeLoad = False  # type: bool
-		selectedLoaderIndex = None  # type: typing.Optional[int]
+		if len(planMods) != len(modLoaders):
+			return None
 
-		for modLoaderIndex in range(len(loadableLoaders)):  # type: int
-			modLoader = loadableLoaders[modLoaderIndex]
+		for modLoader, planMod in zip(modLoaders, planMods):  # type: _Loader, list
+			planNamespace, planInformationFilePath, planInformationState = planMod  # type: str, str, dict
 
-			if not modLoader.AutoLoad:
-				continue
+			if planNamespace != modLoader.Mod.Namespace or planInformationFilePath != modLoader.Mod.InformationFilePath:
+				return None
 
-			if not modLoader.Mod.IsReadyToLoad(This.Mod.Namespace):
-				continue
+		if loadPlan["Fingerprint"] != _GetLoadPlanFingerprint(list(loadPlan["Fingerprint"].keys())):
+			return None
 
-			if not modLoader.Mod.PrerequisiteModsLoaded():
-				if selectedLoaderIndex is None:
-					selectedLoaderIndex = modLoaderIndex
+		return loadPlan
+	except Exception:
+		Debug.Log("Failed to read the load plan file at '" + Paths.StripUserDataPath(_loadPlanFilePath) + "'.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+		return None
 
-				continue
-			else:
-				selectedLoaderIndex = modLoaderIndex
-				safeLoad = True
-				break
+def _ApplyLoadPlanInformation (loadPlan: dict, modLoaders: typing.List[_Loader]) -> bool:
+	try:
+		for modLoader, planMod in zip(modLoaders, loadPlan["Mods"]):  # type: _Loader, list
+			modLoader._SetInformationState(planMod[2])
+	except Exception:
+		Debug.Log("Failed to apply the load plan, reading every mod's information from scratch instead.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
 
-		if selectedLoaderIndex is not None and not (not unsafeAllowed and not safeLoad):
-			selectedLoader = loadableLoaders[selectedLoaderIndex]  # type: _Loader
+		for modLoader in modLoaders:  # type: _Loader
+			modLoader.Mod.ReadInformation = False
+			modLoader._ResetInformation()
 
-			selectedLoader.Load()
-			loadableLoaders.pop(selectedLoaderIndex)
-		else:
-			_inLoadLoop = False
-			break
+		_dependentsByNamespace.clear()
+		return False
 
-def _Import (modules: list) -> None:
-	importer = custom_import.CustomLoader(_Importer())  # type: custom_import.CustomLoader
+	Debug.Log("No mod has changed since the last launch, using the saved load plan.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+	return True
 
-	for module in modules:  # type: str
-		if module.endswith(".__init__"):
-			importer.load_module(module[:-len(".__init__")])
-		else:
-			importer.load_module(module)
+def _ApplyLoadPlanVerdicts (loadPlan: dict) -> None:
+	global _loadOrderGraph
 
-def _GetArchiveModules (archivePath: str) -> typing.List[str]:
-	modules = list()  # type: typing.List[str]
-	archive = zipfile.ZipFile(archivePath, "r")  # type: zipfile.ZipFile
+	for verdictNamespace, verdictMessage, verdictWarningListName in loadPlan["Verdicts"]:  # type: str, str, str
+		_DisableForInstallation(_loadersByNamespace[verdictNamespace], verdictMessage, verdictWarningListName)
+
+	_loadOrderGraph = _LoadOrderGraph.FromPrerequisites(loadPlan["Prerequisites"], loadPlan["Cycles"])
+	_LogLoadOrderCycles()
+
+def _WriteLoadPlan (modLoaders: typing.List[_Loader]) -> None:
+	try:
+		fingerprintPaths = list()  # type: typing.List[str]
+
+		for modLoader in modLoaders:  # type: _Loader
+			fingerprintPaths.append(modLoader.Mod.InformationFilePath)
+			fingerprintPaths.extend(modLoader.Mod.ScriptPaths)
+
+		loadPlan = {
+			"Version": _loadPlanFormatVersion,
+			"Fingerprint": _GetLoadPlanFingerprint(fingerprintPaths),
+			"Mods": [[modLoader.Mod.Namespace, modLoader.Mod.InformationFilePath, modLoader._GetInformationState()] for modLoader in modLoaders],
+			"Verdicts": [list(installationVerdict) for installationVerdict in _installationVerdicts],
+			"Prerequisites": { modNamespace: sorted(modPrerequisites) for modNamespace, modPrerequisites in _loadOrderGraph.Prerequisites.items() },
+			"Cycles": sorted(_loadOrderGraph.CyclicNamespaces)
+		}  # type: dict
+
+		loadPlanDirectory = os.path.dirname(_loadPlanFilePath)  # type: str
+
+		if not os.path.exists(loadPlanDirectory):
+			os.makedirs(loadPlanDirectory)
+
+		with open(_loadPlanFilePath, "w+") as loadPlanFile:
+			loadPlanFile.write(json.JSONEncoder(separators = (",", ":")).encode(loadPlan))
+	except Exception:
+		Debug.Log("Failed to write the load plan file to '" + Paths.StripUserDataPath(_loadPlanFilePath) + "'.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+def _GetLoadPlanFingerprint (paths: typing.List[str]) -> typing.Dict[str, typing.Optional[typing.List[int]]]:
+	fingerprint = dict()  # type: typing.Dict[str, typing.Optional[typing.List[int]]]
+
+	for path in paths:  # type: str
+		try:
+			pathStatus = os.stat(path)  # type: os.stat_result
+			fingerprint[path] = [pathStatus.st_size, pathStatus.st_mtime_ns]
+		except OSError:
+			fingerprint[path] = None
+
+	return fingerprint
+
+def _ReadAllInformation (modLoaders: typing.List[_Loader]) -> typing.List[_InformationReading]:
+	# Reading is mostly waiting on the disk, so each file is read on a worker thread. Results are returned in the same order as the loaders, letting
+	# them be committed to the mod objects in a predictable order.
+
+	if len(modLoaders) <= 1:
+		return [_ReadInformationFileTimed(modLoader) for modLoader in modLoaders]
+
+	try:
+		with futures.ThreadPoolExecutor(max_workers = min(_informationReadingWorkerLimit, len(modLoaders))) as readingExecutor:
+			return list(readingExecutor.map(_ReadInformationFileTimed, modLoaders))
+	except Exception:
+		Debug.Log("Failed to read mod information files in parallel, falling back to reading them one at a time.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+		return [_ReadInformationFileTimed(modLoader) for modLoader in modLoaders]
+
+def _ReadInformationFileTimed (modLoader: _Loader) -> _InformationReading:
+	with Tracing.Span("Read information", "Loading", { "Mod": modLoader.Mod.Namespace }):
+		readStartTime = time.perf_counter_ns()  # type: int
+		informationReading = modLoader.ReadInformationFile()  # type: _InformationReading
+		informationReading.ReadDuration = time.perf_counter_ns() - readStartTime
+
+	return informationReading
 
-	for fileInfo in archive.filelist:  # type: zipfile.ZipInfo
-		if fileInfo.filename[-1] != "/":
-			path, extension = os.path.splitext(fileInfo.filename)  # type: str, str
+def _LoadLoop (unsafeAllowed: bool = False) -> None:
+	global _inLoadLoop, _activeScheduler
 
-			if extension.lower() == ".pyc":
-				moduleName = path.replace("/", ".").replace("\\", ".")  # type: str
+	if _inLoadLoop:
+		raise Exception("Cannot start a load loop from inside another load loop.")
 
-				if moduleName.endswith(".__init__"):
-					moduleName = moduleName[:-len(".__init__")]
+	loadableLoaders = [
+		modLoader for modLoader in _allLoaders if \
+		modLoader.Mod.IsLoadable(This.Mod.Namespace) and \
+		modLoader.Mod.RequiredModsInstalled() and \
+		not modLoader.Mod.IncompatibleModsInstalled()
+	]
 
-				modules.append(moduleName)
+	if len(loadableLoaders) == 0:
+		return
 
-	archive.close()
+	_inLoadLoop = True
+	_activeScheduler = _LoadScheduler(loadableLoaders, unsafeAllowed)
 
-	return modules
+	try:
+		with Tracing.Span("Load loop", "Loading"):
+			_activeScheduler.Run()
+	finally:
+		_activeScheduler = None
+		_inLoadLoop = False
+
+def _Import (namespace: str, modules: list) -> None:
+	importer = custom_import.CustomLoader(_Importer())  # type: custom_import.CustomLoader
+
+	for module in modules:  # type: str
+		importStartTime = time.perf_counter_ns()  # type: int
+
+		try:
+			with Tracing.Span("Import " + module, "Loading", { "Mod": namespace }):
+				if module.endswith(".__init__"):
+					importer.load_module(module[:-len(".__init__")])
+				else:
+					importer.load_module(module)
+		finally:
+			# The time taken includes any other modules imported by this one that weren't already.
+			LoadingTimings.Record(namespace, LoadingTimings.ImportOperation, time.perf_counter_ns() - importStartTime, module = module)
+
+def _GetArchiveModules (archivePath: str) -> typing.List[str]:
+	return Archives.GetArchiveModules(archivePath)
 
 def _PatchOnLoadingScreenAnimationFinished ():
 	originalFunction = zone.Zone.on_loading_screen_animation_finished  # type: typing.Callable
 
 	@functools.wraps(originalFunction)
 	def PatchedOnLoadingScreenAnimationFinished (*args, **kwargs):
-		global _failedLoadingMods, _invalidSetupMods, _cascadeFailureMods, _showedNotLoadedFailureNotification
+		global _failedLoadingMods, _invalidSetupMods, _cascadeFailureMods, _showedNotLoadedFailureNotification, _wroteLoadingTimings
 
 		originalFunction(*args, **kwargs)
 
 		from sims4 import log
 
+		if not _wroteLoadingTimings:
+			# Every load loop has finished by the time the first loading screen is done, the report only needs to be written once.
+			_wroteLoadingTimings = True
+
+			try:
+				LoadingTimings.WriteReport()
+			except Exception as e:
+				log.exception(This.Mod.Namespace, "Failed to write the loading timings report.", exc = e, owner = __name__)
+
+		if Tracing.Enabled:
+			try:
+				Tracing.Dump()
+			except Exception as e:
+				log.exception(This.Mod.Namespace, "Failed to write the startup trace.", exc = e, owner = __name__)
+
 		try:
 			if len(_failedLoadingMods) != 0:
 				_WarnOfLoadingFailure()
@@ -1033,6 +1501,21 @@ def _PatchOnLoadingScreenAnimationFinished ():
 
 	zone.Zone.on_loading_screen_animation_finished = PatchedOnLoadingScreenAnimationFinished
 
+def _BuildLoadOrderGraph () -> None:
+	global _loadOrderGraph
+
+	_loadOrderGraph = _LoadOrderGraph(Mods.GetAllModsByNamespace())
+
+	loadableNamespaces = { modLoader.Mod.Namespace for modLoader in _allLoaders if modLoader.Mod.IsLoadable(This.Mod.Namespace) }  # type: typing.Set[str]
+	_loadOrderGraph.CyclicNamespaces = _loadOrderGraph.FindCycles(loadableNamespaces)
+
+	_LogLoadOrderCycles()
+
+def _LogLoadOrderCycles () -> None:
+	if len(_loadOrderGraph.CyclicNamespaces) != 0:
+		Debug.Log("Found a load order cycle between the mods '%s', these mods cannot be safely loaded." % "', '".join(sorted(_loadOrderGraph.CyclicNamespaces)),
+				  This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
 def _CheckInstallation () -> None:
 	for modLoader in _allLoaders:  # type: _Loader
 		if not modLoader.Mod.IsLoadable(This.Mod.Namespace):
@@ -1042,58 +1525,75 @@ def _CheckInstallation () -> None:
 			continue
 
 		if not modLoader.Mod.RequiredModsInstalled():
-			Debug.Log("One or more required mod for '%s' is not installed." % modLoader.Mod.Namespace, This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
-			modLoader.Disable(cascade = False, warningList = _invalidSetupMods)
+			_DisableForInstallation(modLoader, "One or more required mod for '%s' is not installed." % modLoader.Mod.Namespace, "InvalidSetup")
 			continue
 
 		if modLoader.Mod.IncompatibleModsInstalled():
-			Debug.Log("One or more incompatible mod for '%s' is installed." % modLoader.Mod.Namespace, This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
-			modLoader.Disable(cascade = False, warningList = _invalidSetupMods)
+			_DisableForInstallation(modLoader, "One or more incompatible mod for '%s' is installed." % modLoader.Mod.Namespace, "InvalidSetup")
 			continue
 
 		for modCompatibility in modLoader.Mod.Compatibility:  # type: Mods.Compatibility
 			if modCompatibility.LowestVersion is None and modCompatibility.HighestVersion is None:
 				continue
 
-			for checkingModLoader in _allLoaders:  # type: _Loader
-				if not checkingModLoader.Mod.ReadInformation:
-					continue
-
-				if checkingModLoader.Mod.Namespace == modCompatibility.Namespace:
-					if modCompatibility.LowestVersion is not None and modCompatibility.LowestVersion > checkingModLoader.Mod.Version:
-						Debug.Log("Mod '%s' (%s) is too old for the mod '%s' (%s)." % (checkingModLoader.Mod.Namespace, str(checkingModLoader.Mod.Version), modLoader.Mod.Namespace, str(modLoader.Mod.Version)),
-								  This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+			checkingModLoader = _loadersByNamespace.get(modCompatibility.Namespace, None)  # type: typing.Optional[_Loader]
 
-						modLoader.Disable(cascade = False, warningList = _invalidSetupMods)
-						return
-
-					if modCompatibility.HighestVersion is not None and modCompatibility.HighestVersion < checkingModLoader.Mod.Version:
-						Debug.Log("Mod '%s' (%s) is too new for the mod '%s' (%s)." % (checkingModLoader.Mod.Namespace, str(checkingModLoader.Mod.Version), modLoader.Mod.Namespace, str(modLoader.Mod.Version)),
-								  This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+			if checkingModLoader is None or not checkingModLoader.Mod.ReadInformation:
+				continue
 
-						modLoader.Disable(cascade = False, warningList = _invalidSetupMods)
-						return
+			if modCompatibility.LowestVersion is not None and modCompatibility.LowestVersion > checkingModLoader.Mod.Version:
+				_DisableForInstallation(modLoader, "Mod '%s' (%s) is too old for the mod '%s' (%s)." % (checkingModLoader.Mod.Namespace, str(checkingModLoader.Mod.Version), modLoader.Mod.Namespace, str(modLoader.Mod.Version)), "InvalidSetup")
+				break
 
-					break
+			if modCompatibility.HighestVersion is not None and modCompatibility.HighestVersion < checkingModLoader.Mod.Version:
+				_DisableForInstallation(modLoader, "Mod '%s' (%s) is too new for the mod '%s' (%s)." % (checkingModLoader.Mod.Namespace, str(checkingModLoader.Mod.Version), modLoader.Mod.Namespace, str(modLoader.Mod.Version)), "InvalidSetup")
+				break
 
 	_CheckInstallationLoop()
 
 def _CheckInstallationLoop () -> None:
-	for modLoader in _allLoaders:  # type: _Loader
-		if not modLoader.Mod.IsLoadable(This.Mod.Namespace):
-			continue
+	# Starting from every mod that cannot be loaded, walk down the dependents index disabling any mod that requires one of them. Each disabled mod is
+	# then checked the same way, so every mod is visited at most once.
+	unloadableNamespaces = [modLoader.Mod.Namespace for modLoader in _allLoaders if not modLoader.Mod.IsLoadable(This.Mod.Namespace)]  # type: typing.List[str]
 
-		if not modLoader.Mod.ReadInformation:
-			continue
+	unloadableIndex = 0  # type: int
+
+	while unloadableIndex < len(unloadableNamespaces):
+		unloadableNamespace = unloadableNamespaces[unloadableIndex]  # type: str
+		unloadableIndex += 1
+
+		for dependentNamespace in _GetDependents(unloadableNamespace):  # type: str
+			dependentLoader = _loadersByNamespace[dependentNamespace]  # type: _Loader
+
+			if not dependentLoader.Mod.IsLoadable(This.Mod.Namespace):
+				continue
+
+			if not dependentLoader.Mod.ReadInformation:
+				continue
+
+			_DisableForInstallation(dependentLoader, "The mod '%s' is required for '%s' but is not loadable." % (unloadableNamespace, dependentNamespace), "CascadeFailure")
+			unloadableNamespaces.append(dependentNamespace)
+
+def _DisableForInstallation (modLoader: _Loader, message: str, warningListName: str) -> None:
+	# Every mod disabled while checking the installation is recorded, letting the same verdicts be repeated from a load plan.
+
+	Debug.Log(message, This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
 
-		for requiredModNamespace in modLoader.Mod.RequiredMods:  # type: str
-			for checkingModLoader in _allLoaders:  # type: _Loader
-				if checkingModLoader.Mod.Namespace == requiredModNamespace:
-					if not checkingModLoader.Mod.IsLoadable(This.Mod.Namespace):
-						Debug.Log("The mod '%s' is required for '%s' but is not loadable." % (requiredModNamespace, modLoader.Mod.Namespace), This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
-						modLoader.Disable(cascade = False, warningList = _cascadeFailureMods)
-						_CheckInstallationLoop()
-						return
+	if warningListName == "InvalidSetup":
+		modLoader.Disable(cascade = False, warningList = _invalidSetupMods)
+	elif warningListName == "CascadeFailure":
+		modLoader.Disable(cascade = False, warningList = _cascadeFailureMods)
+	else:
+		raise ValueError("'" + warningListName + "' is not a known warning list.")
+
+	_installationVerdicts.append((modLoader.Mod.Namespace, message, warningListName))
+
+def _GetDependents (namespace: str) -> typing.List[str]:
+	"""
+	Get the namespaces of every mod with read information that lists this mod as a required mod, in the order they were registered.
+	"""
+
+	return _dependentsByNamespace.get(namespace, list())
 
 def _WarnOfLoadingFailure () -> None:
 	badMods = ""
@@ -1196,9 +1696,18 @@ def _WarnOfNotLoadedFailure () -> None:
 
 # noinspection PyUnusedLocal
 def _ModLoadedCallback (owner, eventArguments: LoadingEvents.ModLoadedEventArguments) -> None:
+	readyMods = Mods.NotifyModLoaded(eventArguments.Mod.Namespace)  # type: typing.List[Mods.Mod]
+
+	if _activeScheduler is not None:
+		_activeScheduler.NotifyLoaded(eventArguments.Mod.Namespace, readyMods)
+
 	if not LoadingAll() and _autoLoad:
 		LoadAll()
 
+# noinspection PyUnusedLocal
+def _ModUnloadedCallback (owner, eventArguments: LoadingEvents.ModUnloadedEventArguments) -> None:
+	Mods.NotifyModUnloaded(eventArguments.Mod.Namespace)
+
 def _OnExitCallback () -> None:
 	for mod in _allLoaders:  # type: _Loader
 		try:
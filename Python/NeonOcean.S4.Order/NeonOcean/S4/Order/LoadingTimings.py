@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import typing
+
+from NeonOcean.S4.Order import Debug, Paths, This
+from NeonOcean.S4.Order.Tools import Exceptions
+
+ReadInformationOperation = "ReadInformation"  # type: str
+VerifyInformationOperation = "VerifyInformation"  # type: str
+ImportOperation = "Import"  # type: str
+
+_timings = list()  # type: typing.List[Timing]
+_timingsLock = threading.Lock()  # type: threading.Lock
+
+class Timing:
+	def __init__ (self, namespace: str, operation: str, duration: int, module: typing.Optional[str] = None):
+		"""
+		The time taken by one step of loading or unloading a mod.
+
+		:param namespace: The namespace of the mod the step was for.
+		:type namespace: str
+		:param operation: The step that was timed, either one of the operations in this module or the name of a module hook such as '_OnInitiate'.
+		:type operation: str
+		:param duration: The time the step took, in nanoseconds. This should be measured with time.perf_counter_ns.
+		:type duration: int
+		:param module: The module the step was for, if it was for a single module.
+		:type module: typing.Optional[str]
+		"""
+
+		self.Namespace = namespace  # type: str
+		self.Operation = operation  # type: str
+		self.Duration = duration  # type: int
+		self.Module = module  # type: typing.Optional[str]
+
+def Record (namespace: str, operation: str, duration: int, module: typing.Optional[str] = None) -> None:
+	"""
+	Record the time taken by one step of loading or unloading a mod. This is safe to call from any thread.
+
+	:param namespace: The namespace of the mod the step was for.
+	:type namespace: str
+	:param operation: The step that was timed, either one of the operations in this module or the name of a module hook such as '_OnInitiate'.
+	:type operation: str
+	:param duration: The time the step took, in nanoseconds. This should be measured with time.perf_counter_ns.
+	:type duration: int
+	:param module: The module the step was for, if it was for a single module.
+	:type module: typing.Optional[str]
+	"""
+
+	if not isinstance(namespace, str):
+		raise Exceptions.IncorrectTypeException(namespace, "namespace", (str,))
+
+	if not isinstance(operation, str):
+		raise Exceptions.IncorrectTypeException(operation, "operation", (str,))
+
+	if not isinstance(duration, int):
+		raise Exceptions.IncorrectTypeException(duration, "duration", (int,))
+
+	if not isinstance(module, str) and module is not None:
+		raise Exceptions.IncorrectTypeException(module, "module", (str, "None"))
+
+	with _timingsLock:
+		_timings.append(Timing(namespace, operation, duration, module = module))
+
+def GetTimings () -> typing.List[Timing]:
+	"""
+	Get every timing recorded so far, in the order they were recorded.
+	"""
+
+	with _timingsLock:
+		return list(_timings)
+
+def GetReport () -> dict:
+	"""
+	Get the recorded timings organized by mod. Each mod lists the total time taken, the time taken by each operation and each module step,
+	slowest first. All times are in nanoseconds.
+	"""
+
+	modReports = dict()  # type: typing.Dict[str, dict]
+
+	for timing in GetTimings():  # type: Timing
+		modReport = modReports.get(timing.Namespace, None)  # type: typing.Optional[dict]
+
+		if modReport is None:
+			modReport = { "Total": 0, "Operations": dict(), "Modules": list() }
+			modReports[timing.Namespace] = modReport
+
+		modReport["Total"] += timing.Duration
+		modReport["Operations"][timing.Operation] = modReport["Operations"].get(timing.Operation, 0) + timing.Duration
+
+		if timing.Module is not None:
+			modReport["Modules"].append({ "Module": timing.Module, "Operation": timing.Operation, "Duration": timing.Duration })
+
+	for modReport in modReports.values():  # type: dict
+		modReport["Modules"].sort(key = lambda moduleTiming: moduleTiming["Duration"], reverse = True)
+
+	return {
+		"Total": sum(modReport["Total"] for modReport in modReports.values()),
+		"Mods": dict(sorted(modReports.items(), key = lambda modReportItem: modReportItem[1]["Total"], reverse = True))
+	}
+
+def GetReportText (moduleLimit: int = 5) -> str:
+	"""
+	Get a readable summary of the recorded timings, listing every mod from slowest to fastest.
+
+	:param moduleLimit: The number of module steps to list for each mod, the slowest ones are listed.
+	:type moduleLimit: int
+	"""
+
+	if not isinstance(moduleLimit, int):
+		raise Exceptions.IncorrectTypeException(moduleLimit, "moduleLimit", (int,))
+
+	report = GetReport()  # type: dict
+
+	reportText = "Total: %s" % _FormatDuration(report["Total"])  # type: str
+
+	for modNamespace, modReport in report["Mods"].items():  # type: str, dict
+		reportText += "\n%s: %s" % (modNamespace, _FormatDuration(modReport["Total"]))
+
+		for operation, operationDuration in modReport["Operations"].items():  # type: str, int
+			reportText += "\n\t%s: %s" % (operation, _FormatDuration(operationDuration))
+
+		for moduleTiming in modReport["Modules"][:moduleLimit]:  # type: dict
+			reportText += "\n\t\t%s %s: %s" % (moduleTiming["Module"], moduleTiming["Operation"], _FormatDuration(moduleTiming["Duration"]))
+
+	return reportText
+
+def WriteReport () -> None:
+	"""
+	Write the timing report to the current log directory of this mod as 'Timings.json'.
+	"""
+
+	activeLogger = Debug.ActiveLogger()  # type: Debug.Logger
+	reportFilePath = os.path.join(activeLogger.GetLoggingRootPath(), This.Mod.Namespace, activeLogger.GetLoggingDirectoryName(), "Timings.json")  # type: str
+
+	try:
+		reportDirectory = os.path.dirname(reportFilePath)  # type: str
+
+		if not os.path.exists(reportDirectory):
+			os.makedirs(reportDirectory)
+
+		with open(reportFilePath, "w+") as reportFile:
+			reportFile.write(json.JSONEncoder(indent = "\t").encode(GetReport()))
+	except Exception:
+		Debug.Log("Failed to write the loading timings report to '" + Paths.StripUserDataPath(reportFilePath) + "'.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+def _FormatDuration (duration: int) -> str:
+	return "%.3f ms" % (duration / 1000000)
@@ -2,15 +2,35 @@ from __future__ import annotations
 
 import datetime
 import enum_lib
+import inspect
 import json
 import os
+import sys
+import types
 import typing
 
-from NeonOcean.S4.Order import Information, Paths
+from NeonOcean.S4.Order import ModsDirectory, Paths, Tracing
 from NeonOcean.S4.Order.Tools import Exceptions, Version
 from sims4 import log
 
 _allMods = dict()  # type: typing.Dict[str, Mod]
+_allModsVersion = 0  # type: int
+
+_prerequisiteDependents = dict()  # type: typing.Dict[str, typing.List[Mod]]
+
+# Every function a mod's modules can define to be notified of an event, paired with the number of parameters the function needs to take.
+ModuleHookParameterCounts = {
+	"_OnInitiate": 1,
+	"_OnInitiateLate": 1,
+	"_OnStart": 1,
+	"_OnStartLate": 1,
+	"_OnStopEarly": 1,
+	"_OnStop": 1,
+	"_OnUnloadEarly": 1,
+	"_OnUnload": 1,
+	"_OnReset": 0,
+	"_OnResetSettings": 0
+}  # type: typing.Dict[str, int]
 
 class Mod:
 	def __init__ (self, namespace: str, name: str, loadController: str, informationFilePath: str):
@@ -58,6 +78,7 @@ class Mod:
 
 		self.ScriptPaths = list()  # type: typing.List[str]
 		self.Modules = list()  # type: typing.List[str]
+		self.ModuleHooks = None  # type: typing.Optional[typing.Dict[str, typing.List[typing.Tuple[str, types.FunctionType]]]]
 
 		self.RequiredMods = set()  # type: typing.Set[str]
 		self.IncompatibleMods = set()  # type: typing.Set[str]
@@ -65,6 +86,12 @@ class Mod:
 		self.LoadBefore = set()  # type: typing.Set[str]
 		self.Compatibility = list()  # type: typing.List[Compatibility]
 
+		self.PrerequisiteMods = None  # type: typing.Optional[typing.Set[str]]
+		self._unloadedPrerequisiteMods = set()  # type: typing.Set[str]
+
+		self._requiredModsInstalled = None  # type: typing.Optional[typing.Tuple[int, bool]]
+		self._incompatibleModsInstalled = None  # type: typing.Optional[typing.Tuple[int, bool]]
+
 		self.BuildDate = None  # type: typing.Optional[datetime.datetime]
 		self.BuildGameVersion = None  # type: typing.Optional[Version.Version]
 
@@ -163,46 +190,118 @@ class Mod:
 		return self.IsUnloadable(hostNamespace) and \
 			   self.Imported
 
+	def ResolveModuleHooks (self) -> None:
+		"""
+		Find the hook functions in each of this mod's imported modules and store them in the module hooks table. Functions that don't take the
+		number of parameters expected of that hook are left out. This should be called again if the mod's modules are re-imported.
+		"""
+
+		moduleHooks = { hookName: list() for hookName in ModuleHookParameterCounts.keys() }  # type: typing.Dict[str, typing.List[typing.Tuple[str, types.FunctionType]]]
+
+		for module in self.Modules:  # type: str
+			moduleObject = sys.modules.get(module, None)  # type: typing.Optional[types.ModuleType]
+
+			if moduleObject is None:
+				continue
+
+			for hookName, hookParameterCount in ModuleHookParameterCounts.items():  # type: str, int
+				hook = getattr(moduleObject, hookName, None)  # type: typing.Optional[typing.Callable]
+
+				if not isinstance(hook, types.FunctionType):
+					continue
+
+				if len(inspect.signature(hook).parameters) != hookParameterCount:
+					continue
+
+				moduleHooks[hookName].append((module, hook))
+
+		self.ModuleHooks = moduleHooks
+
+	def GetModuleHooks (self, hookName: str) -> typing.List[typing.Tuple[str, types.FunctionType]]:
+		"""
+		Get every valid function with this hook name in this mod's modules, paired with the name of the module it is in. The functions are listed in the
+		same order as the mod's modules. The module hooks table will be resolved if it hasn't been already.
+		:param hookName: The name of the hook, such as '_OnStart' or '_OnReset'.
+		:type hookName: str
+		"""
+
+		if not isinstance(hookName, str):
+			raise Exceptions.IncorrectTypeException(hookName, "hookName", (str,))
+
+		if not hookName in ModuleHookParameterCounts:
+			raise ValueError("'" + hookName + "' is not a known module hook.")
+
+		if self.ModuleHooks is None:
+			self.ResolveModuleHooks()
+
+		return self.ModuleHooks[hookName]
+
 	def RequiredModsInstalled (self) -> bool:
 		"""
-		Whether or not all required mod are installed.
+		Whether or not all required mod are installed. The result is kept until another mod is registered or the cached checks are cleared.
 		"""
 
+		if self._requiredModsInstalled is not None and self._requiredModsInstalled[0] == _allModsVersion:
+			return self._requiredModsInstalled[1]
+
+		requiredModsInstalled = True  # type: bool
+
 		for requiredModNamespace in self.RequiredMods:  # type: str
 			if not IsInstalled(requiredModNamespace):
-				return False
+				requiredModsInstalled = False
+				break
 
-		return True
+		self._requiredModsInstalled = (_allModsVersion, requiredModsInstalled)
+		return requiredModsInstalled
 
 	def IncompatibleModsInstalled (self) -> bool:
 		"""
-		Whether or not a mod is installed that is completely incompatible with this one.
+		Whether or not a mod is installed that is completely incompatible with this one. The result is kept until another mod is registered or the
+		cached checks are cleared.
 		"""
 
+		if self._incompatibleModsInstalled is not None and self._incompatibleModsInstalled[0] == _allModsVersion:
+			return self._incompatibleModsInstalled[1]
+
+		incompatibleModsInstalled = False  # type: bool
+
 		for incompatibleModNamespace in self.IncompatibleMods:  # type: str
 			if IsInstalled(incompatibleModNamespace):
-				return True
+				incompatibleModsInstalled = True
+				break
 
-		return False
+		self._incompatibleModsInstalled = (_allModsVersion, incompatibleModsInstalled)
+		return incompatibleModsInstalled
 
 	def PrerequisiteModsLoaded (self) -> bool:
 		"""
-		Whether or not the mods meant to be loaded before this one are loaded.
+		Whether or not the mods meant to be loaded before this one are loaded. Prerequisites are only known once the loading module has built its load
+		order graph and passed it to 'UpdatePrerequisiteMods', before then this will always be False.
 		"""
 
-		for testingModNamespace, testingMod in GetAllModsByNamespace().items():  # type: str, Mod
-			if len(testingMod.ScriptPaths) == 0:
-				continue
+		if self.PrerequisiteMods is None:
+			return False
+
+		return len(self._unloadedPrerequisiteMods) == 0
+
+	def GetUnloadedPrerequisiteCount (self) -> typing.Optional[int]:
+		"""
+		Get the number of mods meant to be loaded before this one that are not loaded. This will be None until the prerequisites are given to
+		'UpdatePrerequisiteMods'.
+		"""
+
+		if self.PrerequisiteMods is None:
+			return None
 
-			if testingModNamespace in self.LoadAfter:
-				if not testingMod.IsLoaded():
-					return False
+		return len(self._unloadedPrerequisiteMods)
 
-			if self.Namespace in testingMod.LoadBefore:
-				if not testingMod.IsLoaded():
-					return False
+	def ClearCachedChecks (self) -> None:
+		"""
+		Forget the stored results of the required and incompatible mod checks. This should be called whenever this mod's information changes.
+		"""
 
-		return True
+		self._requiredModsInstalled = None
+		self._incompatibleModsInstalled = None
 
 class Compatibility:
 	def __init__ (self, namespace: str, lowestVersion: typing.Optional[Version.Version], highestVersion: typing.Optional[Version.Version]):
@@ -252,7 +351,10 @@ def RegisterMod (mod: Mod) -> None:
 	if mod.Namespace in _allMods:
 		raise Exception("A mod with the namespace '" + mod.Namespace + " is already registered.")
 
+	global _allModsVersion
+
 	_allMods[mod.Namespace] = mod
+	_allModsVersion += 1
 
 def GetMod (namespace: str) -> Mod:
 	"""
@@ -303,37 +405,96 @@ def IsInstalled (namespace: str) -> bool:
 
 	return _allMods.get(namespace, None) is not None
 
-def _Setup () -> None:
-	for directoryRoot, directoryNames, fileNames in os.walk(Paths.ModsPath):  # type: str, list, list
-		for fileName in fileNames:  # type: str
-			fileNameLower = fileName.lower()  # type: str
+def UpdatePrerequisiteMods (prerequisites: typing.Dict[str, typing.Set[str]]) -> None:
+	"""
+	Start tracking how many of each mod's prerequisites are not yet loaded. After this, 'NotifyModLoaded' and 'NotifyModUnloaded' need to be called as
+	mods are loaded and unloaded.
+	:param prerequisites: The namespaces of the mods that need to be loaded before each mod, listed by the namespace of that mod. These should come from the
+	loading module's load order graph, so that this and the load scheduler agree on what a prerequisite is. Mods missing from this have no prerequisites.
+	:type prerequisites: typing.Dict[str, typing.Set[str]]
+	"""
+
+	_prerequisiteDependents.clear()
+
+	for modNamespace, mod in _allMods.items():  # type: str, Mod
+		prerequisiteMods = { prerequisiteNamespace for prerequisiteNamespace in prerequisites.get(modNamespace, set()) if prerequisiteNamespace in _allMods }  # type: typing.Set[str]
+
+		mod.PrerequisiteMods = prerequisiteMods
+		mod._unloadedPrerequisiteMods = { prerequisiteNamespace for prerequisiteNamespace in prerequisiteMods if not _allMods[prerequisiteNamespace].IsLoaded() }
+
+		for prerequisiteNamespace in prerequisiteMods:  # type: str
+			prerequisiteDependents = _prerequisiteDependents.get(prerequisiteNamespace, None)  # type: typing.Optional[typing.List[Mod]]
+
+			if prerequisiteDependents is None:
+				_prerequisiteDependents[prerequisiteNamespace] = [mod]
+			else:
+				prerequisiteDependents.append(mod)
+
+def NotifyModLoaded (namespace: str) -> typing.List[Mod]:
+	"""
+	Tell every mod meant to be loaded after this one that it has been loaded.
+	:param namespace: The namespace of the mod that was loaded.
+	:type namespace: str
+	:return: The mods this was the last unloaded prerequisite of, every one of their prerequisites is now loaded.
+	:rtype: typing.List[Mod]
+	"""
+
+	if not isinstance(namespace, str):
+		raise Exceptions.IncorrectTypeException(namespace, "namespace", (str,))
+
+	readyMods = list()  # type: typing.List[Mod]
+
+	for dependentMod in _prerequisiteDependents.get(namespace, list()):  # type: Mod
+		if not namespace in dependentMod._unloadedPrerequisiteMods:
+			continue
+
+		dependentMod._unloadedPrerequisiteMods.discard(namespace)
+
+		if len(dependentMod._unloadedPrerequisiteMods) == 0:
+			readyMods.append(dependentMod)
+
+	return readyMods
 
-			modFilePath = os.path.join(directoryRoot, fileName)  # type: str
+def NotifyModUnloaded (namespace: str) -> None:
+	"""
+	Tell every mod meant to be loaded after this one that it has been unloaded.
+	:param namespace: The namespace of the mod that was unloaded.
+	:type namespace: str
+	"""
+
+	if not isinstance(namespace, str):
+		raise Exceptions.IncorrectTypeException(namespace, "namespace", (str,))
+
+	for dependentMod in _prerequisiteDependents.get(namespace, list()):  # type: Mod
+		dependentMod._unloadedPrerequisiteMods.add(namespace)
+
+def _Setup () -> None:
+	with Tracing.Span("Mods._Setup", "Mods"):
+		for modInformationFile in ModsDirectory.GetScan().ModInformationFiles:  # type: ModsDirectory.File
+			modFilePath = modInformationFile.Path  # type: str
 
-			if os.path.splitext(fileNameLower)[1] == ".json":
-				if (Information.RootNamespace + "-mod").lower() in fileNameLower:
-					try:
-						with open(modFilePath) as modFile:
-							modInformation = json.JSONDecoder().decode(modFile.read())  # type: dict
+			try:
+				with open(modFilePath) as modFile:
+					modInformation = json.JSONDecoder().decode(modFile.read())  # type: dict
 
-						modNamespace = modInformation["Namespace"]  # type: str
-						modName = modInformation["Name"]  # type: str
-						modLoadControl = modInformation.get("LoadController")  # type: typing.Optional[str]
+				modNamespace = modInformation["Namespace"]  # type: str
+				modName = modInformation["Name"]  # type: str
+				modLoadControl = modInformation.get("LoadController")  # type: typing.Optional[str]
 
-						duplicateMod = False  # type: bool
+				duplicateMod = False  # type: bool
 
-						for mod in _allMods.values():  # type: Mod
-							if modNamespace == mod.Namespace:
-								log.exception("NeonOcean", "Duplicate mod with the namespace '" + modNamespace + "' at: \n" + modFilePath, owner = __name__)
-								duplicateMod = True
+				for mod in _allMods.values():  # type: Mod
+					if modNamespace == mod.Namespace:
+						log.exception("NeonOcean", "Duplicate mod with the namespace '" + modNamespace + "' at: \n" + modFilePath, owner = __name__)
+						duplicateMod = True
 
-						if duplicateMod:
-							continue
+				if duplicateMod:
+					continue
 
-						mod = Mod(modNamespace, modName, modLoadControl, modFilePath)
-						RegisterMod(mod)
+				mod = Mod(modNamespace, modName, modLoadControl, modFilePath)
+				RegisterMod(mod)
 
-					except Exception as e:
-						log.exception("NeonOcean", "Failed to read basic data from mod information dictionary at: \n" + modFilePath, exc = e, owner = __name__)
+			except Exception as e:
+				log.exception("NeonOcean", "Failed to read basic data from mod information dictionary at: \n" + modFilePath, exc = e, owner = __name__)
 
 _Setup()
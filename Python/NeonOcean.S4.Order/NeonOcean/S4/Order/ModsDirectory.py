@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import typing
+
+from NeonOcean.S4.Order import Information, Paths, Tracing
+from sims4 import log
+
+UseSnapshot = True  # type: bool
+
+_snapshotFilePath = os.path.join(Paths.PersistentPath, Information.GlobalNamespace, "ModsDirectory.json")  # type: str
+_snapshotFormatVersion = 1  # type: int
+
+_snapshotVersionKey = "Version"  # type: str
+_snapshotRootKey = "Root"  # type: str
+_snapshotTreeKey = "Tree"  # type: str
+
+_directoryModifiedKey = "Modified"  # type: str
+_directoryDirectoriesKey = "Directories"  # type: str
+_directoryFilesKey = "Files"  # type: str
+_directoryWalkedKey = "Walked"  # type: str
+
+_modInformationFileIdentifier = (Information.RootNamespace + "-mod").lower()  # type: str
+_loadOrderFileIdentifier = (Information.RootNamespace + "-load-order").lower()  # type: str
+
+_activeScan = None  # type: typing.Optional[Scan]
+_scanLock = threading.RLock()  # type: threading.RLock
+
+class File:
+	def __init__ (self, name: str, path: str, size: typing.Optional[int]):
+		self.Name = name  # type: str
+		self.Path = path  # type: str
+		self.Size = size  # type: typing.Optional[int]
+
+class Directory:
+	def __init__ (self, name: str, path: str, modified: typing.Optional[int], walked: bool = True):
+		self.Name = name  # type: str
+		self.Path = path  # type: str
+		self.Modified = modified  # type: typing.Optional[int]
+		self.Walked = walked  # type: bool
+
+		self.Directories = list()  # type: typing.List[Directory]
+		self.Files = list()  # type: typing.List[File]
+
+class Scan:
+	"""
+	The contents of the mods directory, collected in a single pass. Directories are traversed in the same order os.walk would traverse them, a directory's files come
+	before the files in any of its sub directories.
+	"""
+
+	def __init__ (self, root: Directory):
+		self.Root = root  # type: Directory
+
+		self.ModInformationFiles = list()  # type: typing.List[File]
+		self.LoadOrderFiles = list()  # type: typing.List[File]
+
+		self.DirectoryCount = 0  # type: int
+		self.FileCount = 0  # type: int
+		self.ReusedDirectoryCount = 0  # type: int
+
+	def GetTreeString (self) -> str:
+		"""
+		Get a printable tree of every directory and file in the mods directory, including the size of each file.
+		"""
+
+		return self.Root.Name + " " + self._GetDirectoryTreeString(self.Root, 1)
+
+	def _GetDirectoryTreeString (self, directory: Directory, depth: int) -> str:
+		indention = "\t" * depth  # type: str
+
+		directoryString = ""  # type: str
+
+		for subDirectory in directory.Directories:  # type: Directory
+			directoryString += "\n" + indention + subDirectory.Name + " " + self._GetDirectoryTreeString(subDirectory, depth + 1)
+
+		for file in directory.Files:  # type: File
+			directoryString += "\n" + indention + file.Name + " (" + (str(file.Size) if file.Size is not None else "?") + " B)"
+
+		if len(directoryString) == 0:
+			directoryString = "\n"
+
+		directoryString += "\n"
+
+		return "{" + directoryString + "\t" * (depth - 1) + "}"
+
+def GetScan () -> Scan:
+	"""
+	Get the contents of the mods directory. The directory is only scanned the first time this is called, every later call will return the same object.
+
+	Directories whose modification time has not changed since the last game launch are not read again, their listing is taken from a snapshot saved the last time the
+	mods directory was scanned. Adding, removing or renaming a file changes the modification time of its directory, though rewriting a file in place does not, the file
+	sizes of unchanged directories may therefore be out of date.
+	"""
+
+	global _activeScan
+
+	with _scanLock:
+		if _activeScan is None:
+			with Tracing.Span("ModsDirectory.Scan", "Mods"):
+				_activeScan = _ScanModsDirectory()
+
+		return _activeScan
+
+def _ScanModsDirectory () -> Scan:
+	snapshotTree = _ReadSnapshot() if UseSnapshot else None  # type: typing.Optional[dict]
+
+	rootDirectory = Directory(os.path.split(Paths.ModsPath)[1], Paths.ModsPath, None)  # type: Directory
+	scan = Scan(rootDirectory)  # type: Scan
+
+	try:
+		rootDirectory.Modified = os.stat(Paths.ModsPath).st_mtime_ns
+	except OSError:
+		return scan
+
+	try:
+		newSnapshotTree = _ScanDirectory(scan, rootDirectory, snapshotTree)  # type: dict
+	except OSError:
+		# Like os.walk, a mods directory we cannot read is treated as empty.
+		return Scan(Directory(rootDirectory.Name, rootDirectory.Path, None, walked = False))
+
+	if UseSnapshot and scan.ReusedDirectoryCount != scan.DirectoryCount:
+		_WriteSnapshot(newSnapshotTree)
+
+	return scan
+
+def _ScanDirectory (scan: Scan, directory: Directory, snapshotDirectory: typing.Optional[dict]) -> dict:
+	scan.DirectoryCount += 1
+
+	subDirectoryEntries = list()  # type: typing.List[typing.Tuple[str, bool]]
+
+	if snapshotDirectory is not None and snapshotDirectory[_directoryModifiedKey] == directory.Modified:
+		scan.ReusedDirectoryCount += 1
+
+		for subDirectoryName, subDirectorySnapshot in snapshotDirectory[_directoryDirectoriesKey].items():  # type: str, dict
+			subDirectoryEntries.append((subDirectoryName, subDirectorySnapshot[_directoryWalkedKey]))
+
+		for fileName, fileSize in snapshotDirectory[_directoryFilesKey]:  # type: str, typing.Optional[int]
+			directory.Files.append(File(fileName, os.path.join(directory.Path, fileName), fileSize))
+	else:
+		snapshotDirectory = None
+
+		with os.scandir(directory.Path) as directoryIterator:
+			for directoryEntry in directoryIterator:  # type: os.DirEntry
+				try:
+					entryIsDirectory = directoryEntry.is_dir()  # type: bool
+				except OSError:
+					entryIsDirectory = False
+
+				if entryIsDirectory:
+					try:
+						entryWalked = not directoryEntry.is_symlink()  # type: bool
+					except OSError:
+						entryWalked = False
+
+					subDirectoryEntries.append((directoryEntry.name, entryWalked))
+				else:
+					try:
+						fileSize = directoryEntry.stat().st_size  # type: typing.Optional[int]
+					except OSError:
+						fileSize = None
+
+					directory.Files.append(File(directoryEntry.name, directoryEntry.path, fileSize))
+
+	for file in directory.Files:  # type: File
+		scan.FileCount += 1
+
+		fileNameLower = file.Name.lower()  # type: str
+
+		if os.path.splitext(fileNameLower)[1] == ".json":
+			if _modInformationFileIdentifier in fileNameLower:
+				scan.ModInformationFiles.append(file)
+
+			if _loadOrderFileIdentifier in fileNameLower:
+				scan.LoadOrderFiles.append(file)
+
+	directorySnapshot = {
+		_directoryModifiedKey: directory.Modified,
+		_directoryWalkedKey: directory.Walked,
+		_directoryDirectoriesKey: dict(),
+		_directoryFilesKey: [[file.Name, file.Size] for file in directory.Files]
+	}  # type: dict
+
+	for subDirectoryName, subDirectoryWalked in subDirectoryEntries:  # type: str, bool
+		subDirectoryPath = os.path.join(directory.Path, subDirectoryName)  # type: str
+		subDirectory = Directory(subDirectoryName, subDirectoryPath, None, walked = subDirectoryWalked)  # type: Directory
+		directory.Directories.append(subDirectory)
+
+		subDirectorySnapshot = None  # type: typing.Optional[dict]
+
+		if snapshotDirectory is not None:
+			subDirectorySnapshot = snapshotDirectory[_directoryDirectoriesKey].get(subDirectoryName, None)
+
+		# Directories that could not be read are remembered without a modification time, making sure they will be read again next time.
+		directorySnapshot[_directoryDirectoriesKey][subDirectoryName] = {
+			_directoryModifiedKey: None,
+			_directoryWalkedKey: subDirectoryWalked,
+			_directoryDirectoriesKey: dict(),
+			_directoryFilesKey: list()
+		}
+
+		if not subDirectoryWalked:
+			continue
+
+		try:
+			subDirectory.Modified = os.stat(subDirectoryPath).st_mtime_ns
+			directorySnapshot[_directoryDirectoriesKey][subDirectoryName] = _ScanDirectory(scan, subDirectory, subDirectorySnapshot)
+		except OSError:
+			# Like os.walk, we skip over any directory we cannot read.
+			subDirectory.Walked = False
+			subDirectory.Directories = list()
+			subDirectory.Files = list()
+
+	return directorySnapshot
+
+def _ReadSnapshot () -> typing.Optional[dict]:
+	if not os.path.exists(_snapshotFilePath):
+		return None
+
+	try:
+		with open(_snapshotFilePath) as snapshotFile:
+			snapshotDictionary = json.JSONDecoder().decode(snapshotFile.read())  # type: dict
+
+		if not isinstance(snapshotDictionary, dict):
+			raise Exception("The mods directory snapshot's root is not a dictionary.")
+
+		if snapshotDictionary.get(_snapshotVersionKey, None) != _snapshotFormatVersion:
+			return None
+
+		if snapshotDictionary.get(_snapshotRootKey, None) != Paths.ModsPath:
+			return None
+
+		snapshotTree = snapshotDictionary.get(_snapshotTreeKey, None)  # type: typing.Optional[dict]
+
+		if not _SnapshotDirectoryIsValid(snapshotTree):
+			raise Exception("The mods directory snapshot's tree is not valid.")
+
+		return snapshotTree
+	except Exception as e:
+		log.exception("NeonOcean", "Failed to read the mods directory snapshot at: \n" + _snapshotFilePath, exc = e, owner = __name__)
+		return None
+
+def _WriteSnapshot (snapshotTree: dict) -> None:
+	snapshotDictionary = {
+		_snapshotVersionKey: _snapshotFormatVersion,
+		_snapshotRootKey: Paths.ModsPath,
+		_snapshotTreeKey: snapshotTree
+	}
+
+	try:
+		snapshotDirectory = os.path.dirname(_snapshotFilePath)  # type: str
+
+		if not os.path.exists(snapshotDirectory):
+			os.makedirs(snapshotDirectory)
+
+		with open(_snapshotFilePath, "w+") as snapshotFile:
+			snapshotFile.write(json.JSONEncoder(separators = (",", ":")).encode(snapshotDictionary))
+	except Exception as e:
+		log.exception("NeonOcean", "Failed to write the mods directory snapshot to: \n" + _snapshotFilePath, exc = e, owner = __name__)
+
+def _SnapshotDirectoryIsValid (snapshotDirectory: typing.Any) -> bool:
+	if not isinstance(snapshotDirectory, dict):
+		return False
+
+	directoryModified = snapshotDirectory.get(_directoryModifiedKey, None)
+
+	if directoryModified is not None and not isinstance(directoryModified, int):
+		return False
+
+	if not isinstance(snapshotDirectory.get(_directoryWalkedKey, None), bool):
+		return False
+
+	directoryFiles = snapshotDirectory.get(_directoryFilesKey, None)
+
+	if not isinstance(directoryFiles, list):
+		return False
+
+	for directoryFile in directoryFiles:
+		if not isinstance(directoryFile, list) or len(directoryFile) != 2:
+			return False
+
+		if not isinstance(directoryFile[0], str) or (directoryFile[1] is not None and not isinstance(directoryFile[1], int)):
+			return False
+
+	directoryDirectories = snapshotDirectory.get(_directoryDirectoriesKey, None)
+
+	if not isinstance(directoryDirectories, dict):
+		return False
+
+	for subDirectorySnapshot in directoryDirectories.values():
+		if not _SnapshotDirectoryIsValid(subDirectorySnapshot):
+			return False
+
+	return True
@@ -1,8 +1,5 @@
 from __future__ import annotations
 
-import inspect
-import sys
-import types
 import typing
 
 from NeonOcean.S4.Order import Debug, Language, Mods, This
@@ -30,17 +27,8 @@ def ResetEverything (mod: Mods.Mod) -> bool:
 	"""
 
 	try:
-		for module in mod.Modules:  # type: str
-			OnReset = None  # type: typing.Optional[typing.Callable]
-
-			try:
-				OnReset = getattr(sys.modules[module], "_OnReset")
-			except Exception:
-				pass
-
-			if isinstance(OnReset, types.FunctionType):
-				if len(inspect.signature(OnReset).parameters) == 0:
-					OnReset()
+		for module, OnReset in mod.GetModuleHooks("_OnReset"):  # type: str, typing.Callable
+			OnReset()
 	except Exception as e:
 		Debug.Log("Failed to reset mod.", mod.Namespace, Debug.LogLevels.Exception, group = mod.Namespace, owner = __name__, exception = e)
 		return False
@@ -56,17 +44,8 @@ def ResetSettings (mod: Mods.Mod) -> bool:
 	"""
 
 	try:
-		for module in mod.Modules:  # type: str
-			OnReset = None  # type: typing.Optional[typing.Callable]
-
-			try:
-				OnReset = getattr(sys.modules[module], "_OnResetSettings")
-			except Exception:
-				pass
-
-			if isinstance(OnReset, types.FunctionType):
-				if len(inspect.signature(OnReset).parameters) == 0:
-					OnReset()
+		for module, OnReset in mod.GetModuleHooks("_OnResetSettings"):  # type: str, typing.Callable
+			OnReset()
 	except Exception as e:
 		Debug.Log("Failed to reset all settings.", mod.Namespace, Debug.LogLevels.Exception, group = mod.Namespace, owner = __name__, exception = e)
 		return False
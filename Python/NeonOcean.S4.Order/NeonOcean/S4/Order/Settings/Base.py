@@ -17,6 +17,8 @@ SettingsFilePath = os.path.join(This.Mod.PersistentPath, "Settings.json")  # typ
 SettingsPersistence = None  # type: typing.Optional[Persistence.PersistentFile]
 AllSettings = list()  # type: typing.List[typing.Type[Setting]]
 
+_settingsByKey = dict()  # type: typing.Dict[str, typing.Type[Setting]]
+
 _previousValues = dict()  # type: typing.Dict[str, typing.Any]
 
 _onUpdateWrapper = Events.EventHandler()  # type: Events.EventHandler
@@ -53,6 +55,7 @@ class Setting(AbstractSettings.SettingAbstract):
 		if cls.IsSetting:
 			cls.SetDefault()
 			AllSettings.append(cls)
+			_settingsByKey[cls.Key] = cls
 
 	@classmethod
 	def Setup (cls) -> None:
@@ -180,7 +183,7 @@ class Setting(AbstractSettings.SettingAbstract):
 
 		cls._overrides.append(_SettingOverride(value, overrideIdentifier, overridePriority, overrideReasonText))
 		cls._overrides.sort(key = lambda sortingOverride: sortingOverride.Priority, reverse = True)
-		Update()
+		_DispatchChanges({ cls.Key })
 
 	@classmethod
 	def RemoveOverride (cls, overrideIdentifier: str) -> None:
@@ -205,7 +208,7 @@ class Setting(AbstractSettings.SettingAbstract):
 		for overrideIndex in range(len(cls._overrides)):
 			if cls._overrides[overrideIndex].Identifier == overrideIdentifier:
 				cls._overrides.pop(overrideIndex)
-				Update()
+				_DispatchChanges({ cls.Key })
 				return
 
 	@classmethod
@@ -438,7 +441,7 @@ def _OnInitiate (cause: LoadingShared.LoadingCauses) -> None:
 		pass
 
 	if SettingsPersistence is None:
-		SettingsPersistence = Persistence.PersistentFile(SettingsFilePath, This.Mod.Version, hostNamespace = This.Mod.Namespace, alwaysSaveValues = True)
+		SettingsPersistence = Persistence.PersistentFile(SettingsFilePath, This.Mod.Version, hostNamespace = This.Mod.Namespace, alwaysSaveValues = True, frozenValues = True, writeBehind = True)
 
 		for setting in AllSettings:
 			setting.Setup()
@@ -446,7 +449,8 @@ def _OnInitiate (cause: LoadingShared.LoadingCauses) -> None:
 		SettingsPersistence.OnUpdate += _OnUpdateCallback
 		SettingsPersistence.OnLoad += _OnLoadCallback
 
-	Load()
+	# The settings file is read on another thread, the load is finished the first time a setting is used or the settings are saved.
+	SettingsPersistence.Preload()
 
 def _OnUnload (cause: LoadingShared.UnloadingCauses) -> None:
 	if cause:
@@ -505,30 +509,32 @@ def _InvokeOnLoadWrapperEvent () -> Events.EventArguments:
 
 	return eventArguments
 
-# noinspection PyUnusedLocal
-def _OnUpdateCallback (owner: Persistence.Persistent, eventArguments: Events.EventArguments) -> None:
-	global _previousValues
-
-	allSettings = GetAllSettings()  # type: typing.List[typing.Type[Setting]]
+def _DispatchChanges (possiblyChangedKeys: typing.Iterable[str]) -> None:
+	"""
+	Notify listeners of every setting among these keys whose value is different from the last time listeners were notified.
+	"""
 
-	currentValues = dict()  # type: typing.Dict[str, typing.Any]
 	changedSettings = set()  # type: typing.Set[str]
 
-	for setting in allSettings:  # type: typing.Type[Setting]
-		settingValue = setting.Get()  # type: typing.Any
-		currentValues[setting.Key] = settingValue
+	for settingKey in possiblyChangedKeys:  # type: str
+		setting = _settingsByKey.get(settingKey, None)  # type: typing.Optional[typing.Type[Setting]]
 
-		if not setting.Key in _previousValues:
-			changedSettings.add(setting.Key)
+		if setting is None or not setting.IsSetup():
 			continue
 
-		if _previousValues[setting.Key] != settingValue:
-			changedSettings.add(setting.Key)
+		settingValue = setting.Get()  # type: typing.Any
+
+		if not settingKey in _previousValues or _previousValues[settingKey] != settingValue:
+			changedSettings.add(settingKey)
 
-	_previousValues = currentValues
+		_previousValues[settingKey] = settingValue
 
 	_InvokeOnUpdateWrapperEvent(changedSettings)
 
+# noinspection PyUnusedLocal
+def _OnUpdateCallback (owner: Persistence.Persistent, eventArguments: Persistence.UpdateEventArguments) -> None:
+	_DispatchChanges(eventArguments.ChangedKeys)
+
 # noinspection PyUnusedLocal
 def _OnLoadCallback (owner: Persistence.Persistent, eventArguments: Events.EventArguments) -> None:
 	for setting in AllSettings:  # type: Setting
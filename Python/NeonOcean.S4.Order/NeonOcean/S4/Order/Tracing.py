@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import typing
+
+from NeonOcean.S4.Order import Paths
+
+Enabled = False  # type: bool
+
+EnableFilePath = os.path.join(Paths.DebugPath, "EnableTracing")  # type: str
+TraceFilePath = os.path.join(Paths.DebugPath, "trace.json")  # type: str
+
+EventLimit = 1000000  # type: int
+
+_events = list()  # type: typing.List[typing.Tuple[str, str, str, int, int, typing.Optional[dict]]]
+_startTime = time.perf_counter_ns()  # type: int
+_processIdentifier = os.getpid()  # type: int
+
+class _Span:
+	__slots__ = ("Name", "Category", "Arguments")
+
+	def __init__ (self, name: str, category: str, arguments: typing.Optional[dict]):
+		self.Name = name  # type: str
+		self.Category = category  # type: str
+		self.Arguments = arguments  # type: typing.Optional[dict]
+
+	def __enter__ (self):
+		Begin(self.Name, self.Category, self.Arguments)
+		return self
+
+	def __exit__ (self, exceptionType, exceptionValue, exceptionTraceback):
+		End(self.Name, self.Category)
+		return False
+
+class _DisabledSpan:
+	__slots__ = ()
+
+	def __enter__ (self):
+		return self
+
+	def __exit__ (self, exceptionType, exceptionValue, exceptionTraceback):
+		return False
+
+_disabledSpan = _DisabledSpan()  # type: _DisabledSpan
+
+def Span (name: str, category: str = "", arguments: typing.Optional[dict] = None) -> typing.Union[_Span, _DisabledSpan]:
+	"""
+	Get a context manager that records the beginning of a span when entered and its end when exited. When tracing is disabled a shared object that
+	does nothing is returned, building the name or arguments is the only cost left to the caller.
+	:param name: The name of the span, as it should appear in the trace viewer.
+	:type name: str
+	:param category: The category of the span, trace viewers can use this to filter spans.
+	:type category: str
+	:param arguments: Additional values to be shown with the span. These need to be convertible to json.
+	:type arguments: typing.Optional[dict]
+	"""
+
+	if not Enabled:
+		return _disabledSpan
+
+	return _Span(name, category, arguments)
+
+def Begin (name: str, category: str = "", arguments: typing.Optional[dict] = None) -> None:
+	"""
+	Record the beginning of a span on the current thread. Every call to this should be paired with a call to 'End' on the same thread.
+	"""
+
+	if not Enabled:
+		return
+
+	_AddEvent(name, category, "B", arguments)
+
+def End (name: str, category: str = "") -> None:
+	"""
+	Record the end of the last span begun on the current thread.
+	"""
+
+	if not Enabled:
+		return
+
+	_AddEvent(name, category, "E", None)
+
+def Instant (name: str, category: str = "", arguments: typing.Optional[dict] = None) -> None:
+	"""
+	Record a single point in time on the current thread.
+	"""
+
+	if not Enabled:
+		return
+
+	_AddEvent(name, category, "i", arguments)
+
+def Clear () -> None:
+	"""
+	Forget every event recorded so far.
+	"""
+
+	global _events
+
+	_events = list()
+
+def Dump (filePath: typing.Optional[str] = None) -> str:
+	"""
+	Write every event recorded so far to a file in the Chrome trace event format. These files can be opened with 'chrome://tracing' or with Perfetto.
+	:param filePath: The file the trace should be written to, this will default to 'trace.json' in the debug directory.
+	:type filePath: typing.Optional[str]
+	:return: The path of the file the trace was written to.
+	:rtype: str
+	"""
+
+	if filePath is None:
+		filePath = TraceFilePath
+
+	threadNames = { thread.ident: thread.name for thread in threading.enumerate() }  # type: typing.Dict[int, str]
+
+	traceEvents = list()  # type: typing.List[dict]
+
+	for threadIdentifier, threadName in threadNames.items():  # type: int, str
+		traceEvents.append({ "name": "thread_name", "ph": "M", "pid": _processIdentifier, "tid": threadIdentifier, "args": { "name": threadName } })
+
+	for eventName, eventCategory, eventPhase, eventTime, eventThread, eventArguments in list(_events):  # type: str, str, str, int, int, typing.Optional[dict]
+		traceEvent = {
+			"name": eventName,
+			"cat": eventCategory,
+			"ph": eventPhase,
+			"ts": eventTime / 1000,
+			"pid": _processIdentifier,
+			"tid": eventThread
+		}  # type: dict
+
+		if eventArguments is not None:
+			traceEvent["args"] = eventArguments
+
+		if eventPhase == "i":
+			traceEvent["s"] = "t"
+
+		traceEvents.append(traceEvent)
+
+	fileDirectory = os.path.dirname(filePath)  # type: str
+
+	if not os.path.exists(fileDirectory):
+		os.makedirs(fileDirectory)
+
+	with open(filePath, "w+") as traceFile:
+		traceFile.write(json.JSONEncoder(separators = (",", ":")).encode({ "traceEvents": traceEvents, "displayTimeUnit": "ms" }))
+
+	return filePath
+
+def _AddEvent (name: str, category: str, phase: str, arguments: typing.Optional[dict]) -> None:
+	if len(_events) >= EventLimit:
+		return
+
+	_events.append((name, category, phase, time.perf_counter_ns() - _startTime, threading.get_ident(), arguments))
+
+def _Setup () -> None:
+	global Enabled
+
+	# Tracing needs to be decided on before any mod is registered, long before any settings could be read. Creating a file named 'EnableTracing'
+	# in the debug directory will turn it on.
+	Enabled = os.path.exists(EnableFilePath)
+
+_Setup()